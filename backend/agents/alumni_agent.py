@@ -25,7 +25,12 @@ LI_PASSWORD=your_password
 
 Run
 ---
-python alumni_agent.py "backend engineer Houston energy" --profiles-limit 10
+python alumni_agent.py "backend engineer Houston energy" --profiles-limit 10 [--concurrency 3]
+
+Profile details are scraped by --concurrency worker threads, each with its own
+Playwright driver and browser context (sharing the signed-in cookies) and one reused
+page; --profile-timeout bounds each profile and --host-interval spaces out navigations
+to the same host across all workers. Results keep the search-result order.
 """
 
 import os
@@ -34,7 +39,10 @@ import time
 import csv
 import json
 import argparse
+import queue
+import threading
 from pathlib import Path
+from urllib.parse import urlsplit
 from typing import Optional, Dict, Any, List, Set
 
 import requests
@@ -49,6 +57,10 @@ from playwright.sync_api import (
 ALUMNI_URL = "https://www.linkedin.com/school/riceuniversity/people/"
 LOGIN_URL_CONTAINS = "/login"
 
+PROFILE_CONCURRENCY = int(os.getenv("ALUMNI_CONCURRENCY", "3"))        # parallel profile pages
+PROFILE_TIMEOUT = float(os.getenv("ALUMNI_PROFILE_TIMEOUT", "90"))     # seconds per profile
+HOST_INTERVAL = float(os.getenv("ALUMNI_HOST_INTERVAL", "2.0"))        # min seconds between navigations per host
+
 # -------------------- OpenRouter helpers -------------------- #
 def openrouter_call(messages: List[Dict[str, str]], temperature: float = 0.2) -> str:
     api_key = os.getenv("OPENROUTER_API_KEY")
@@ -718,9 +730,36 @@ def extract_skills(p: Page, max_items: int = 30) -> List[str]:
                 continue
     return skills
 
-def scrape_profile_details(context, url: str) -> Dict[str, Any]:
-    p = context.new_page()
-    p.set_default_timeout(30000)
+class ProfileTimeout(Exception):
+    pass
+
+class HostPacer:
+    """Minimum spacing between navigations to the same host, shared by every worker thread."""
+    def __init__(self, min_interval: float = HOST_INTERVAL):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next: Dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, 0.0))
+            self._next[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+def scrape_profile_page(p: Page, url: str, pacer: Optional[HostPacer] = None,
+                        timeout_s: float = PROFILE_TIMEOUT) -> Dict[str, Any]:
+    """Scrape one profile on an already open page; gives up (keeping what it has) after timeout_s."""
+    deadline = time.time() + timeout_s
+    def check():
+        if time.time() > deadline:
+            raise ProfileTimeout(f"profile timed out after {timeout_s:g}s")
+    def remaining_ms(cap: int) -> int:
+        return max(1000, min(cap, int((deadline - time.time()) * 1000)))
+
+    p.set_default_timeout(remaining_ms(30000))
     details: Dict[str, Any] = {
         "profile_url": url,
         "name": "",
@@ -733,8 +772,11 @@ def scrape_profile_details(context, url: str) -> Dict[str, Any]:
     }
 
     try:
+        if pacer is not None:
+            pacer.wait(url)
         p.goto(url, wait_until="domcontentloaded")
-        wait_for_profile_loaded(p, timeout_ms=35000)
+        wait_for_profile_loaded(p, timeout_ms=remaining_ms(35000))
+        check()
 
         # Preload
         smooth_scroll(p, pixels=900, steps=4, pause=0.25)
@@ -753,6 +795,7 @@ def scrape_profile_details(context, url: str) -> Dict[str, Any]:
             "section:has(h2:has-text('About')) .inline-show-more-text span[aria-hidden='true']",
             "section:has(h2:has-text('About')) p",
         ])
+        check()
 
         # Experience — find section by header text first; then fallback id/css
         exp_section = scroll_to_section(
@@ -763,6 +806,7 @@ def scrape_profile_details(context, url: str) -> Dict[str, Any]:
         )
         expand_all_sections(p, scope=exp_section)
         details["experiences"] = extract_experiences_from_dom(p, exp_section, max_items=90)
+        check()
 
         # Education
         edu_section = scroll_to_section(
@@ -773,19 +817,83 @@ def scrape_profile_details(context, url: str) -> Dict[str, Any]:
         )
         expand_all_sections(p, scope=edu_section)
         details["education"] = extract_education_from_dom(p, edu_section, max_items=50)
+        check()
 
         # Skills
         smooth_scroll(p, pixels=1000, steps=3, pause=0.2)
         details["skills"] = extract_skills(p, max_items=30)
 
-    except Exception:
-        pass
+    except ProfileTimeout as e:
+        details["error"] = str(e)
+    except PWTimeoutError as e:
+        details["error"] = f"playwright timeout: {e}"
+    except Exception as e:
+        details["error"] = f"{type(e).__name__}: {e}"
+    return details
+
+def scrape_profile_details(context, url: str, pacer: Optional[HostPacer] = None,
+                           timeout_s: float = PROFILE_TIMEOUT) -> Dict[str, Any]:
+    p = context.new_page()
+    try:
+        return scrape_profile_page(p, url, pacer, timeout_s)
     finally:
         try:
             p.close()
         except Exception:
             pass
-    return details
+
+def scrape_profiles(
+    context,
+    urls: List[str],
+    headless: bool,
+    concurrency: int = PROFILE_CONCURRENCY,
+    timeout_s: float = PROFILE_TIMEOUT,
+    pacer: Optional[HostPacer] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Profile details for `urls`, in the same order. With concurrency > 1 each worker
+    thread runs its own Playwright driver (sync objects are bound to their thread) with
+    a browser context carrying the signed-in storage state of `context`, and reuses one
+    page until a profile fails or times out.
+    """
+    if concurrency <= 1 or len(urls) <= 1:
+        return [scrape_profile_details(context, u, pacer, timeout_s) for u in urls]
+
+    state = context.storage_state()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+    todo: "queue.Queue" = queue.Queue()
+    for item in enumerate(urls):
+        todo.put(item)
+
+    def worker():
+        with sync_playwright() as pw:
+            browser = pw.chromium.launch(
+                headless=headless,
+                args=["--disable-blink-features=AutomationControlled", "--disable-dev-shm-usage"],
+            )
+            try:
+                ctx = browser.new_context(storage_state=state, viewport={"width": 1400, "height": 900})
+                page = ctx.new_page()
+                while True:
+                    try:
+                        i, url = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    results[i] = scrape_profile_page(page, url, pacer, timeout_s)
+                    if results[i].get("error") or page.is_closed():
+                        try: page.close()  # may be mid-navigation; start the next profile clean
+                        except Exception: pass
+                        page = ctx.new_page()
+            finally:
+                browser.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(min(concurrency, len(urls)))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # a worker that died (browser crash) leaves its claimed profile empty
+    return [r if r is not None else {"profile_url": u, "error": "worker failed"} for r, u in zip(results, urls)]
 
 # -------------------- Main flow -------------------- #
 def main():
@@ -798,6 +906,9 @@ def main():
     parser.add_argument("--profile-dir", default=".ll_browser_profile", help="Persistent browser profile dir")
     parser.add_argument("--profiles-limit", type=int, default=10, help="Max profiles to visit for detailed scraping")
     parser.add_argument("--show-more-clicks", type=int, default=2, help="Times to click 'Show more results'")
+    parser.add_argument("--concurrency", type=int, default=PROFILE_CONCURRENCY, help="Profile pages scraped in parallel")
+    parser.add_argument("--profile-timeout", type=float, default=PROFILE_TIMEOUT, help="Seconds allowed per profile")
+    parser.add_argument("--host-interval", type=float, default=HOST_INTERVAL, help="Min seconds between navigations to one host")
     args = parser.parse_args()
 
     raw_prompts = [p.strip() for p in args.prompts.split(";") if p.strip()]
@@ -831,6 +942,7 @@ def main():
 
     profile_dir = Path(args.profile_dir)
     ensure_profile(profile_dir)
+    pacer = HostPacer(args.host_interval)
 
     with sync_playwright() as p:
         context = p.chromium.launch_persistent_context(
@@ -911,25 +1023,25 @@ def main():
             edus_flat: List[Dict[str, Any]] = []
 
             to_visit = [r["profile_link"] for r in list_rows if r.get("profile_link")] [: args.profiles_limit]
-            print(f"🔎 Visiting {len(to_visit)} profiles for details…")
-            for u in to_visit:
-                try:
-                    d = scrape_profile_details(context, u)
-                    details_rows.append(d)
-                    for e in d.get("experiences", []) or []:
-                        exps_flat.append({
-                            "profile_url": d.get("profile_url",""),
-                            "name": d.get("name",""),
-                            **e
-                        })
-                    for e in d.get("education", []) or []:
-                        edus_flat.append({
-                            "profile_url": d.get("profile_url",""),
-                            "name": d.get("name",""),
-                            **e
-                        })
-                except Exception:
-                    continue
+            print(f"🔎 Visiting {len(to_visit)} profiles for details ({args.concurrency} at a time)…")
+            started = time.time()
+            for d in scrape_profiles(context, to_visit, headless=args.headless, concurrency=args.concurrency,
+                                     timeout_s=args.profile_timeout, pacer=pacer):
+                details_rows.append(d)
+                for e in d.get("experiences", []) or []:
+                    exps_flat.append({
+                        "profile_url": d.get("profile_url",""),
+                        "name": d.get("name",""),
+                        **e
+                    })
+                for e in d.get("education", []) or []:
+                    edus_flat.append({
+                        "profile_url": d.get("profile_url",""),
+                        "name": d.get("name",""),
+                        **e
+                    })
+            failed = sum(1 for d in details_rows if d.get("error"))
+            print(f"⏱  {len(details_rows)} profiles in {time.time() - started:.0f}s ({failed} timed out/failed)")
 
             details_jsonl = Path(f"alumni_profile_details_{idx:03d}.jsonl")
             save_jsonl(details_rows, details_jsonl)
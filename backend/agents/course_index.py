@@ -0,0 +1,147 @@
+# agents/course_index.py
+# Local course index: one precomputed embedding per catalog course, so the matcher can
+# turn a transcript's course codes into a single pooled vector without encoding any
+# description text at match time.
+#
+# Vectors are keyed by (code, model) and stored as float32 blobs in their own SQLite file
+# (COURSE_INDEX_PATH, next to the catalog cache). A course's text is its catalog description
+# (falling back to the long title / title); the text's hash is stored with the vector so
+# an updated description is re-encoded on the next ensure()/build.
+#
+#   python -m agents.course_index [--year 2026] [--model all-MiniLM-L6-v2]
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from mcp_servers.catalog_cache import CATALOG_CACHE_PATH
+
+COURSE_INDEX_PATH = os.getenv(
+    "COURSE_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(CATALOG_CACHE_PATH)), "owlconnect-course-index.sqlite3"),
+)
+EMBED_BATCH_SIZE = 256
+
+
+def course_code(subject: str, number: str) -> str:
+    return f"{(subject or '').strip().upper()} {(number or '').strip().upper()}"
+
+def course_text(rec: Dict[str, Any]) -> str:
+    """What gets embedded for a catalog record: description, else the best title."""
+    return (rec.get("description") or rec.get("long_title") or rec.get("title") or "").strip()
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class CourseIndex:
+    """Course code -> embedding for one model, backed by SQLite and held in memory."""
+    def __init__(self, model_name: str, path: str = COURSE_INDEX_PATH):
+        self.model_name = model_name
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS course_vectors ("
+            " code TEXT NOT NULL, model TEXT NOT NULL, text_sha1 TEXT NOT NULL, vec BLOB NOT NULL,"
+            " PRIMARY KEY (code, model))"
+        )
+        self._db.commit()
+        self._vecs: Dict[str, np.ndarray] = {}
+        self._sha: Dict[str, str] = {}
+        for code, sha, blob in self._db.execute(
+            "SELECT code, text_sha1, vec FROM course_vectors WHERE model=?", (model_name,)
+        ):
+            self._vecs[code] = np.frombuffer(blob, dtype=np.float32)
+            self._sha[code] = sha
+        self.stats = {"hits": 0, "misses": 0, "encoded": 0}
+
+    def __len__(self) -> int:
+        return len(self._vecs)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._vecs
+
+    def ensure(self, model: Any, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Encode and store catalog records (rice_catalog values) that are missing or whose
+        text changed; one batched encode for all of them. Returns how many were encoded.
+        """
+        todo: Dict[str, str] = {}
+        for rec in records:
+            code, text = rec.get("code"), course_text(rec)
+            if not code or not text or not rec.get("found", True):
+                continue
+            if self._sha.get(code) != _digest(text):
+                todo[code] = text
+        if not todo:
+            return 0
+        codes = list(todo)
+        vecs = np.asarray(model.encode([todo[c] for c in codes], batch_size=EMBED_BATCH_SIZE), dtype=np.float32)
+        rows = [(c, self.model_name, _digest(todo[c]), v.tobytes()) for c, v in zip(codes, vecs)]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO course_vectors VALUES (?, ?, ?, ?)", rows)
+            self._db.commit()
+            for c, v in zip(codes, vecs):
+                self._vecs[c] = v
+                self._sha[c] = _digest(todo[c])
+        self.stats["encoded"] += len(codes)
+        return len(codes)
+
+    def vectors(self, codes: Iterable[str]) -> Dict[str, np.ndarray]:
+        return {c: self._vecs[c] for c in dict.fromkeys(codes) if c in self._vecs}
+
+    def pooled(self, codes: Iterable[str]) -> Tuple[Optional[np.ndarray], int]:
+        """(mean vector, number of courses it covers) for the indexed codes; (None, 0) if none are."""
+        codes = list(dict.fromkeys(codes))
+        found = self.vectors(codes)
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(codes) - len(found)
+        if not found:
+            return None, 0
+        return np.mean(np.stack(list(found.values())), axis=0), len(found)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"path": self.path, "model": self.model_name, "courses": len(self._vecs), **self.stats}
+
+
+def catalog_records(path: str = CATALOG_CACHE_PATH, ac_year: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Every cached catalog entry (any age), optionally for one year only."""
+    db = sqlite3.connect(path)
+    try:
+        sql, params = "SELECT data FROM courses", ()
+        if ac_year is not None:
+            sql, params = sql + " WHERE ac_year=?", (ac_year,)
+        return [json.loads(d) for (d,) in db.execute(sql, params)]
+    except sqlite3.OperationalError:  # no catalog cache yet
+        return []
+    finally:
+        db.close()
+
+def main():
+    from agents.mentor_mentee_matching import EMBEDDING_MODEL_NAME
+    from sentence_transformers import SentenceTransformer
+
+    ap = argparse.ArgumentParser(description="Embed cached catalog descriptions into the course index")
+    ap.add_argument("--year", type=int, default=None, help="only this catalog year (default: all cached)")
+    ap.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    ap.add_argument("--catalog", default=CATALOG_CACHE_PATH, help="catalog cache to read")
+    ap.add_argument("--index", default=COURSE_INDEX_PATH, help="index file to write")
+    args = ap.parse_args()
+
+    records = catalog_records(args.catalog, args.year)
+    index = CourseIndex(args.model, args.index)
+    n = index.ensure(SentenceTransformer(args.model), records)
+    print(json.dumps({"catalog_records": len(records), "encoded": n, **index.snapshot()}, indent=2))
+
+if __name__ == "__main__":
+    main()
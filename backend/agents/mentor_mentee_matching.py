@@ -13,6 +13,8 @@ from langchain_core.messages import HumanMessage, SystemMessage
 import asyncio
 import requests
 
+from agents.course_index import CourseIndex, course_code, course_text
+
 import dotenv
 dotenv.load_dotenv()
 
@@ -95,6 +97,7 @@ class Profile:
     # Professional
     career_interests: List[str] = field(default_factory=list)
     course_descriptions: List[str] = field(default_factory=list)
+    course_codes: List[str] = field(default_factory=list)  # "COMP 140", parallel to course_descriptions
     job_description: List[str] = field(default_factory=list)
 
     # Fields referenced by _get_agent_prompt (add safe defaults)
@@ -136,12 +139,24 @@ def json_to_profile(data: Dict[str, Any]) -> Profile:
     if "Career Goals and Aspirations:" in paragraph_text:
         career_goals = [paragraph_text.split("Career Goals and Aspirations:")[1].strip()]
 
+    # catalog descriptions from rice_catalog (keyed "SUBJNUM"), transcript title when
+    # missing; MATCH_COURSE_SCORING=titles keeps the old titles-only text
+    catalog = (data.get("rice_catalog") or {}) if MATCH_COURSE_SCORING == "index" else {}
+    course_codes, course_descriptions = [], []
+    for c in data.get("transcript_data", {}).get("courses_completed", []):
+        subj, num = (c.get("subject") or "").upper(), (c.get("number") or "").upper()
+        text = course_text(catalog.get(f"{subj}{num}") or {}) or c.get("title", "")
+        if text:
+            course_codes.append(course_code(subj, num))
+            course_descriptions.append(text)
+
     return Profile(
         hobbies=hobbies,
         life_interests=life_interests,
         mbti=mbti,
         career_interests=career_goals,
-        course_descriptions=[c["title"] for c in data.get("transcript_data", {}).get("courses_completed", [])],
+        course_descriptions=course_descriptions,
+        course_codes=course_codes,
         job_description=[exp["role"] for exp in resume.get("experience", [])],
         name=name,
         skills=skills,
@@ -153,6 +168,56 @@ def json_to_profile(data: Dict[str, Any]) -> Profile:
     )
 
 
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+# How a mentee's courses enter the professional score:
+#   index  - catalog descriptions, pooled from the course index (mentee_professional_vector)
+#   titles - the original scoring: transcript titles, encoded per pair with the career text
+# The two give different professional scores (and so rankings) for the same pair.
+MATCH_COURSE_SCORING = os.getenv("MATCH_COURSE_SCORING", "index")
+
+def _split_paragraph(texts: List[str]) -> List[str]:
+    if len(texts) == 1 and '.' in texts[0]:
+        return [s.strip() for s in texts[0].split('.') if s.strip()]
+    return texts
+
+def embed_texts(texts: List[str], model: "SentenceTransformer") -> Optional[np.ndarray]:
+    """Mean sentence embedding of a text list (None when there is nothing to embed)."""
+    if not texts: return None
+    texts = _split_paragraph(texts)
+    if not texts: return None
+    return np.mean(model.encode(texts), axis=0)
+
+def interpersonal_texts(profile: Profile) -> List[str]:
+    return profile.hobbies + profile.life_interests
+
+def mentor_professional_texts(profile: Profile) -> List[str]:
+    return profile.career_interests + profile.job_description
+
+def mentee_professional_vector(profile: Profile, model: "SentenceTransformer", index: CourseIndex) -> Optional[np.ndarray]:
+    """
+    Mean embedding of career interests + courses, with indexed courses taken from the
+    course index instead of being encoded; weighted as one flat mean over all of them.
+
+    Not the same vector as the original scoring (embed_texts over career text + transcript
+    titles): courses are represented by their catalog descriptions, and the career text is
+    always split into sentences, each weighted like one course. Professional scores shift
+    accordingly; MATCH_COURSE_SCORING=titles restores the original behaviour.
+    """
+    pooled, n_pooled = index.pooled(profile.course_codes)
+    indexed = set(index.vectors(profile.course_codes))
+    texts = _split_paragraph(profile.career_interests) + [
+        d for c, d in zip(profile.course_codes, profile.course_descriptions) if c not in indexed
+    ]
+    parts, weights = [], []
+    if texts:
+        parts.append(np.mean(model.encode(texts), axis=0)); weights.append(len(texts))
+    if pooled is not None:
+        parts.append(pooled); weights.append(n_pooled)
+    if not parts:
+        return None
+    return np.average(np.stack(parts), axis=0, weights=weights)
+
+
 class BaseAgent:
     def __init__(self, agent_id: str, name: str, profile: Profile):
         self.agent_id = agent_id
@@ -162,6 +227,8 @@ class BaseAgent:
         self.matched_with: Optional[str] = None
         self.compatibility_scores: Dict[str, float] = {}
         self.negotiation_history: List[Dict[str, Any]] = []
+        # precomputed mean embeddings ("interpersonal"/"professional"), e.g. from mentor import
+        self.vectors: Dict[str, np.ndarray] = {}
 
     # --- Main Function ---
     def rate_compatibility(self, other: "BaseAgent", model: "SentenceTransformer") -> float:
@@ -191,9 +258,12 @@ class BaseAgent:
     def _calculate_interpersonal_score(self, mentor: "Mentor", mentee: "Mentee", model: "SentenceTransformer") -> float:
         """Calculates a WEIGHTED interpersonal fit, prioritizing interests (70%) over MBTI (30%)."""
         weights = {"interests": 0.7, "mbti": 0.3}
-        mentee_interests = mentee.profile.hobbies + mentee.profile.life_interests
-        mentor_interests = mentor.profile.hobbies + mentor.profile.life_interests
-        interest_score = self._get_semantic_similarity(mentor_interests, mentee_interests, model)
+        mentee_interests = interpersonal_texts(mentee.profile)
+        mentor_interests = interpersonal_texts(mentor.profile)
+        interest_score = self._get_semantic_similarity(
+            mentor_interests, mentee_interests, model,
+            vec1=mentor.vectors.get("interpersonal"), vec2=mentee.vectors.get("interpersonal"),
+        )
         mbti_score = self._calculate_mbti_similarity(mentor.profile.mbti, mentee.profile.mbti)
         return min(1,(weights["interests"] * interest_score) + (weights["mbti"] * mbti_score) + 0.2)
 
@@ -203,11 +273,14 @@ class BaseAgent:
         raw, full-text professional profiles.
         """
         # Combine all relevant raw text from the profiles
-        mentor_professional_text = mentor.profile.career_interests + mentor.profile.job_description
+        mentor_professional_text = mentor_professional_texts(mentor.profile)
         mentee_professional_text = mentee.profile.career_interests + mentee.profile.course_descriptions
 
         # The score is now calculated on the raw text, not keywords
-        return min(1, self._get_semantic_similarity(mentor_professional_text, mentee_professional_text, model) + 0.2)
+        return min(1, self._get_semantic_similarity(
+            mentor_professional_text, mentee_professional_text, model,
+            vec1=mentor.vectors.get("professional"), vec2=mentee.vectors.get("professional"),
+        ) + 0.2)
 
     def _calculate_mbti_similarity(self, mbti1: str, mbti2: str) -> float:
         """Scores MBTI similarity from 0.0 to 1.0 based on shared letters."""
@@ -217,15 +290,21 @@ class BaseAgent:
         shared_letters = sum(1 for i in range(4) if mbti1[i] == mbti2[i])
         return shared_letters / 4.0
 
-    def _get_semantic_similarity(self, list1: List[str], list2: List[str], model: "SentenceTransformer") -> float:
+    def _get_semantic_similarity(
+        self,
+        list1: List[str],
+        list2: List[str],
+        model: "SentenceTransformer",
+        vec1: Optional[np.ndarray] = None,
+        vec2: Optional[np.ndarray] = None,
+    ) -> float:
         """
         A utility to calculate semantic similarity. It now splits single-paragraph strings
-        into sentences for more accurate embedding.
+        into sentences for more accurate embedding. Precomputed vectors skip the encode.
         """
-        if not list1 or not list2: return 0.0
-        if len(list1) == 1 and '.' in list1[0]: list1 = [s.strip() for s in list1[0].split('.') if s.strip()]
-        if len(list2) == 1 and '.' in list2[0]: list2 = [s.strip() for s in list2[0].split('.') if s.strip()]
-        vec1 = np.mean(model.encode(list1), axis=0); vec2 = np.mean(model.encode(list2), axis=0)
+        if vec1 is None: vec1 = embed_texts(list1, model)
+        if vec2 is None: vec2 = embed_texts(list2, model)
+        if vec1 is None or vec2 is None: return 0.0
         return max(0, util.cos_sim(vec1, vec2).item())
 
     def add_negotiation_history(self, message: str, from_agent: str):
@@ -611,9 +690,9 @@ PROFILE_FIELDS = [
     "interests",
 ]
 
-def init_MAN():
+def init_MAN(user_id: Optional[str] = None):
 
-    embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+    embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
 
     # pass the model in
     matching_system = MatchingSystem(model=embedding_model, live_stream=True, stream_mode="line")
@@ -680,26 +759,45 @@ def init_MAN():
     #     )
     # )
 
-    mentee = requests.get('http://localhost:8000/users/newest', timeout=3).json()
+    if user_id:
+        resp = requests.get(f"http://localhost:8000/users/{user_id}", timeout=3)
+    else:
+        # legacy fallback for clients that don't send an id yet
+        resp = requests.get("http://localhost:8000/users/newest", timeout=3)
+    resp.raise_for_status()
+    mentee = resp.json()
 
     mentee_obj = Mentee(agent_id=mentee.get("id", "mentee"), name=mentee.get("resume_data", "").get("contact", "").get("name", ""), profile=json_to_profile(mentee))
 
+    if MATCH_COURSE_SCORING == "index":
+        # course content comes from the local course index; only unindexed courses get encoded
+        course_index = CourseIndex(EMBEDDING_MODEL_NAME)
+        course_index.ensure(embedding_model, (mentee.get("rice_catalog") or {}).values())
+        vec = mentee_professional_vector(mentee_obj.profile, embedding_model, course_index)
+        if vec is not None:
+            mentee_obj.vectors["professional"] = vec
+
     matching_system.add_mentee(mentee_obj)
 
     # --- Add agents to the system (this was missing) ---
-    mentors = requests.get("http://localhost:8000/mentors", timeout=3).json()
+    mentors = requests.get("http://localhost:8000/mentors", params={"embeddings": "true"}, timeout=3).json()
     # print(mentors)
 
     for mentor in mentors:
         profile_data = {field: mentor.get(field) for field in PROFILE_FIELDS}
 
-        matching_system.add_mentor(
-            Mentor(
-                agent_id=mentor["id"],
-                name=mentor.get("name", ""),
-                profile=Profile(**profile_data)
-            )
+        mentor_obj = Mentor(
+            agent_id=mentor["id"],
+            name=mentor.get("name", ""),
+            profile=Profile(**profile_data)
         )
+        # reuse vectors computed at import time when they came from the same model
+        stored = mentor.get("embeddings") or {}
+        if stored.get("model") == EMBEDDING_MODEL_NAME:
+            for key in ("interpersonal", "professional"):
+                if stored.get(key) is not None:
+                    mentor_obj.vectors[key] = np.asarray(stored[key], dtype=np.float32)
+        matching_system.add_mentor(mentor_obj)
             
     # matching_system.add_mentor(mentor_A)
     # matching_system.add_mentor(mentor_B)
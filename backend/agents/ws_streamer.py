@@ -72,6 +72,7 @@ class LineBuffer(io.TextIOBase):
 @router.websocket("/ws/negotiation/{session_id}")
 async def ws_negotiation(ws: WebSocket, session_id: str):
     await ws.accept()
+    user_id = ws.query_params.get("user_id")
     q: "queue.Queue[Optional[str]]" = queue.Queue()
 
     def run_and_capture():
@@ -79,7 +80,7 @@ async def ws_negotiation(ws: WebSocket, session_id: str):
         writer = LineBuffer(q)
         with contextlib.redirect_stdout(writer):   # only stdout
             try:
-                init_MAN()
+                init_MAN(user_id)
             except Exception as e:
                 q.put(f"✗ Error: {e!r}")
             finally:
@@ -1,19 +1,31 @@
 import os
+import io
+import json
+import shutil
+import asyncio
 import tempfile
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from sse_starlette.sse import EventSourceResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
 from dotenv import load_dotenv
-from parsers.resume_parser import parse_resume
-from parsers.transcript_parser import parse_major_and_courses, _extract_course_pairs
+from parsers.transcript_parser import _extract_course_pairs
+from parsers.parse_pool import ParsePool, PoolBusy, JobTimeout
+from parsers.parse_cache import ParseCache, DiskParseCache, PARSE_CACHE_DIR, parse_onboarding_cached, parse_transcript_cached
+from parsers.pdf_source import PdfSource, SPOOL_THRESHOLD, discard
 from agents.mentor_mentee_matching import init_MAN
 from agents.ws_streamer import router as ws_router
-from mcp_servers.course_mcp import rice_lookup_courses
+from mcp_servers.course_mcp import rice_lookup_courses, catalog_cache, lookup_flights, breakers_snapshot, close_client as close_catalog_client
 from database.user_crud import OnboardingCRUD
+from jobs.onboarding import OnboardingJobRunner, TERMINAL as JOB_TERMINAL
+from jobs.transcript_refresh import refresh_transcript
 from database.mentors_crud import MentorsCRUD
+from database.mentor_import import import_mentors, iter_rows, detect_format, load_embedding_model
 import certifi
 from fastapi import Body
 
@@ -39,6 +51,17 @@ user_crud = OnboardingCRUD(users_collection)
 
 mentors = MentorsCRUD(db.mentors)
 
+# OCR/PDF parsing runs here, never on the event loop
+parse_pool = ParsePool()
+
+# identical re-uploads are served from here instead of being parsed again
+parse_cache = ParseCache(
+    disk=DiskParseCache() if PARSE_CACHE_DIR else None,
+    collection=db.parse_cache if os.getenv("PARSE_CACHE_MONGO", "0") == "1" else None,
+)
+
+onboarding_jobs = OnboardingJobRunner(user_crud, parse_pool, rice_lookup_courses, parse_cache=parse_cache)
+
 app = FastAPI()
 
 # Configure CORS
@@ -52,23 +75,123 @@ app.add_middleware(
 
 app.include_router(ws_router)
 
-@app.get("/users/newest", response_model=dict)
+@app.on_event("startup")
+async def start_mentor_cache_invalidation():
+    # keep a reference so the task isn't garbage-collected
+    app.state.mentor_watch = asyncio.create_task(mentors.watch_changes())
+    await parse_cache.create_indexes()
+
+@app.on_event("shutdown")
+async def stop_parse_pool():
+    await onboarding_jobs.shutdown()
+    parse_pool.shutdown()
+    await close_catalog_client()
+
+def _etag_matches(request: Request, etag: Optional[str]) -> bool:
+    if not etag:
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags
+
+def _conditional_json(request: Request, data: Any, etag: Optional[str]) -> Response:
+    """Return 304 when the client already holds `etag`, else the JSON body tagged with it."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"} if etag else None
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=jsonable_encoder(data), headers=headers)
+
+@app.get("/users/newest", response_model=dict, deprecated=True)
 async def get_newest_user():
     """
     Get the most recently created user.
+    Racy when two students onboard at once; use /users/{user_id}.
     """
     user = await user_crud.get_most_recent()
     if not user:
         raise HTTPException(status_code=404, detail="No users found")
     return user
 
+@app.get("/users/{user_id}", response_model=dict)
+async def get_user(user_id: str):
+    user = await user_crud.get(user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+@app.post("/users/{user_id}/paragraph")
+async def update_user_paragraph(user_id: str, paragraph_text: str = Form(...)):
+    updated = await user_crud.update_paragraph(user_id, paragraph_text)
+    if not updated:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {
+        "id": updated["id"],
+        "paragraph_text": updated.get("paragraph_text"),
+        "updated_at": updated.get("updated_at"),
+    }
+
+@app.get("/users/{user_id}/matched-mentors")
+async def get_user_matched_mentors(user_id: str):
+    user = await user_crud.get(user_id, projection={"matched_mentors": 1})
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user.get("matched_mentors", [])
+
 @app.get("/mentors", response_model=list[dict])
-async def get_mentors():
+async def get_mentors(request: Request, embeddings: bool = False):
     """
     Get all users who have indicated they want to be mentors.
+    embeddings=true adds the precomputed vectors (matcher only; uncached).
+    """
+    if embeddings:
+        return await mentors.get_all_with_embeddings()
+    mentorsdata, etag = await mentors.get_all_with_etag()
+    return _conditional_json(request, mentorsdata, etag)
+
+@app.post("/mentors/import")
+async def import_mentors_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = Form(None),
+    upsert_on: Optional[str] = Form(None),
+    embeddings: bool = Form(True),
+):
     """
-    mentorsdata = await mentors.get_all()
-    return mentorsdata
+    Bulk-import mentors from NDJSON or CSV. Rows are validated against the Profile
+    fields; bad rows are reported individually and never abort the import.
+    """
+    fmt = format or detect_format(file.filename)
+    if fmt not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+    model = model_name = None
+    if embeddings:
+        if getattr(app.state, "embedding_model", None) is None:
+            app.state.embedding_model = await asyncio.to_thread(load_embedding_model)
+        model, model_name = app.state.embedding_model
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await import_mentors(
+            mentors.collection, iter_rows(stream, fmt),
+            model=model, model_name=model_name or "", upsert_on=upsert_on,
+        )
+    finally:
+        stream.detach()
+        mentors.invalidate()
+    return report
+
+@app.get("/metrics/mentor-cache")
+async def mentor_cache_metrics():
+    return mentors.cache.stats()
+
+@app.get("/metrics/parse-pool")
+async def parse_pool_metrics():
+    return {**parse_pool.snapshot(), "cache": parse_cache.stats}
+
+@app.get("/metrics/catalog")
+async def catalog_metrics():
+    return {"cache": catalog_cache.snapshot(), "single_flight": lookup_flights.snapshot(),
+            "breakers": breakers_snapshot()}
 
 
 # @app.post("/onboard")
@@ -115,24 +238,96 @@ async def get_mentors():
 #                 except Exception: pass
 
 
+async def _read_upload(f: UploadFile) -> PdfSource:
+    """PDF bytes in memory; only uploads above SPOOL_THRESHOLD are copied to a temp file."""
+    if f.size is not None and f.size > SPOOL_THRESHOLD:
+        def spool() -> str:
+            f.file.seek(0)
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+                shutil.copyfileobj(f.file, tmp)
+                return tmp.name
+        return await asyncio.to_thread(spool)
+    return await f.read()
+
+@app.post("/onboard-jobs", status_code=202)
+async def create_onboarding_job(
+    resume_file: UploadFile = File(...),
+    transcript_file: UploadFile = File(...),
+):
+    """
+    Start onboarding in the background. Poll /onboard-jobs/{job_id} or stream
+    /onboard-jobs/{job_id}/events; the job id is also the new user's id.
+    """
+    resume = await _read_upload(resume_file)
+    transcript = await _read_upload(transcript_file)
+    try:
+        job_id = await onboarding_jobs.submit(resume, transcript, resume_file.filename)
+    except Exception as e:
+        discard(resume, transcript)
+        raise HTTPException(500, detail=f"Could not start onboarding: {e}")
+    return {
+        "job_id": job_id,
+        "status_url": f"/onboard-jobs/{job_id}",
+        "events_url": f"/onboard-jobs/{job_id}/events",
+    }
+
+@app.get("/onboard-jobs/{job_id}")
+async def get_onboarding_job(job_id: str):
+    job = await user_crud.get_job(job_id)
+    if not job or "job" not in job:
+        raise HTTPException(status_code=404, detail="Onboarding job not found")
+    return job
+
+@app.get("/onboard-jobs/{job_id}/events")
+async def stream_onboarding_job(job_id: str):
+    """Server-sent `progress` events until the job is done or failed."""
+    job = await user_crud.get_job(job_id)
+    if not job or "job" not in job:
+        raise HTTPException(status_code=404, detail="Onboarding job not found")
+
+    async def events():
+        q = onboarding_jobs.events.subscribe(job_id)
+        snap = job
+        try:
+            while True:
+                yield {"event": "progress", "data": json.dumps(jsonable_encoder(snap))}
+                if snap["job"]["status"] in JOB_TERMINAL:
+                    break
+                try:
+                    snap = await asyncio.wait_for(q.get(), timeout=10)
+                except asyncio.TimeoutError:
+                    # the job may be running in another server process; re-read it
+                    snap = await user_crud.get_job(job_id) or snap
+        finally:
+            onboarding_jobs.events.unsubscribe(job_id, q)
+
+    return EventSourceResponse(events())
+
 @app.post("/onboard-files")
 async def onboard_files(
     resume_file: UploadFile = File(...),
     transcript_file: UploadFile = File(...),
+    user_id: Optional[str] = Form(None),
 ):
-    resume_path = transcript_path = None
+    """
+    Onboard a new student, or with user_id re-upload an existing student's documents:
+    only changed fields are patched and only new courses are looked up in the catalog.
+    """
+    resume = transcript = None
     try:
+        resume = await _read_upload(resume_file)
+        transcript = await _read_upload(transcript_file)
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as rtmp:
-            rtmp.write(await resume_file.read())
-            resume_path = rtmp.name
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as ttmp:
-            ttmp.write(await transcript_file.read())
-            transcript_path = ttmp.name
+        parsed = await parse_onboarding_cached(parse_pool, parse_cache, resume, transcript, resume_file.filename)
+        resume_data = parsed["resume_data"]
+        transcript_data = parsed["transcript_data"]
 
-
-        resume_data = parse_resume(resume_path)
-        transcript_data = parse_major_and_courses(transcript_path)
+        if user_id:
+            result = await refresh_transcript(user_crud, user_id, transcript_data, rice_lookup_courses,
+                                              ac_year=2026, resume_data=resume_data)
+            if result is None:
+                raise HTTPException(status_code=404, detail="User not found")
+            return result
 
         # Build course list and call the tool function directly
         course_pairs = _extract_course_pairs(transcript_data)
@@ -147,19 +342,46 @@ async def onboard_files(
         doc_id = await user_crud.create(payload)
 
         return {"id": doc_id, **payload}
-    
+
+    except HTTPException:
+        raise
+    except PoolBusy:
+        raise HTTPException(429, detail="Parser is at capacity, retry shortly", headers={"Retry-After": "5"})
+    except JobTimeout as e:
+        raise HTTPException(504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(400, detail=f"Parsing failed: {e}")
+    finally:
+        discard(resume, transcript)
+
+@app.post("/users/{user_id}/transcript")
+async def reupload_transcript(user_id: str, transcript_file: UploadFile = File(...)):
+    """Per-semester transcript refresh: diff against the stored transcript and patch in place."""
+    transcript = None
+    try:
+        transcript = await _read_upload(transcript_file)
+        transcript_data = await parse_transcript_cached(parse_pool, parse_cache, transcript)
+    except PoolBusy:
+        raise HTTPException(429, detail="Parser is at capacity, retry shortly", headers={"Retry-After": "5"})
+    except JobTimeout as e:
+        raise HTTPException(504, detail=str(e))
     except Exception as e:
         raise HTTPException(400, detail=f"Parsing failed: {e}")
     finally:
-        for p in (resume_path, transcript_path):
-            if p:
-                try: os.remove(p)
-                except Exception: pass
+        discard(transcript)
+    # catalog / Mongo failures past this point are server errors, not a bad upload
+    result = await refresh_transcript(user_crud, user_id, transcript_data, rice_lookup_courses, ac_year=2026)
+    if result is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return result
 
 @app.post("/onboard-text")
-async def onboard_text(paragraph_text: str = Form(...)):
+async def onboard_text(paragraph_text: str = Form(...), user_id: Optional[str] = Form(None)):
     try:
-        updated = await user_crud.update_most_recent_paragraph(paragraph_text)
+        if user_id:
+            updated = await user_crud.update_paragraph(user_id, paragraph_text)
+        else:
+            updated = await user_crud.update_most_recent_paragraph(paragraph_text)
         if not updated:
             raise HTTPException(status_code=404, detail="No onboarding document found. Call /onboard first.")
         return {
@@ -182,13 +404,17 @@ async def add_matched_mentors(
     return {"id": doc_id, "matched_mentors": mentors}
 
 @app.get("/get-matched-mentors")
-async def get_matched_mentors():
+async def get_matched_mentors(user_id: Optional[str] = None):
+    if user_id:
+        return await user_crud.get_matched_mentors(user_id)
+    # legacy fallback for clients that don't send an id yet
     user = await user_crud.get_most_recent()
-    return await user_crud.get_matched_mentors(user.get("id", ""))
+    return await user_crud.get_matched_mentors((user or {}).get("id", ""))
 
 @app.get("/get-mentor")
-async def get_mentor(mentor_id: str):
-    return await mentors.get(mentor_id)
+async def get_mentor(request: Request, mentor_id: str):
+    mentor, etag = await mentors.get_with_etag(mentor_id)
+    return _conditional_json(request, mentor, etag)
 
 # 
 # llm call
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+parse_course_html benchmark: the lxml DOM-targeted path vs. the BeautifulSoup + regex
+path, per page, with an identical-output check on every page.
+
+Saved catalog pages are read from --pages-dir as SUBJ_NUM.html (e.g. COMP_140.html);
+without it a set of synthetic pages in the catalog's label layout is generated.
+
+Run (from backend/):
+  python -m benchmarks.bench_course_html [--pages-dir saved_pages/] [--repeat 5]
+"""
+import argparse
+import glob
+import os
+import random
+import time
+from typing import List, Tuple
+
+from mcp_servers.course_mcp import _parse_course_dom, _parse_course_regex
+
+WORDS = ("algorithms data systems design analysis computation networks models theory "
+         "students programming probability learning structures optimization methods").split()
+
+def make_page(subject: str, number: str, rng: random.Random) -> str:
+    title = " ".join(rng.choice(WORDS) for _ in range(3))
+    desc = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 160))).capitalize() + "."
+    nav = "".join(f'<li><a href="?p_subj={s}">{s}</a></li>' for s in ("COMP", "MATH", "ELEC", "STAT") * 20)
+    return f"""<!DOCTYPE html><html><head><title>Course Catalog | Rice University</title>
+<script>var cfg = {{"label": "Description: none"}};</script><style>td b {{ font-weight: bold }}</style></head>
+<body><div id="top"><ul>{nav}</ul><a href="/ga">General Announcements</a></div>
+<!-- course detail -->
+<table class="course"><tr><td><b>{subject} {number} - {title.upper()}</b></td></tr>
+<tr><td><b>Long Title:</b> {title.title()}</td></tr>
+<tr><td><b>Department:</b> {rng.choice(['Computer Science', 'Mathematics', 'Statistics'])}</td></tr>
+<tr><td><b>Grade Mode:</b> Standard Letter</td></tr>
+<tr><td><b>Course Type:</b> Lecture</td></tr>
+<tr><td><b>Credit Hours:</b> {rng.choice([1, 3, 4])}</td></tr>
+<tr><td><b>Restrictions:</b> Enrollment limited to students with a class of Junior or Senior.</td></tr>
+<tr><td><b>Description:</b> {desc}</td></tr>
+<tr><td><b>Course URL:</b> <a href="#">courses.rice.edu/{subject}{number}</a></td></tr></table>
+<div class="footer"><a href="/ga">General Announcements</a> &copy; 2025 Rice University</div>
+</body></html>"""
+
+def load_pages(pages_dir: str, n: int) -> List[Tuple[str, str, str]]:
+    if pages_dir:
+        out = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+            subj, num = os.path.splitext(os.path.basename(path))[0].split("_", 1)
+            with open(path, encoding="utf-8", errors="replace") as f:
+                out.append((subj.upper(), num.upper(), f.read()))
+        return out
+    rng = random.Random(0)
+    return [(s, str(rng.randint(100, 599)), "") for s in rng.choices(["COMP", "MATH", "STAT", "ELEC"], k=n)]
+
+def timed(fn, repeat: int, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages-dir", default=None)
+    ap.add_argument("--synthetic", type=int, default=40, help="pages to generate without --pages-dir")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    rng = random.Random(1)
+    pages = [(s, n, html or make_page(s, n, rng)) for s, n, html in load_pages(args.pages_dir, args.synthetic)]
+    regex_s = dom_s = 0.0
+    mismatches = fallbacks = 0
+    for subj, num, html in pages:
+        ref = _parse_course_regex(html, subj, num)
+        dom = _parse_course_dom(html, subj, num)
+        if dom is None:
+            fallbacks += 1
+        elif dom != ref:
+            mismatches += 1
+            print(f"MISMATCH {subj} {num}:\n  regex={ref}\n  dom  ={dom}")
+        regex_s += timed(_parse_course_regex, args.repeat, html, subj, num)
+        dom_s += timed(_parse_course_dom, args.repeat, html, subj, num)
+
+    n = len(pages)
+    print(f"{n} pages: regex {1000 * regex_s / n:.2f} ms/page, dom {1000 * dom_s / n:.2f} ms/page "
+          f"({regex_s / dom_s:.1f}x); {mismatches} mismatches, {fallbacks} fell back to regex")
+
+if __name__ == "__main__":
+    main()
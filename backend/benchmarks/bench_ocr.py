@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Page-parallel OCR benchmark: sequential (1 worker) vs. a thread pool of OCR workers
+on generated multi-page transcripts (benchmarks.corpus).
+
+Run (from backend/):
+  python -m benchmarks.bench_ocr [--pages 1 3 5 10] [--workers 4] [--dpi 180] [--repeat 2] [--max-mb 48]
+"""
+import argparse
+import time
+import tracemalloc
+from typing import List, Optional
+
+from benchmarks.corpus import make_transcript
+from parsers.ocr import ocr_pages
+
+def make_fixture(pages: int) -> bytes:
+    return make_transcript(pages)
+
+def bench(pdf: bytes, dpi: int, workers: int, repeat: int, max_mb: Optional[float] = None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        ocr_pages(pdf, dpi=dpi, workers=workers, max_mb=max_mb)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def peak_mb(pdf: bytes, dpi: int, workers: int, max_mb: Optional[float] = None) -> float:
+    """Peak Python-heap bytes of one run; rendered page buffers are Python bytes, so they show up."""
+    tracemalloc.start()
+    ocr_pages(pdf, dpi=dpi, workers=workers, max_mb=max_mb)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, nargs="+", default=[1, 3, 5, 10])
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--dpi", type=int, default=180)
+    ap.add_argument("--repeat", type=int, default=2)
+    ap.add_argument("--max-mb", type=float, default=None, help="per-job render cap (default OCR_JOB_MAX_MB)")
+    args = ap.parse_args()
+
+    print(f"{'pages':>5} {'1 worker':>10} {f'{args.workers} workers':>11} {'speedup':>8} {'peak MB':>8}")
+    for n in args.pages:
+        pdf = make_fixture(n)
+        seq = bench(pdf, args.dpi, 1, args.repeat)
+        par = bench(pdf, args.dpi, args.workers, args.repeat, args.max_mb)
+        peak = peak_mb(pdf, args.dpi, args.workers, args.max_mb)
+        print(f"{n:>5} {seq:>9.2f}s {par:>10.2f}s {seq / par:>7.2f}x {peak:>8.1f}")
+
+if __name__ == "__main__":
+    main()
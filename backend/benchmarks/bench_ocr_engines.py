@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+OCR engine benchmark: pytesseract (one tesseract process per page) vs. the persistent
+tesserocr engine pool (parsers.ocr_pool) on image-only synthetic transcripts.
+
+The pool is timed warm (engines already loaded) and its one-off startup is reported
+separately; both engines see the same rendered pages and worker count.
+
+Run (from backend/; needs tesserocr and the tesseract binary):
+  python -m benchmarks.bench_ocr_engines [--pages 1 3 10] [--workers 4] [--dpi 180] [--repeat 2]
+"""
+import argparse
+import time
+
+from benchmarks.corpus import image_only, make_transcript
+from parsers import ocr_pool
+from parsers.ocr import ocr_pages
+
+def bench(pdf: bytes, dpi: int, workers: int, repeat: int, engine: str) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        ocr_pages(pdf, dpi=dpi, workers=workers, engine=engine)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, nargs="+", default=[1, 3, 10])
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--dpi", type=int, default=180)
+    ap.add_argument("--repeat", type=int, default=2)
+    args = ap.parse_args()
+    if not ocr_pool.tesserocr_available():
+        raise SystemExit("tesserocr is not installed; nothing to compare")
+
+    warm = image_only(make_transcript(args.workers))
+    t0 = time.perf_counter()
+    ocr_pages(warm, dpi=args.dpi, workers=args.workers, engine="pool")  # start + load every engine
+    print(f"pool startup (+{args.workers} pages): {time.perf_counter() - t0:.2f}s")
+
+    print(f"{'pages':>5} {'subprocess':>11} {'pool':>9} {'speedup':>8} {'ms/page sub':>12} {'ms/page pool':>13}")
+    for n in args.pages:
+        pdf = image_only(make_transcript(n))
+        sub = bench(pdf, args.dpi, args.workers, args.repeat, "subprocess")
+        pool = bench(pdf, args.dpi, args.workers, args.repeat, "pool")
+        print(f"{n:>5} {sub:>10.2f}s {pool:>8.2f}s {sub / pool:>7.2f}x {1000 * sub / n:>12.0f} {1000 * pool / n:>13.0f}")
+    print(ocr_pool.get_pool(args.workers).snapshot())
+
+if __name__ == "__main__":
+    main()
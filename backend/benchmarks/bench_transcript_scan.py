@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Transcript course-scanner benchmark: the previous finditer + _find_term parser (kept
+below as the reference) vs. the single-pass scan_transcript, on synthetic multi-year
+transcripts. Also checks that both produce identical output.
+
+Run (from backend/):
+  python -m benchmarks.bench_transcript_scan [--years 4 8 16 32] [--per-term 6]
+"""
+import argparse
+import random
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from parsers.transcript_parser import (
+    COURSE_INST, COURSE_TR, COURSE_INPROG, RE_GRADE, SEASON_HEADER,
+    parse_courses_in_progress, scan_transcript,
+)
+
+# ---- reference implementation (pre single-pass) ----
+
+_TERM_LINE = re.compile(r"^\s*Term:\s*(.+)$", re.MULTILINE)
+
+def _find_term(text: str, pos: int) -> Optional[str]:
+    prior = text[:pos]
+    m = list(_TERM_LINE.finditer(prior))
+    if m: return m[-1].group(1).strip()
+    m2 = list(SEASON_HEADER.finditer(prior))
+    if m2: return m2[-1].group(0).split(":")[0].strip()
+    return None
+
+def legacy_completed(text: str) -> List[Dict[str, Any]]:
+    out = []
+    for m in COURSE_INST.finditer(text):
+        out.append({"term": _find_term(text, m.start()), "subject": m.group("subject"),
+                    "number": m.group("number"), "level": m.group("level"),
+                    "title": m.group("title").strip(), "grade": m.group("grade"),
+                    "credits": float(m.group("credits")), "source": "institution", "status": "completed"})
+    for m in COURSE_TR.finditer(text):
+        out.append({"term": _find_term(text, m.start()), "subject": m.group("subject"),
+                    "number": m.group("number"), "title": m.group("title").strip(),
+                    "grade": m.group("grade"), "credits": float(m.group("credits")),
+                    "source": "transfer", "status": "completed"})
+    return out
+
+def legacy_in_progress(text: str) -> List[Dict[str, Any]]:
+    m = re.search(r"COURSES IN PROGRESS(.*?)(?:Esther Privacy|$)", text, re.IGNORECASE | re.DOTALL)
+    if not m or not m.group(1): return []
+    sec = m.group(1)
+    tm = re.search(r"\bTerm:\s*(.+)", sec)
+    term = tm.group(1).strip() if tm else None
+    rows = []
+    for c in COURSE_INPROG.finditer(sec):
+        title = c.group("title").strip()
+        if re.search(rf"\s{RE_GRADE}$", title): continue
+        rows.append({"term": term, "subject": c.group("subject"), "number": c.group("number"),
+                     "level": c.group("level"), "title": title, "credits": float(c.group("credits")),
+                     "source": "institution", "status": "in_progress"})
+    return rows
+
+# ---- synthetic transcripts ----
+
+SUBJECTS = ["COMP", "MATH", "ELEC", "PHYS", "STAT", "ECON", "HIST", "ENGL"]
+GRADES = ["A+", "A", "A-", "B+", "B", "B-", "C+", "P", "S"]
+
+def make_transcript(years: int, per_term: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    lines = ["Rice University Unofficial Transcript", "Curriculum Information",
+             "Major: Computer Science", "TRANSFER CREDIT ACCEPTED BY INSTITUTION"]
+    for _ in range(4):
+        lines.append(f"{rnd.choice(SUBJECTS)} {rnd.randint(100, 199)} Transfer Course AP 3.000 0.00")
+    lines.append("INSTITUTION CREDIT")
+    for y in range(years):
+        for season in ("Fall", "Spring"):
+            lines.append(f"Term: {season} {2000 + y}")
+            lines.append("Subject Course Level Title Grade Credit Hours Quality Points")
+            for _ in range(per_term):
+                lines.append(f"{rnd.choice(SUBJECTS)} {rnd.randint(100, 499)} UG "
+                             f"Some Course Title {rnd.randint(1, 99)} {rnd.choice(GRADES)} 3.000 12.00")
+            lines.append("Term Totals (Undergraduate) Attempt Hours Passed Hours")
+    lines += ["TRANSCRIPT TOTALS", "COURSES IN PROGRESS", f"Term: Fall {2000 + years}"]
+    for _ in range(per_term):
+        lines.append(f"{rnd.choice(SUBJECTS)} {rnd.randint(100, 499)} UG In Progress Course 3.000")
+    lines.append("Esther Privacy Statement")
+    return "\n".join(lines)
+
+def best_of(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(arg); best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=int, nargs="+", default=[4, 8, 16, 32])
+    ap.add_argument("--per-term", type=int, default=6)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'years':>5} {'lines':>6} {'legacy':>10} {'single-pass':>12} {'speedup':>8}  same")
+    for years in args.years:
+        text = make_transcript(years, args.per_term)
+        scan = scan_transcript(text)
+        same = (scan["courses_completed"] == legacy_completed(text)
+                and scan["courses_in_progress"] == legacy_in_progress(text)
+                and parse_courses_in_progress(text, None) == legacy_in_progress(text))
+        old = best_of(lambda t: (legacy_completed(t), legacy_in_progress(t)), text, args.repeat)
+        new = best_of(scan_transcript, text, args.repeat)
+        print(f"{years:>5} {text.count(chr(10)) + 1:>6} {old * 1e3:>8.2f}ms {new * 1e3:>10.2f}ms {old / new:>7.1f}x  {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Synthetic benchmark corpus: resume and transcript PDFs built with PyMuPDF at any page
+count, laid out the way the parsers expect, plus image-only variants (every page
+rasterized, no text layer) to exercise the OCR path.
+
+Run (from backend/):
+  python -m benchmarks.corpus OUT_DIR [--pages 1 2 5 10] [--no-image] [--dpi 150]
+
+Writes the PDFs and a manifest.csv (path,kind,student) that parsers.batch_parse accepts.
+"""
+import argparse
+import csv
+import os
+import random
+from typing import Dict, Iterator, List
+
+PAGE_W, PAGE_H = 612, 792  # US letter, points
+MARGIN = 50
+FONT_SIZE = 10
+LINE_H = 14
+LINES_PER_PAGE = (PAGE_H - 2 * MARGIN) // LINE_H
+
+SUBJECTS = ["COMP", "MATH", "ELEC", "STAT", "PHYS", "ECON", "CAAM", "DSCI", "ENGL", "HIST"]
+TITLES = ["Intro to Computation", "Data Structures", "Algorithms", "Linear Algebra",
+          "Probability", "Signals and Systems", "Operating Systems", "Machine Learning",
+          "Microeconomics", "Writing Seminar", "Mechanics", "Databases"]
+GRADES = ["A+", "A", "A-", "B+", "B", "B-", "C+", "P", "S"]
+SEASONS = ["Fall", "Spring"]
+ROLES = ["Software Engineering Intern", "Research Assistant", "Teaching Assistant",
+         "Data Science Intern", "Backend Developer"]
+COMPANIES = ["Acme Corp Houston, TX", "Rice University Houston, TX", "Initech Austin, TX",
+             "Globex Seattle, WA", "Hooli Mountain View, CA"]
+VERBS = ["Built", "Designed", "Optimized", "Shipped", "Automated", "Analyzed", "Refactored"]
+THINGS = ["a REST API in FastAPI", "an ETL pipeline over 2M rows", "the CI test matrix",
+          "a React dashboard", "a PyTorch training loop", "query latency by 40%"]
+
+
+def _layout(lines: List[str], pages: int) -> bytes:
+    import fitz
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page(width=PAGE_W, height=PAGE_H)
+        chunk = lines[p * LINES_PER_PAGE:(p + 1) * LINES_PER_PAGE]
+        y = MARGIN + FONT_SIZE
+        for line in chunk:
+            page.insert_text((MARGIN, y), line, fontsize=FONT_SIZE)
+            y += LINE_H
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def _fit(head: List[str], body: Iterator[List[str]], tail: List[str], pages: int) -> List[str]:
+    """head + as many body blocks as fit + tail, filling exactly `pages` pages."""
+    room = pages * LINES_PER_PAGE - len(head) - len(tail)
+    lines = list(head)
+    for block in body:
+        if len(block) > room:
+            break
+        lines += block
+        room -= len(block)
+    return lines + tail
+
+def resume_lines(pages: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    head = [
+        "Jordan Example",
+        "(713) 555-0100 | jordan@example.com | linkedin.com/in/jordan | github.com/jordan",
+        "Education",
+        "Rice University Houston, TX",
+        "Bachelor of Science in Computer Science May 2027",
+        "Experience",
+    ]
+    tail = [
+        "Projects",
+        "OwlConnect | Python, FastAPI, MongoDB Jan 2025",
+        "• Matched mentees to alumni mentors with sentence embeddings",
+        "Technical Skills",
+        "Languages: Python, Java, C, SQL, TypeScript",
+        "Frameworks: FastAPI, React, PyTorch",
+    ]
+    def jobs():
+        year = 2026
+        while True:
+            block = [f"{rng.choice(ROLES)} Jun {year - 1} – Aug {year - 1}", rng.choice(COMPANIES)]
+            block += [f"• {rng.choice(VERBS)} {rng.choice(THINGS)}" for _ in range(rng.randint(2, 4))]
+            year -= 1
+            yield block
+    return _fit(head, jobs(), tail, pages)
+
+def transcript_lines(pages: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    head = [
+        "Curriculum Information",
+        "Major: Computer Science",
+        "Department: Computer Science",
+        "INSTITUTION CREDIT",
+    ]
+    tail = [
+        "COURSES IN PROGRESS",
+        "Term: Spring 2027",
+        "COMP 382 UG Reasoning about Algorithms 4.000",
+        "COMP 421 UG Operating Systems 4.000",
+        "Esther Privacy Statement",
+    ]
+    def terms():
+        k = 0
+        while True:
+            block = [f"Term: {SEASONS[k % 2]} {2000 + k // 2}"]
+            for _ in range(rng.randint(4, 6)):
+                credits = rng.choice([3, 4])
+                block.append(
+                    f"{rng.choice(SUBJECTS)} {rng.randint(100, 599)} UG {rng.choice(TITLES)} "
+                    f"{rng.choice(GRADES)} {credits}.000 {credits * 3.7:.2f}"
+                )
+            k += 1
+            yield block
+    return _fit(head, terms(), tail, pages)
+
+def make_resume(pages: int, seed: int = 0) -> bytes:
+    return _layout(resume_lines(pages, seed), pages)
+
+def make_transcript(pages: int, seed: int = 0) -> bytes:
+    return _layout(transcript_lines(pages, seed), pages)
+
+def image_only(pdf: bytes, dpi: int = 150) -> bytes:
+    """Rasterize every page into a new PDF with no text layer (a 'scanned' document)."""
+    import fitz
+    src = fitz.open(stream=pdf, filetype="pdf")
+    out = fitz.open()
+    zoom = dpi / 72.0
+    for page in src:
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY)
+        dst = out.new_page(width=page.rect.width, height=page.rect.height)
+        dst.insert_image(dst.rect, pixmap=pix)
+    data = out.tobytes(deflate=True)
+    src.close(); out.close()
+    return data
+
+MAKERS = {"resume": make_resume, "transcript": make_transcript}
+
+def build_corpus(page_counts: List[int], image: bool = True, dpi: int = 150, seed: int = 0) -> List[Dict]:
+    """In-memory corpus: one entry per (kind, pages, variant)."""
+    out = []
+    for kind, make in MAKERS.items():
+        for n in page_counts:
+            pdf = make(n, seed)
+            out.append({"kind": kind, "pages": n, "variant": "text", "pdf": pdf})
+            if image:
+                out.append({"kind": kind, "pages": n, "variant": "image", "pdf": image_only(pdf, dpi)})
+    return out
+
+def write_corpus(out_dir: str, corpus: List[Dict]) -> str:
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = os.path.join(out_dir, "manifest.csv")
+    with open(manifest, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["path", "kind", "student"])
+        for e in corpus:
+            name = f"{e['kind']}-{e['pages']}p-{e['variant']}.pdf"
+            with open(os.path.join(out_dir, name), "wb") as pf:
+                pf.write(e["pdf"])
+            w.writerow([name, e["kind"], f"synthetic-{e['pages']}p-{e['variant']}"])
+    return manifest
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("out_dir")
+    ap.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5, 10])
+    ap.add_argument("--no-image", action="store_true", help="skip image-only variants")
+    ap.add_argument("--dpi", type=int, default=150, help="raster DPI of image-only variants")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    corpus = build_corpus(args.pages, image=not args.no_image, dpi=args.dpi, seed=args.seed)
+    print(f"wrote {len(corpus)} PDFs, manifest {write_corpus(args.out_dir, corpus)}")
+
+if __name__ == "__main__":
+    main()
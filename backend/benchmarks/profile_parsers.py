@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Per-stage parser profiler over the synthetic corpus (benchmarks.corpus).
+
+For every document and every extraction backend (ocr, pymupdf, pypdf2) it times each
+stage separately: open, render, ocr, extract, normalize, split_sections (resume) and the
+individual regex parse functions, then reports per (kind, variant, backend, stage), where
+the variant is the corpus's text or image-only PDF: total time,
+ms/page, pages/s and peak Python-heap memory (tracemalloc; MuPDF/Tesseract native
+allocations are not visible there, so process max RSS is printed as well).
+
+Run (from backend/):
+  python -m benchmarks.profile_parsers [--pages 1 2 5] [--backends ocr pymupdf pypdf2]
+                                       [--no-image] [--repeat 3] [--no-memory] [--json out.json]
+"""
+import argparse
+import json
+import resource
+import shutil
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import build_corpus
+from parsers import resume_parser as rp
+from parsers import transcript_parser as tp
+from parsers.ocr import OCR_CONFIG, _ocr_image, _render
+from parsers.pdf_source import open_pdf
+from parsers.transcript_layout import scan_layout
+
+BACKENDS = ("ocr", "pymupdf", "pypdf2")
+DPI = {"resume": rp.RESUME_OCR_DPI, "transcript": tp.TRANSCRIPT_OCR_DPI}
+
+Key = Tuple[str, str, str, str]  # (kind, variant, backend, stage)
+
+
+class Profiler:
+    def __init__(self, repeat: int, memory: bool):
+        self.repeat = repeat
+        self.memory = memory
+        self.seconds: Dict[Key, float] = defaultdict(float)
+        self.pages: Dict[Key, int] = defaultdict(int)
+        self.peak: Dict[Key, int] = defaultdict(int)
+
+    def stage(self, key: Key, pages: int, fn: Callable, *args,
+              release: Optional[Callable[[Any], None]] = None) -> Any:
+        """
+        Best-of-`repeat` wall time of fn(*args); a separate traced run for peak memory.
+        Only the first result is returned; `release` disposes of the others (e.g. closes
+        the extra documents an open stage creates).
+        """
+        best = float("inf")
+        out = None
+        for i in range(self.repeat):
+            t0 = time.perf_counter()
+            res = fn(*args)
+            best = min(best, time.perf_counter() - t0)
+            if i == 0:
+                out = res
+            elif release is not None:
+                release(res)
+        if self.memory:
+            tracemalloc.start()
+            res = fn(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if release is not None:
+                release(res)
+            self.peak[key] = max(self.peak[key], peak)
+        self.seconds[key] += best
+        self.pages[key] += pages
+        return out
+
+
+def _close(doc) -> None:
+    doc.close()
+
+def _ocr_text(prof: Profiler, kind: str, variant: str, pdf: bytes, n: int) -> str:
+    doc = prof.stage((kind, variant, "ocr", "open"), n, open_pdf, pdf, release=_close)
+    dpi = DPI[kind]
+    texts = []
+    for page in doc:
+        img = prof.stage((kind, variant, "ocr", "render"), 1, _render, page, dpi)
+        texts.append(prof.stage((kind, variant, "ocr", "ocr"), 1, _ocr_image, img, OCR_CONFIG))
+    doc.close()
+    return "\n".join(texts)
+
+def _pymupdf_text(prof: Profiler, kind: str, variant: str, pdf: bytes, n: int) -> str:
+    doc = prof.stage((kind, variant, "pymupdf", "open"), n, open_pdf, pdf, release=_close)
+    extract = rp.extract_text_pymupdf if kind == "resume" else tp._extract_text_pymupdf
+    text = prof.stage((kind, variant, "pymupdf", "extract"), n, extract, doc)
+    if kind == "transcript":
+        prof.stage((kind, variant, "pymupdf", "scan_layout"), n, scan_layout, doc)
+    doc.close()
+    return text
+
+def _pypdf2_text(prof: Profiler, kind: str, variant: str, pdf: bytes, n: int) -> str:
+    extract = rp.extract_text_pypdf2 if kind == "resume" else tp._extract_text_pypdf2
+    return prof.stage((kind, variant, "pypdf2", "extract"), n, extract, pdf)
+
+EXTRACT = {"ocr": _ocr_text, "pymupdf": _pymupdf_text, "pypdf2": _pypdf2_text}
+
+def _parse_stages(prof: Profiler, kind: str, variant: str, backend: str, raw: str, n: int) -> None:
+    def st(stage, fn, *args):
+        return prof.stage((kind, variant, backend, stage), n, fn, *args)
+    if kind == "resume":
+        text = st("normalize_text", rp.normalize_text, raw)
+        sections = st("split_sections", rp.split_sections, text)
+        st("parse_contact_and_name", rp.parse_contact_and_name, text)
+        st("parse_education", rp.parse_education, sections.get("education", ""))
+        st("parse_experience", rp.parse_experience, sections.get("experience", ""))
+        st("parse_projects", rp.parse_projects, sections.get("projects", ""))
+        st("parse_skills", rp.parse_skills, sections.get("technical skills", "") or sections.get("skills", ""))
+    else:
+        text = st("normalize", tp._normalize, raw)
+        st("parse_majors", tp.parse_majors, text)
+        st("scan_transcript", tp.scan_transcript, text)
+
+def profile(corpus: List[Dict], backends: List[str], prof: Profiler) -> None:
+    for e in corpus:
+        for backend in backends:
+            raw = EXTRACT[backend](prof, e["kind"], e["variant"], e["pdf"], e["pages"])
+            _parse_stages(prof, e["kind"], e["variant"], backend, raw, e["pages"])
+
+def report(prof: Profiler) -> List[Dict[str, Any]]:
+    rows = []
+    for key in sorted(prof.seconds):
+        kind, variant, backend, stage = key
+        s, p = prof.seconds[key], prof.pages[key]
+        rows.append({
+            "kind": kind, "variant": variant, "backend": backend, "stage": stage, "pages": p,
+            "seconds": round(s, 6),
+            "ms_per_page": round(1000 * s / p, 3) if p else None,
+            "pages_per_s": round(p / s, 1) if s else None,
+            "peak_mb": round(prof.peak[key] / 2**20, 2) if prof.memory else None,
+        })
+    return rows
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5])
+    ap.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    ap.add_argument("--no-image", action="store_true", help="skip image-only corpus variants")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    ap.add_argument("--json", help="also write the rows as JSON here")
+    args = ap.parse_args()
+
+    backends = list(args.backends)
+    if "ocr" in backends and shutil.which("tesseract") is None:
+        print("tesseract not found; skipping the ocr backend", file=sys.stderr)
+        backends.remove("ocr")
+
+    corpus = build_corpus(args.pages, image=not args.no_image)
+    prof = Profiler(args.repeat, memory=not args.no_memory)
+    t0 = time.perf_counter()
+    profile(corpus, backends, prof)
+    rows = report(prof)
+
+    print(f"{'kind':<10} {'variant':<7} {'backend':<8} {'stage':<24} {'pages':>5} {'total s':>9} "
+          f"{'ms/page':>9} {'pages/s':>9} {'peak MB':>8}")
+    for r in rows:
+        peak = f"{r['peak_mb']:>8.2f}" if r["peak_mb"] is not None else f"{'-':>8}"
+        pps = f"{r['pages_per_s']:>9.1f}" if r["pages_per_s"] is not None else f"{'inf':>9}"
+        print(f"{r['kind']:<10} {r['variant']:<7} {r['backend']:<8} {r['stage']:<24} {r['pages']:>5} "
+              f"{r['seconds']:>9.4f} {r['ms_per_page']:>9.3f} {pps} {peak}")
+    maxrss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    print(f"\n{len(corpus)} documents in {time.perf_counter() - t0:.1f}s; process max RSS {maxrss_mb:.0f} MB")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
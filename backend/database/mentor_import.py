@@ -0,0 +1,278 @@
+# database/mentor_import.py
+# Bulk mentor import: NDJSON/CSV -> normalized Profile fields + precomputed embeddings -> Mongo.
+#
+# Run:  python -m database.mentor_import alumni.ndjson [--format csv] [--upsert-on name]
+from __future__ import annotations
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+LIST_FIELDS = (
+    "hobbies", "life_interests", "career_interests", "course_descriptions",
+    "job_description", "skills", "availability", "goals", "interests",
+)
+STR_FIELDS = ("name", "mbti", "communication_style")
+INT_FIELDS = ("experience",)
+
+# CSV cells hold lists as "a; b; c" (or "a | b")
+LIST_SPLIT_RE = re.compile(r"\s*[;|]\s*")
+MBTI_RE = re.compile(r"^[EI][SN][TF][JP]$")
+
+DEFAULT_CHUNK_SIZE = 1000
+EMBED_BATCH_SIZE = 256
+
+
+class RowError(ValueError):
+    pass
+
+
+# ---- Reading ----
+
+def detect_format(filename: Optional[str]) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return "csv" if ext == ".csv" else "ndjson"
+
+def iter_rows(stream: IO[str], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (row_number, raw_record). Malformed NDJSON lines come through as RowError."""
+    if fmt == "csv":
+        for i, row in enumerate(csv.DictReader(stream), start=1):
+            yield i, row
+        return
+    for i, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield i, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield i, RowError(f"invalid JSON: {e.msg}")
+
+
+# ---- Normalizing ----
+
+def _as_list(v: Any) -> List[str]:
+    if v is None:
+        return []
+    if isinstance(v, str):
+        return [x for x in LIST_SPLIT_RE.split(v.strip()) if x]
+    if isinstance(v, (list, tuple)):
+        return [str(x).strip() for x in v if x is not None and str(x).strip()]
+    raise RowError(f"expected list or string, got {type(v).__name__}")
+
+def normalize_record(raw: Any) -> Dict[str, Any]:
+    """Map a raw alumni record onto the Profile fields used by the matcher."""
+    if not isinstance(raw, dict):
+        raise RowError("record must be an object")
+    out: Dict[str, Any] = {}
+    for f in LIST_FIELDS:
+        out[f] = _as_list(raw.get(f))
+    for f in STR_FIELDS:
+        v = raw.get(f)
+        out[f] = "" if v is None else str(v).strip()
+    for f in INT_FIELDS:
+        v = raw.get(f)
+        if v in (None, ""):
+            out[f] = 0
+            continue
+        try:
+            out[f] = int(float(v))
+        except (TypeError, ValueError):
+            raise RowError(f"{f} must be a number, got {v!r}")
+        if out[f] < 0:
+            raise RowError(f"{f} must be >= 0")
+
+    if not out["name"]:
+        raise RowError("name is required")
+    out["mbti"] = out["mbti"].upper()
+    if out["mbti"] and not MBTI_RE.match(out["mbti"]):
+        raise RowError(f"invalid mbti {out['mbti']!r}")
+    if not out["interests"]:
+        out["interests"] = out["hobbies"] + out["life_interests"]
+    return out
+
+
+# ---- Embeddings ----
+
+def compute_embeddings(model: Any, records: List[Dict[str, Any]], model_name: str) -> None:
+    """
+    Attach {"embeddings": {...}} to each record with the same mean vectors the matcher
+    would compute, but encoding every sentence of the chunk in one batched call.
+    """
+    from agents.mentor_mentee_matching import (
+        Profile, _split_paragraph, interpersonal_texts, mentor_professional_texts,
+    )
+    import numpy as np
+
+    kinds = (("interpersonal", interpersonal_texts), ("professional", mentor_professional_texts))
+    sentences: List[str] = []
+    spans: List[Dict[str, Tuple[int, int]]] = []
+    for rec in records:
+        profile = Profile(**{k: rec[k] for k in LIST_FIELDS + STR_FIELDS + INT_FIELDS})
+        span: Dict[str, Tuple[int, int]] = {}
+        for key, texts_of in kinds:
+            texts = _split_paragraph(texts_of(profile))
+            span[key] = (len(sentences), len(sentences) + len(texts))
+            sentences.extend(texts)
+        spans.append(span)
+
+    vectors = model.encode(sentences, batch_size=EMBED_BATCH_SIZE) if sentences else []
+    for rec, span in zip(records, spans):
+        emb: Dict[str, Any] = {"model": model_name}
+        for key, (lo, hi) in span.items():
+            emb[key] = np.mean(vectors[lo:hi], axis=0).astype(float).tolist() if hi > lo else None
+        rec["embeddings"] = emb
+
+
+# ---- Writing ----
+
+def _write_errors(e: BulkWriteError, rows: List[int]) -> List[Dict[str, Any]]:
+    return [
+        {"row": rows[err["index"]], "error": err.get("errmsg", "write error")}
+        for err in e.details.get("writeErrors", [])
+    ]
+
+def _upsert_update(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """$set the imported fields; created_at only on insert, so a re-import keeps the original."""
+    fields = {k: v for k, v in doc.items() if k != "created_at"}
+    update: Dict[str, Any] = {"$set": fields, "$setOnInsert": {"created_at": doc["created_at"]}}
+    if "embeddings" not in doc:
+        update["$unset"] = {"embeddings": ""}  # vectors of the previous profile would be wrong now
+    return update
+
+async def _write_chunk(
+    collection: AsyncIOMotorCollection,
+    docs: List[Dict[str, Any]],
+    rows: List[int],
+    upsert_on: Optional[str],
+) -> Tuple[int, List[Dict[str, Any]]]:
+    try:
+        if upsert_on:
+            ops = [UpdateOne({upsert_on: d[upsert_on]}, _upsert_update(d), upsert=True) for d in docs]
+            res = await collection.bulk_write(ops, ordered=False)
+            return res.upserted_count + res.modified_count, []
+        res = await collection.insert_many(docs, ordered=False)
+        return len(res.inserted_ids), []
+    except BulkWriteError as e:
+        written = e.details.get("nInserted", 0) + e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+        return written, _write_errors(e, rows)
+
+def _chunks(rows: Iterable[Tuple[int, Any]], size: int) -> Iterator[List[Tuple[int, Any]]]:
+    buf: List[Tuple[int, Any]] = []
+    for r in rows:
+        buf.append(r)
+        if len(buf) >= size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+async def import_mentors(
+    collection: AsyncIOMotorCollection,
+    rows: Iterable[Tuple[int, Any]],
+    model: Any = None,
+    model_name: str = "",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    upsert_on: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Validate, embed and write mentors chunk by chunk. Bad rows never abort the import;
+    they are reported as {"row": n, "error": msg}.
+    """
+    started = time.perf_counter()
+    received = written = 0
+    errors: List[Dict[str, Any]] = []
+
+    for chunk in _chunks(rows, chunk_size):
+        docs: List[Dict[str, Any]] = []
+        doc_rows: List[int] = []
+        for row_no, raw in chunk:
+            received += 1
+            try:
+                if isinstance(raw, RowError):
+                    raise raw
+                doc = normalize_record(raw)
+                if upsert_on and not doc.get(upsert_on):
+                    raise RowError(f"missing upsert key {upsert_on!r}")
+            except RowError as e:
+                errors.append({"row": row_no, "error": str(e)})
+                continue
+            docs.append(doc)
+            doc_rows.append(row_no)
+        if not docs:
+            continue
+
+        if model is not None:
+            # encoding is CPU-bound; keep the event loop free while it runs
+            await asyncio.to_thread(compute_embeddings, model, docs, model_name)
+        now = datetime.utcnow()
+        for d in docs:
+            d["created_at"] = d["updated_at"] = now
+
+        n, errs = await _write_chunk(collection, docs, doc_rows, upsert_on)
+        written += n
+        errors.extend(errs)
+
+    return {
+        "received": received,
+        "written": written,
+        "failed": len(errors),
+        "errors": errors,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def load_embedding_model():
+    from sentence_transformers import SentenceTransformer
+    from agents.mentor_mentee_matching import EMBEDDING_MODEL_NAME
+    return SentenceTransformer(EMBEDDING_MODEL_NAME), EMBEDDING_MODEL_NAME
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Bulk-import mentors from NDJSON or CSV")
+    ap.add_argument("path", help="NDJSON or CSV file")
+    ap.add_argument("--format", choices=["ndjson", "csv"], help="default: from file extension")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    ap.add_argument("--upsert-on", help="update existing mentors matching this field (e.g. name)")
+    ap.add_argument("--no-embeddings", action="store_true", help="skip embedding precompute")
+    args = ap.parse_args()
+
+    import certifi
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+    load_dotenv()
+    uri = os.getenv("MONGODB_URI")
+    if not uri:
+        raise SystemExit("Please add MONGODB_URI to your environment variables")
+
+    model, model_name = (None, "") if args.no_embeddings else load_embedding_model()
+
+    async def run():
+        client = AsyncIOMotorClient(uri, tls=True, tlsCAFile=certifi.where())
+        with io.open(args.path, encoding="utf-8-sig", newline="") as f:
+            report = await import_mentors(
+                client.owlconnect.mentors,
+                iter_rows(f, args.format or detect_format(args.path)),
+                model=model, model_name=model_name,
+                chunk_size=args.chunk_size, upsert_on=args.upsert_on,
+            )
+        client.close()
+        return report
+
+    report = asyncio.run(run())
+    for err in report["errors"]:
+        print(f"row {err['row']}: {err['error']}")
+    print(f"{report['written']}/{report['received']} mentors written in {report['seconds']}s ({report['failed']} failed)")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,23 @@
 # database/mentors_crud.py (or onboarding_crud.py)
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, Iterable
+import asyncio
+import copy
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Iterable, Tuple
 from motor.motor_asyncio import AsyncIOMotorCollection
 from bson import ObjectId
+from pymongo.errors import OperationFailure
+from database.cache import TTLCache
+
+log = logging.getLogger(__name__)
+
+ALL_KEY = ("all",)
+WATCH_RETRY_MIN = float(os.getenv("MENTOR_WATCH_RETRY_MIN", "1"))
+WATCH_RETRY_MAX = float(os.getenv("MENTOR_WATCH_RETRY_MAX", "60"))
+CHANGE_STREAM_HISTORY_LOST = 286
+# precomputed vectors are only for the matcher; keep them out of the cached HTTP views
+NO_EMBEDDINGS = {"embeddings": 0}
 
 def _to_str_id_one(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     if not doc:
@@ -18,14 +33,85 @@ def _to_str_id_many(docs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [d for d in (_to_str_id_one(doc) for doc in docs) if d is not None]
 
 class MentorsCRUD:
-    def __init__(self, collection: AsyncIOMotorCollection):
+    def __init__(self, collection: AsyncIOMotorCollection, cache: Optional[TTLCache] = None):
         self.collection = collection
+        # mentor profiles rarely change; reads go through this cache and writes invalidate it
+        self.cache = cache if cache is not None else TTLCache(maxsize=512, ttl=300.0)
 
-    async def get_all(self) -> List[Dict[str, Any]]:
-        cursor = self.collection.find({})  # add filters here if needed
+    async def _read_through(self, key: Tuple, loader: Callable[[], Awaitable[Any]]) -> Tuple[Any, Optional[str]]:
+        # callers get their own deep copy: mutating a served record must not change the cache
+        hit = self.cache.get(key)
+        if hit is not None:
+            value, etag = hit
+            return copy.deepcopy(value), etag
+        value = await loader()
+        if value is None:
+            return None, None  # don't cache misses; the mentor may be inserted any moment
+        return copy.deepcopy(value), self.cache.set(key, value)
+
+    async def _load_all(self) -> List[Dict[str, Any]]:
+        cursor = self.collection.find({}, projection=NO_EMBEDDINGS)  # add filters here if needed
         docs = await cursor.to_list(length=None)
         return _to_str_id_many(docs)
 
-    async def get(self, id: str) -> Optional[Dict[str, Any]]:
-        doc = await self.collection.find_one({"_id": ObjectId(id)})
+    async def _load_one(self, id: str) -> Optional[Dict[str, Any]]:
+        doc = await self.collection.find_one({"_id": ObjectId(id)}, projection=NO_EMBEDDINGS)
         return _to_str_id_one(doc)
+
+    async def get_all_with_etag(self) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await self._read_through(ALL_KEY, self._load_all)
+
+    async def get_with_etag(self, id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        return await self._read_through(("one", id), lambda: self._load_one(id))
+
+    async def get_all(self) -> List[Dict[str, Any]]:
+        docs, _ = await self.get_all_with_etag()
+        return docs
+
+    async def get(self, id: str) -> Optional[Dict[str, Any]]:
+        doc, _ = await self.get_with_etag(id)
+        return doc
+
+    async def get_all_with_embeddings(self) -> List[Dict[str, Any]]:
+        """Every mentor including precomputed embeddings, for the matcher; not cached."""
+        docs = await self.collection.find({}).to_list(length=None)
+        return _to_str_id_many(docs)
+
+    async def update(self, id: str, fields: Dict[str, Any]) -> bool:
+        res = await self.collection.update_one({"_id": ObjectId(id)}, {"$set": fields})
+        self.invalidate(id)
+        return res.matched_count > 0
+
+    def invalidate(self, id: Optional[str] = None) -> None:
+        """Drop one mentor (plus the list view) or, with no id, everything."""
+        if id is None:
+            self.cache.clear()
+            return
+        self.cache.invalidate(("one", str(id)))
+        self.cache.invalidate(ALL_KEY)
+
+    async def watch_changes(self) -> None:
+        """
+        Invalidate on change-stream events so writes made outside this process are seen.
+        When the stream breaks it is reopened after the last resume token, with backoff
+        (WATCH_RETRY_MIN..WATCH_RETRY_MAX seconds); the TTL covers the gap. Change streams
+        need a replica set (Atlas has one); on a standalone server this keeps retrying at
+        the max interval and the TTL is all there is.
+        """
+        token = None
+        delay = WATCH_RETRY_MIN
+        while True:
+            try:
+                async with self.collection.watch(start_after=token) as stream:
+                    async for change in stream:
+                        token = stream.resume_token
+                        delay = WATCH_RETRY_MIN
+                        key = (change.get("documentKey") or {}).get("_id")
+                        self.invalidate(str(key) if key is not None else None)
+            except Exception as e:
+                if isinstance(e, OperationFailure) and e.code == CHANGE_STREAM_HISTORY_LOST:
+                    token = None  # fell off the oplog; start fresh, everything was invalidated anyway
+                log.warning("mentor change stream failed, retrying in %gs (TTL only until then): %s", delay, e)
+            self.invalidate()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WATCH_RETRY_MAX)
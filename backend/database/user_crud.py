@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Any, Dict, Optional, List, Tuple
 from datetime import datetime
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
 from motor.motor_asyncio import AsyncIOMotorCollection
 
 def _to_str_id(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -12,6 +14,19 @@ def _to_str_id(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     doc.pop("_id", None)
     return doc
 
+def _oid(doc_id: str) -> Optional[ObjectId]:
+    try:
+        return ObjectId(doc_id)
+    except (InvalidId, TypeError):
+        return None
+
+PARAGRAPH_PROJECTION = {"paragraph_text": 1, "updated_at": 1}
+JOB_PROJECTION = {"job": 1, "onboarding_complete": 1, "updated_at": 1}
+JOB_STAGES = ("parse", "catalog")
+JOB_OUTPUT_FIELDS = ("resume_data", "transcript_data", "rice_catalog")
+# onboarding job stubs (queued, running or failed) aren't users yet
+ONBOARDED = {"onboarding_complete": {"$ne": False}}
+
 class OnboardingCRUD:
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
@@ -31,43 +46,114 @@ class OnboardingCRUD:
         res = await self.collection.insert_one(doc)
         return str(res.inserted_id)
 
-    async def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
-        try:
-            doc = await self.collection.find_one({"_id": ObjectId(doc_id)})
-        except Exception:
+    async def create_job(self) -> str:
+        """Insert a placeholder user document whose `job` field tracks onboarding progress."""
+        now = datetime.utcnow()
+        doc = {
+            "onboarding_complete": False,
+            "job": {
+                "status": "queued",
+                "stages": {s: {"status": "pending"} for s in JOB_STAGES},
+                "error": None,
+            },
+            "created_at": now,
+            "updated_at": now,
+        }
+        res = await self.collection.insert_one(doc)
+        return str(res.inserted_id)
+
+    async def update_job(
+        self,
+        doc_id: str,
+        stage: Optional[str] = None,
+        stage_status: Optional[str] = None,
+        status: Optional[str] = None,
+        error: Optional[str] = None,
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Record one progress step (and optionally that stage's output) in a single round trip."""
+        now = datetime.utcnow()
+        update: Dict[str, Any] = {**(fields or {}), "updated_at": now}
+        if stage and stage_status:
+            update[f"job.stages.{stage}.status"] = stage_status
+            update[f"job.stages.{stage}.{'started_at' if stage_status == 'running' else 'finished_at'}"] = now
+        if status:
+            update["job.status"] = status
+        if error is not None:
+            update["job.error"] = error
+        if status == "done":
+            update["onboarding_complete"] = True
+        ops: Dict[str, Any] = {"$set": update}
+        if status == "failed":
+            # drop whatever stages finished so a failed job never looks like a half-written user
+            ops["$unset"] = {f: "" for f in JOB_OUTPUT_FIELDS}
+        doc = await self.collection.find_one_and_update(
+            {"_id": ObjectId(doc_id)},
+            ops,
+            projection=JOB_PROJECTION,
+            return_document=ReturnDocument.AFTER,
+        )
+        return _to_str_id(doc)
+
+    async def get_job(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        return await self.get(doc_id, projection=JOB_PROJECTION)
+
+    async def get(self, doc_id: str, projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        _id = _oid(doc_id)
+        if _id is None:
             return None
+        doc = await self.collection.find_one({"_id": _id}, projection=projection)
         return _to_str_id(doc)
 
     async def get_most_recent(self) -> Optional[Dict[str, Any]]:
-        doc = await self.collection.find_one({}, sort=[("created_at", -1)])
+        doc = await self.collection.find_one(ONBOARDED, sort=[("created_at", -1)])
         return _to_str_id(doc)
 
     async def update_most_recent_paragraph(self, text: str) -> Optional[Dict[str, Any]]:
-        # 1) find most recent doc
-        current = await self.collection.find_one({}, sort=[("created_at", -1)])
-        if not current:
-            return None
-        _id = current["_id"]
+        # legacy path for clients that don't send an id; prefer update_paragraph
+        doc = await self.collection.find_one_and_update(
+            ONBOARDED,
+            {"$set": {"paragraph_text": text, "updated_at": datetime.utcnow()}},
+            sort=[("created_at", -1)],
+            projection=PARAGRAPH_PROJECTION,
+            return_document=ReturnDocument.AFTER,
+        )
+        return _to_str_id(doc)
 
-        # 2) update it
-        await self.collection.update_one(
+    async def update_paragraph(self, doc_id: str, text: str) -> Optional[Dict[str, Any]]:
+        _id = _oid(doc_id)
+        if _id is None:
+            return None
+        doc = await self.collection.find_one_and_update(
             {"_id": _id},
-            {"$set": {"paragraph_text": text, "updated_at": datetime.utcnow()}}
+            {"$set": {"paragraph_text": text, "updated_at": datetime.utcnow()}},
+            projection=PARAGRAPH_PROJECTION,
+            return_document=ReturnDocument.AFTER,
         )
+        return _to_str_id(doc)
 
-        # 3) fetch updated doc
-        updated = await self.collection.find_one({"_id": _id})
-        return _to_str_id(updated)
+    async def patch(self, doc_id: str, set_fields: Dict[str, Any], unset_fields: List[str] = ()) -> bool:
+        """$set / $unset individual (dotted) paths in one update; updated_at is always bumped."""
+        _id = _oid(doc_id)
+        if _id is None:
+            return False
+        update: Dict[str, Any] = {"$set": {**set_fields, "updated_at": datetime.utcnow()}}
+        if unset_fields:
+            update["$unset"] = {f: "" for f in unset_fields}
+        res = await self.collection.update_one({"_id": _id}, update)
+        return res.matched_count == 1
 
-    
     async def add_matched_mentors(self, doc_id: str, mentors: List[Tuple]) -> None:
         await self.collection.update_one(
             {"_id": ObjectId(doc_id)},
-            {"$set": {"matched_mentors": mentors}}
+            {"$set": {"matched_mentors": mentors, "updated_at": datetime.utcnow()}}
         )
 
     async def get_matched_mentors(self, doc_id: str) -> Optional[List[Tuple]]:
-        doc = await self.collection.find_one({"_id": ObjectId(doc_id)})
+        _id = _oid(doc_id)
+        if _id is None:
+            return []
+        doc = await self.collection.find_one({"_id": _id}, projection={"matched_mentors": 1})
         if doc and "matched_mentors" in doc:
             return doc["matched_mentors"]
-        return []
\ No newline at end of file
+        return []
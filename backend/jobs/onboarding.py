@@ -0,0 +1,114 @@
+# jobs/onboarding.py
+# Background onboarding jobs: the upload returns a job id right away and the parse /
+# catalog stages run here, recording per-stage progress on the user document.
+from __future__ import annotations
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from database.user_crud import OnboardingCRUD
+from parsers.parse_pool import ParsePool, PoolBusy
+from parsers.parse_cache import ParseCache, parse_onboarding_cached
+from parsers.pdf_source import PdfSource, discard
+from parsers.transcript_parser import _extract_course_pairs
+
+log = logging.getLogger(__name__)
+
+ONBOARD_JOB_CONCURRENCY = int(os.getenv("ONBOARD_JOB_CONCURRENCY", "8"))
+POOL_BUSY_BACKOFF = 1.0  # seconds; jobs wait for the parse pool instead of failing
+TERMINAL = ("done", "failed")
+
+CatalogLookup = Callable[..., Awaitable[Dict[str, Any]]]
+
+
+class JobEvents:
+    """In-process fan-out of job snapshots to SSE/WebSocket listeners."""
+    def __init__(self):
+        self._subs: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue()
+        self._subs.setdefault(job_id, set()).add(q)
+        return q
+
+    def unsubscribe(self, job_id: str, q: asyncio.Queue) -> None:
+        subs = self._subs.get(job_id)
+        if subs is not None:
+            subs.discard(q)
+            if not subs:
+                self._subs.pop(job_id, None)
+
+    def publish(self, job_id: str, snapshot: Optional[Dict[str, Any]]) -> None:
+        if snapshot is None:
+            return
+        for q in list(self._subs.get(job_id, ())):
+            q.put_nowait(snapshot)
+
+
+class OnboardingJobRunner:
+    def __init__(
+        self,
+        user_crud: OnboardingCRUD,
+        parse_pool: ParsePool,
+        catalog_lookup: CatalogLookup,
+        concurrency: int = ONBOARD_JOB_CONCURRENCY,
+        ac_year: int = 2026,
+        parse_cache: Optional[ParseCache] = None,
+    ):
+        self.user_crud = user_crud
+        self.parse_pool = parse_pool
+        self.parse_cache = parse_cache
+        self.catalog_lookup = catalog_lookup
+        self.ac_year = ac_year
+        self.events = JobEvents()
+        self._sem = asyncio.Semaphore(concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, resume: PdfSource, transcript: PdfSource, resume_name: Optional[str] = None) -> str:
+        """Create the job document and schedule the work; returns the job (= user) id."""
+        job_id = await self.user_crud.create_job()
+        task = asyncio.create_task(self._run(job_id, resume, transcript, resume_name))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job_id
+
+    async def _step(self, job_id: str, **kw: Any) -> None:
+        self.events.publish(job_id, await self.user_crud.update_job(job_id, **kw))
+
+    async def _run(self, job_id: str, resume: PdfSource, transcript: PdfSource, resume_name: Optional[str]) -> None:
+        stage = "parse"
+        try:
+            async with self._sem:
+                await self._step(job_id, status="running", stage="parse", stage_status="running")
+                while True:
+                    try:
+                        parsed = await parse_onboarding_cached(
+                            self.parse_pool, self.parse_cache, resume, transcript, resume_name
+                        )
+                        break
+                    except PoolBusy:
+                        await asyncio.sleep(POOL_BUSY_BACKOFF)
+                await self._step(job_id, stage="parse", stage_status="done", fields=parsed)
+
+                stage = "catalog"
+                await self._step(job_id, stage="catalog", stage_status="running")
+                course_pairs = _extract_course_pairs(parsed["transcript_data"])
+                rice_catalog = await self.catalog_lookup(course_pairs, ac_year=self.ac_year)
+                await self._step(
+                    job_id, stage="catalog", stage_status="done", status="done",
+                    fields={"rice_catalog": rice_catalog},
+                )
+        except asyncio.CancelledError:
+            await self._step(job_id, stage=stage, stage_status="failed", status="failed", error="cancelled")
+            raise
+        except Exception as e:
+            log.exception("onboarding job %s failed in %s", job_id, stage)
+            await self._step(job_id, stage=stage, stage_status="failed", status="failed", error=f"{stage}: {e}")
+        finally:
+            discard(resume, transcript)
+
+    async def shutdown(self) -> None:
+        for t in list(self._tasks):
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
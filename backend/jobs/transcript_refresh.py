@@ -0,0 +1,75 @@
+# jobs/transcript_refresh.py
+# Incremental transcript re-upload: the new parse is diffed against the stored
+# transcript_data / rice_catalog, only courses the stored catalog map doesn't already
+# resolve are looked up, and the existing user document is patched with $set/$unset on
+# the changed paths. An unchanged semester refresh costs one read and no catalog calls.
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+
+from database.user_crud import OnboardingCRUD
+from jobs.onboarding import CatalogLookup
+from parsers.transcript_parser import _extract_course_pairs
+
+TRANSCRIPT_PROJECTION = {"transcript_data": 1, "rice_catalog": 1, "resume_data": 1}
+
+
+def diff_fields(prefix: str, old: Any, new: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """($set, $unset) turning old into new one top-level field at a time."""
+    if not isinstance(old, dict) or not old:
+        return {prefix: new}, []
+    set_fields = {f"{prefix}.{k}": v for k, v in new.items() if old.get(k) != v}
+    unset_fields = [f"{prefix}.{k}" for k in old if k not in new]
+    return set_fields, unset_fields
+
+def _needs_lookup(rec: Optional[Dict[str, Any]]) -> bool:
+    return not rec or "error" in rec or bool(rec.get("stale"))
+
+def plan_catalog(old_catalog: Dict[str, Any], transcript_data: Dict[str, Any]) -> Tuple[List[Dict[str, str]], List[str]]:
+    """
+    Courses to look up (new, previously failed, or stored from a stale-cache fallback) and
+    catalog keys no longer on the transcript.
+    """
+    wanted = {f"{p['subject']}{p['number']}": p for p in _extract_course_pairs(transcript_data)}
+    lookup = [p for k, p in wanted.items() if _needs_lookup(old_catalog.get(k))]
+    removed = [k for k in old_catalog if k not in wanted]
+    return lookup, removed
+
+async def refresh_transcript(
+    user_crud: OnboardingCRUD,
+    doc_id: str,
+    transcript_data: Dict[str, Any],
+    catalog_lookup: CatalogLookup,
+    ac_year: int = 2026,
+    resume_data: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Patch an onboarded user with a re-uploaded transcript (and resume); None if there's
+    no such user, including one deleted between the read and the patch.
+    """
+    stored = await user_crud.get(doc_id, projection=TRANSCRIPT_PROJECTION)
+    if stored is None:
+        return None
+
+    set_fields, unset_fields = diff_fields("transcript_data", stored.get("transcript_data"), transcript_data)
+    if resume_data is not None:
+        s, u = diff_fields("resume_data", stored.get("resume_data"), resume_data)
+        set_fields.update(s); unset_fields += u
+
+    old_catalog = stored.get("rice_catalog") or {}
+    lookup, removed = plan_catalog(old_catalog, transcript_data)
+    fetched = await catalog_lookup(lookup, ac_year=ac_year) if lookup else {}
+    if old_catalog:
+        set_fields.update({f"rice_catalog.{k}": v for k, v in fetched.items() if old_catalog.get(k) != v})
+        unset_fields += [f"rice_catalog.{k}" for k in removed]
+    elif fetched:
+        set_fields["rice_catalog"] = fetched
+
+    if (set_fields or unset_fields) and not await user_crud.patch(doc_id, set_fields, unset_fields):
+        return None
+    return {
+        "id": doc_id,
+        "updated": sorted(set_fields),
+        "removed": sorted(unset_fields),
+        "looked_up": [f"{p['subject']} {p['number']}" for p in lookup],
+        "unchanged": not (set_fields or unset_fields),
+    }
@@ -0,0 +1,139 @@
+# mcp_servers/catalog_cache.py
+# Local SQLite cache of parsed catalog entries keyed by (subject, number, ac_year).
+# Catalog pages barely change within a year, so a transcript's courses normally
+# resolve from here instead of courses.rice.edu. Entries expire after
+# CATALOG_CACHE_TTL_DAYS; rice_lookup_courses(refresh=True) re-fetches explicitly.
+# Not-found courses (usually transcript parse noise) are cached too, as negative entries
+# with the much shorter CATALOG_NEGATIVE_TTL_HOURS, so they aren't re-fetched every time.
+# The offline crawler (mcp_servers.catalog_crawler) fills the same table for a whole year.
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+CATALOG_CACHE_PATH = os.getenv("CATALOG_CACHE_PATH", os.path.join(tempfile.gettempdir(), "owlconnect-catalog.sqlite3"))
+CATALOG_CACHE_TTL_DAYS = float(os.getenv("CATALOG_CACHE_TTL_DAYS", "30"))
+CATALOG_NEGATIVE_TTL_HOURS = float(os.getenv("CATALOG_NEGATIVE_TTL_HOURS", "72"))
+
+Key = Tuple[str, str, int]  # (SUBJECT, NUMBER, ac_year)
+
+
+class CatalogCache:
+    def __init__(self, path: str = CATALOG_CACHE_PATH, ttl_days: float = CATALOG_CACHE_TTL_DAYS,
+                 negative_ttl_hours: float = CATALOG_NEGATIVE_TTL_HOURS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.negative_ttl = negative_ttl_hours * 3600
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")  # the API server and batch jobs can share the file
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS courses ("
+            " subject TEXT NOT NULL, number TEXT NOT NULL, ac_year INTEGER NOT NULL,"
+            " data TEXT NOT NULL, fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (subject, number, ac_year))"
+        )
+        cols = {r[1] for r in self._db.execute("PRAGMA table_info(courses)")}
+        if "found" not in cols:  # caches written before negative entries existed
+            self._db.execute("ALTER TABLE courses ADD COLUMN found INTEGER NOT NULL DEFAULT 1")
+        self._db.commit()
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "expired": 0, "writes": 0}
+
+    def _cutoffs(self, any_age: bool) -> Tuple[float, float]:
+        """Oldest acceptable fetched_at for (found, not-found) entries."""
+        if any_age:
+            return float("-inf"), float("-inf")
+        now = time.time()
+        return now - self.ttl, now - self.negative_ttl
+
+    def get_many(self, keys: Iterable[Key], any_age: bool = False) -> Dict[Key, Dict[str, Any]]:
+        """
+        Fresh entries for `keys` in one query; missing/expired keys are simply absent.
+        any_age=True also returns expired entries (offline index, or a stale fallback
+        while the catalog site is down).
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        cutoff, negative_cutoff = self._cutoffs(any_age)
+        out: Dict[Key, Dict[str, Any]] = {}
+        negative = 0
+        with self._lock:
+            for i in range(0, len(keys), 300):  # stay under SQLite's bound-variable limit
+                chunk = keys[i:i + 300]
+                where = " OR ".join(["(subject=? AND number=? AND ac_year=?)"] * len(chunk))
+                params = [v for k in chunk for v in k]
+                for subj, num, year, data, fetched_at, found in self._db.execute(
+                    f"SELECT subject, number, ac_year, data, fetched_at, found FROM courses WHERE {where}", params
+                ):
+                    if fetched_at < (cutoff if found else negative_cutoff):
+                        self.stats["expired"] += 1
+                        continue
+                    out[(subj, num, year)] = json.loads(data)
+                    negative += not found
+        self.stats["hits"] += len(out) - negative
+        self.stats["negative_hits"] += negative
+        self.stats["misses"] += len(keys) - len(out)
+        return out
+
+    def get(self, key: Key, any_age: bool = False) -> Optional[Dict[str, Any]]:
+        return self.get_many([key], any_age).get(key)
+
+    def fresh_keys(self, ac_year: int, subject: Optional[str] = None) -> set:
+        """(subject, number, ac_year) of unexpired entries, used by the crawler to resume."""
+        cutoff, negative_cutoff = self._cutoffs(False)
+        sql = ("SELECT subject, number, ac_year FROM courses WHERE ac_year=?"
+               " AND fetched_at >= CASE WHEN found THEN ? ELSE ? END")
+        params: list = [ac_year, cutoff, negative_cutoff]
+        if subject is not None:
+            sql += " AND subject=?"; params.append(subject)
+        with self._lock:
+            return {tuple(r) for r in self._db.execute(sql, params)}
+
+    def put_many(self, items: Dict[Key, Dict[str, Any]]) -> None:
+        """Store parsed records; ones with found=False become negative entries."""
+        if not items:
+            return
+        now = time.time()
+        rows = [(s, n, y, json.dumps(v), now, int(bool(v.get("found", True)))) for (s, n, y), v in items.items()]
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO courses (subject, number, ac_year, data, fetched_at, found)"
+                " VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._db.commit()
+        self.stats["writes"] += len(rows)
+
+    def put(self, key: Key, value: Dict[str, Any]) -> None:
+        self.put_many({key: value})
+
+    def invalidate(self, subject: Optional[str] = None, number: Optional[str] = None,
+                   ac_year: Optional[int] = None) -> int:
+        """Delete matching entries (all of them when called without arguments)."""
+        conds, params = [], []
+        for col, val in (("subject", subject), ("number", number), ("ac_year", ac_year)):
+            if val is not None:
+                conds.append(f"{col}=?"); params.append(val)
+        sql = "DELETE FROM courses" + (" WHERE " + " AND ".join(conds) if conds else "")
+        with self._lock:
+            n = self._db.execute(sql, params).rowcount
+            self._db.commit()
+        return n
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            n = self._db.execute("DELETE FROM courses WHERE fetched_at < CASE WHEN found THEN ? ELSE ? END",
+                                 self._cutoffs(False)).rowcount
+            self._db.commit()
+        return n
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            rows, negative = self._db.execute("SELECT COUNT(*), COUNT(*) - SUM(found) FROM courses").fetchone()
+        return {"path": self.path, "entries": rows, "negative_entries": negative or 0,
+                "ttl_days": self.ttl / 86400, "negative_ttl_hours": self.negative_ttl / 3600, **self.stats}
@@ -0,0 +1,130 @@
+# mcp_servers/catalog_crawler.py
+# Offline crawl of a whole catalog year into the local course index (catalog_cache),
+# so onboarding can run with CATALOG_OFFLINE=1 and never touch courses.rice.edu.
+#
+#   python -m mcp_servers.catalog_crawler --year 2026 [--subjects COMP MATH]
+#          [--base URL] [--concurrency 4] [--delay 0.25] [--force]
+#
+# Enumeration follows catalog links: the year's listing page (CATALIST without a subject)
+# links to every subject, a subject's listing links to its course numbers. Anything
+# with p_subj / p_crse_numb in its href counts, so small layout changes don't matter.
+# Already-indexed, unexpired courses are skipped unless --force, so a crawl resumes.
+from __future__ import annotations
+import argparse
+import asyncio
+import html as htmllib
+import json
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from mcp_servers.catalog_cache import CatalogCache
+from mcp_servers.course_mcp import RICE_BASE, catalog_cache, close_client, fetch_url_async, lookup_one_async
+
+log = logging.getLogger(__name__)
+
+HREF = re.compile(r"""href\s*=\s*["']([^"']+)["']""", re.I)
+SUBJ = re.compile(r"[A-Z]{2,4}")
+NUMB = re.compile(r"\d{3}[A-Z]?")
+
+
+def catalog_links(page: str) -> List[Tuple[Optional[str], Optional[str]]]:
+    """(p_subj, p_crse_numb) of every catalog link on a page."""
+    out = []
+    for href in HREF.findall(page):
+        qs = parse_qs(urlsplit(htmllib.unescape(href)).query)
+        subj = (qs.get("p_subj") or [None])[0]
+        numb = (qs.get("p_crse_numb") or [None])[0]
+        if subj or numb:
+            out.append((subj.upper() if subj else None, numb.upper() if numb else None))
+    return out
+
+async def list_subjects(ac_year: int, base: str = RICE_BASE) -> List[str]:
+    page = await fetch_url_async(base, {"p_action": "CATALIST", "p_acyr_code": str(ac_year)})
+    return sorted({s for s, _ in catalog_links(page) if s and SUBJ.fullmatch(s)})
+
+async def list_courses(subject: str, ac_year: int, base: str = RICE_BASE) -> List[str]:
+    page = await fetch_url_async(base, {"p_action": "CATALIST", "p_acyr_code": str(ac_year), "p_subj": subject})
+    return sorted({n for s, n in catalog_links(page) if n and NUMB.fullmatch(n) and s in (None, subject)})
+
+
+class Crawler:
+    """Polite crawl: at most `concurrency` requests in flight and `delay` s between starts."""
+    def __init__(self, cache: CatalogCache, base: str = RICE_BASE, concurrency: int = 4, delay: float = 0.25):
+        self.cache = cache
+        self.base = base
+        self.delay = delay
+        self._sem = asyncio.Semaphore(concurrency)
+        self._pace = asyncio.Lock()
+        self._next_start = 0.0
+        self.stats = {"subjects": 0, "listed": 0, "skipped": 0, "stored": 0, "not_found": 0, "errors": 0}
+
+    async def _polite(self, coro_fn, *args):
+        async with self._sem:
+            async with self._pace:
+                wait = self._next_start - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start = time.monotonic() + self.delay
+            return await coro_fn(*args)
+
+    async def _course(self, subject: str, number: str, ac_year: int) -> None:
+        try:
+            rec = await self._polite(lookup_one_async, subject, number, ac_year, self.base)
+        except Exception as e:
+            self.stats["errors"] += 1
+            log.warning("crawl %s %s failed: %s", subject, number, e)
+            return
+        if rec.get("found"):
+            await asyncio.to_thread(self.cache.put, (subject, number, ac_year), rec)
+            self.stats["stored"] += 1
+        else:
+            self.stats["not_found"] += 1
+
+    async def crawl_subject(self, subject: str, ac_year: int, force: bool = False) -> None:
+        try:
+            numbers = await self._polite(list_courses, subject, ac_year, self.base)
+        except Exception as e:
+            self.stats["errors"] += 1
+            log.warning("listing %s failed: %s", subject, e)
+            return
+        self.stats["subjects"] += 1
+        self.stats["listed"] += len(numbers)
+        have: Set = set() if force else await asyncio.to_thread(self.cache.fresh_keys, ac_year, subject)
+        todo = [n for n in numbers if (subject, n, ac_year) not in have]
+        self.stats["skipped"] += len(numbers) - len(todo)
+        await asyncio.gather(*(self._course(subject, n, ac_year) for n in todo))
+
+    async def crawl(self, ac_year: int, subjects: Optional[List[str]] = None, force: bool = False) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        subjects = subjects or await self._polite(list_subjects, ac_year, self.base)
+        await asyncio.gather(*(self.crawl_subject(s.upper(), ac_year, force) for s in subjects))
+        return {**self.stats, "seconds": round(time.perf_counter() - t0, 1)}
+
+
+async def crawl_catalog(ac_year: int, subjects: Optional[List[str]] = None, base: str = RICE_BASE,
+                        concurrency: int = 4, delay: float = 0.25, force: bool = False,
+                        cache: Optional[CatalogCache] = None) -> Dict[str, Any]:
+    crawler = Crawler(cache or catalog_cache, base=base, concurrency=concurrency, delay=delay)
+    try:
+        return await crawler.crawl(ac_year, subjects, force)
+    finally:
+        await close_client()
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    ap = argparse.ArgumentParser(description="Crawl a catalog year into the local course index")
+    ap.add_argument("--year", type=int, default=2026)
+    ap.add_argument("--subjects", nargs="*", help="only these subjects (default: all listed)")
+    ap.add_argument("--base", default=RICE_BASE, help="catalog endpoint (e.g. a local mirror)")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--delay", type=float, default=0.25, help="seconds between request starts")
+    ap.add_argument("--force", action="store_true", help="re-fetch courses that are already indexed")
+    args = ap.parse_args()
+    stats = asyncio.run(crawl_catalog(args.year, args.subjects, args.base, args.concurrency, args.delay, args.force))
+    print(json.dumps({**stats, "index": catalog_cache.snapshot()}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,201 @@
 # rice_course_mcp_server.py
 # FastMCP tool that fetches Rice course details from courses.rice.edu
-# Run:  python rice_course_mcp_server.py
-# Deps: pip install fastmcp requests beautifulsoup4 lxml python-dotenv (dotenv optional)
+# Run:  python -m mcp_servers.course_mcp                      (stdio, one process per client)
+#       python -m mcp_servers.course_mcp --transport streamable-http --port 8765 [--warm COMP140 MATH101]
+#       (long-lived: the catalog cache, pooled client and single-flight table stay warm across clients)
+# Deps: pip install fastmcp httpx requests beautifulsoup4 lxml python-dotenv (dotenv optional)
 
 import os
 import re
+import json
+import asyncio
+import copy
+import argparse
+import logging
+import random
+import time
+import httpx
 import requests
+from urllib.parse import urlsplit
 from bs4 import BeautifulSoup
-from mcp.server.fastmcp import FastMCP
-from typing import List, Dict, Any, Optional
+from mcp.server.fastmcp import Context, FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from mcp_servers.catalog_cache import CatalogCache
 
+log = logging.getLogger(__name__)
 mcp = FastMCP("rice-course-tools")
+catalog_cache = CatalogCache()
 
-RICE_BASE = "https://courses.rice.edu/courses/!SWKSCAT.cat"
+RICE_BASE = os.getenv("RICE_CATALOG_BASE", "https://courses.rice.edu/courses/!SWKSCAT.cat")
+# serve lookups only from the local index filled by mcp_servers.catalog_crawler
+CATALOG_OFFLINE = os.getenv("CATALOG_OFFLINE", "0") == "1"
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio")
+MCP_HOST = os.getenv("MCP_HOST", "127.0.0.1")
+MCP_PORT = int(os.getenv("MCP_PORT", "8765"))
+HEADERS = {
+    "User-Agent": "rice-course-tools/1.0 (+https://github.com/your-org)",
+    "Accept": "text/html,application/xhtml+xml",
+}
 
-def fetch_course_page(subject: str, number: str, ac_year: int = 2026) -> str:
-    """GET the Rice catalog HTML for a specific course."""
-    params = {
+CATALOG_HOST_CONCURRENCY = int(os.getenv("CATALOG_HOST_CONCURRENCY", "8"))  # in-flight requests per host
+CATALOG_TIMEOUT = float(os.getenv("CATALOG_TIMEOUT", "8"))                  # seconds per request
+CATALOG_RETRIES = int(os.getenv("CATALOG_RETRIES", "2"))
+RETRY_STATUS = {429, 500, 502, 503, 504}
+CATALOG_BREAKER_FAILURES = int(os.getenv("CATALOG_BREAKER_FAILURES", "5"))    # consecutive failures that open it
+CATALOG_BREAKER_COOLDOWN = float(os.getenv("CATALOG_BREAKER_COOLDOWN", "30"))  # seconds before a probe request
+CATALOG_DEADLINE = float(os.getenv("CATALOG_DEADLINE", "20"))                  # whole rice_lookup_courses call
+
+def _params(subject: str, number: str, ac_year: int) -> Dict[str, str]:
+    return {
         "p_action": "CATALIST",
         "p_acyr_code": str(ac_year),
         "p_crse_numb": str(number),
         "p_subj": subject.upper(),
     }
-    headers = {
-        "User-Agent": "rice-course-tools/1.0 (+https://github.com/your-org)",
-        "Accept": "text/html,application/xhtml+xml",
-    }
-    r = requests.get(RICE_BASE, params=params, headers=headers, timeout=20)
+
+def fetch_course_page(subject: str, number: str, ac_year: int = 2026) -> str:
+    """GET the Rice catalog HTML for a specific course."""
+    r = requests.get(RICE_BASE, params=_params(subject, number, ac_year), headers=HEADERS, timeout=20)
     r.raise_for_status()
     return r.text
 
-def parse_course_html(html: str, subject: str, number: str) -> Dict[str, Any]:
-    """Parse the Rice HTML into structured fields (robust to minor layout changes)."""
+# One pooled keep-alive client per event loop (an AsyncClient can't outlive the loop it
+# was first used on). Code that runs lookups under its own asyncio.run must await
+# close_client() before that loop ends; a client left behind on a finished loop can't be
+# closed any more and its sockets leak.
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_host_sems: Dict[str, asyncio.Semaphore] = {}
+
+def _drop_stale_client() -> None:
+    """Close the previous loop's client on that loop, or say it leaked if the loop is gone."""
+    if _client is None or _client.is_closed or _client_loop is None:
+        return
+    if _client_loop.is_closed():
+        log.warning("catalog HTTP client outlived its event loop; await close_client() before the loop ends")
+    else:
+        asyncio.run_coroutine_threadsafe(_client.aclose(), _client_loop)
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _client_loop, _host_sems
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop or _client.is_closed:
+        if _client_loop is not loop:
+            _drop_stale_client()
+        _client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=httpx.Timeout(CATALOG_TIMEOUT, connect=min(5.0, CATALOG_TIMEOUT)),
+            limits=httpx.Limits(max_connections=CATALOG_HOST_CONCURRENCY * 2,
+                                max_keepalive_connections=CATALOG_HOST_CONCURRENCY),
+            follow_redirects=True,
+        )
+        _client_loop = loop
+        _host_sems = {}
+    return _client
+
+class CircuitOpen(Exception):
+    pass
+
+class CircuitBreaker:
+    """
+    closed -> open after `failures` consecutive failed requests; while open every request
+    fails fast with CircuitOpen. After `cooldown` s one probe is let through (half-open):
+    success closes the breaker, failure re-opens it for another cooldown.
+    """
+    def __init__(self, failures: int = CATALOG_BREAKER_FAILURES, cooldown: float = CATALOG_BREAKER_COOLDOWN):
+        self.threshold = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.stats = {"opened": 0, "rejected": 0}
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.stats["rejected"] += 1
+        return False
+
+    def release(self) -> None:
+        self._probing = False
+
+    def success(self) -> None:
+        self.state, self.failures, self._probing = "closed", 0, False
+
+    def failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.failures >= self.threshold:
+            if self.state != "open":
+                self.stats["opened"] += 1
+            self.state, self.opened_at = "open", time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, **self.stats}
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+def breaker_for(url: str) -> CircuitBreaker:
+    return _breakers.setdefault(urlsplit(url).netloc, CircuitBreaker())
+
+def breakers_snapshot() -> Dict[str, Any]:
+    return {host: b.snapshot() for host, b in _breakers.items()}
+
+async def close_client() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+async def fetch_url_async(url: str, params: Optional[Dict[str, str]] = None) -> str:
+    """
+    GET with per-host concurrency, per-request timeout and jittered retries on transient
+    errors, behind the host's circuit breaker (raises CircuitOpen while it is open).
+    """
+    client = _get_client()
+    host = urlsplit(url).netloc
+    breaker = breaker_for(url)
+    if not breaker.allow():
+        raise CircuitOpen(f"{host} unavailable (circuit open)")
+    probe = breaker.state == "half_open"  # this call holds the breaker's one probe slot
+    sem = _host_sems.setdefault(host, asyncio.Semaphore(CATALOG_HOST_CONCURRENCY))
+    try:
+        for attempt in range(CATALOG_RETRIES + 1):
+            try:
+                async with sem:
+                    r = await client.get(url, params=params)
+                if r.status_code in RETRY_STATUS and attempt < CATALOG_RETRIES:
+                    raise httpx.HTTPStatusError(f"HTTP {r.status_code}", request=r.request, response=r)
+                r.raise_for_status()
+                breaker.success()
+                return r.text
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = isinstance(e, httpx.TransportError) or e.response.status_code in RETRY_STATUS
+                if not retryable:
+                    breaker.success()  # a 4xx answer still means the site is up
+                    raise
+                if attempt == CATALOG_RETRIES:
+                    breaker.failure()
+                    raise
+            await asyncio.sleep(0.25 * 2 ** attempt + random.random() * 0.1)
+        raise RuntimeError("unreachable")
+    finally:
+        if probe:
+            breaker.release()  # cancelled (even mid-backoff) / unexpected error: free the probe slot
+
+async def fetch_course_page_async(subject: str, number: str, ac_year: int = 2026, base: str = RICE_BASE) -> str:
+    return await fetch_url_async(base, _params(subject, number, ac_year))
+
+def _parse_course_regex(html: str, subject: str, number: str) -> Dict[str, Any]:
+    """Regex over the whole page text: slow, but indifferent to the markup."""
     soup = BeautifulSoup(html, "lxml")
     text = " ".join(s.strip() for s in soup.stripped_strings)
 
@@ -63,41 +227,316 @@ def parse_course_html(html: str, subject: str, number: str) -> Dict[str, Any]:
 
     return out
 
-def lookup_one(subject: str, number: str, ac_year: int = 2026) -> Dict[str, Any]:
-    html = fetch_course_page(subject, number, ac_year)
-    data = parse_course_html(html, subject, number)
+# Field labels as they appear in a catalog entry; each starts its own text node.
+COURSE_LABEL = re.compile(r"(Long Title|Department|Grade Mode|Credit Hours?|Description|Course URL):", re.I)
+SKIP_TAGS = {"script", "style", "template"}
+
+def _course_strings(el, out: List[str]) -> List[str]:
+    """Stripped text nodes in document order (what soup.stripped_strings yields)."""
+    tag = el.tag
+    if isinstance(tag, str) and tag.lower() not in SKIP_TAGS:
+        if el.text and el.text.strip():
+            out.append(el.text.strip())
+        for child in el:
+            _course_strings(child, out)
+            if child.tail and child.tail.strip():
+                out.append(child.tail.strip())
+    return out
+
+def _parse_course_dom(html: str, subject: str, number: str) -> Optional[Dict[str, Any]]:
+    """
+    Walk the lxml tree once, find the text nodes that start with a field label and run
+    the field's pattern only over the few nodes between that label and the next one.
+    Returns None when the labels aren't where we expect (caller falls back to regex).
+    """
+    import lxml.html
+    try:
+        root = lxml.html.document_fromstring(html)
+    except (ValueError, lxml.etree.ParserError):
+        return None
+    strings = _course_strings(root, [])
+    at: Dict[str, int] = {}
+    for i, s in enumerate(strings):
+        m = COURSE_LABEL.match(s)
+        if m:
+            label = m.group(1).lower()
+            at.setdefault("credit hours" if label == "credit hour" else label, i)
+    if "long title" not in at:
+        return None
+
+    def window(label: str, end: Optional[str] = None) -> Optional[str]:
+        if label not in at:
+            return None
+        stop = at.get(end, -1) if end else -1
+        stop = stop + 1 if stop > at[label] else len(strings)
+        return " ".join(strings[at[label]:stop])
+
+    out: Dict[str, Any] = {}
+    head = " ".join(strings[:at["long title"] + 1])
+    m = re.search(rf"\b{re.escape(subject)}\s*{re.escape(number)}\s*-\s*(.+?)\s+Long Title:", head, re.I)
+    out["title"] = m.group(1).strip() if m else None
+    w = window("long title", "department")
+    m = w and re.search(r"Long Title:\s*(.+?)\s+Department:", w, re.I)
+    out["long_title"] = m.group(1).strip() if m else None
+    w = window("department", "grade mode")
+    m = w and re.search(r"Department:\s*(.+?)\s+Grade Mode:", w, re.I)
+    out["department"] = m.group(1).strip() if m else None
+    w = " ".join(strings[at["credit hours"]:at["credit hours"] + 2]) if "credit hours" in at else None
+    m = w and re.match(r"Credit Hours?:\s*([0-9.]+)", w, re.I)
+    out["credit_hours"] = float(m.group(1)) if m else None
+    w = window("description")
+    m = w and re.match(r"Description:\s*(.+?)(?:\s+Course URL:|\s+General Announcements|\s+©\s*20\d{2}\s+Rice University|$)", w, re.I)
+    out["description"] = m.group(1).strip() if m else None
+
+    # a label we couldn't resolve but that is on the page means the layout moved
+    if any(v is None for v in out.values()):
+        text = " ".join(strings)
+        probes = {"title": f"{subject} {number}", "long_title": "long title:", "department": "department:",
+                  "credit_hours": "credit hour", "description": "description:"}
+        low = text.lower()
+        if any(out[k] is None and probes[k].lower() in low for k in out):
+            return None
+    return out
+
+def parse_course_html(html: str, subject: str, number: str) -> Dict[str, Any]:
+    """Parse the Rice HTML into structured fields (robust to minor layout changes)."""
+    try:
+        out = _parse_course_dom(html, subject, number)
+    except ImportError:
+        out = None
+    return out if out is not None else _parse_course_regex(html, subject, number)
+
+def _record(subject: str, number: str, ac_year: int, data: Dict[str, Any], base: str = RICE_BASE) -> Dict[str, Any]:
     return {
         "code": f"{subject.upper()} {str(number).upper()}",
         "year": ac_year,
-        "url": f"{RICE_BASE}?p_action=CATALIST&p_acyr_code={ac_year}&p_crse_numb={number}&p_subj={subject.upper()}",
+        "url": f"{base}?p_action=CATALIST&p_acyr_code={ac_year}&p_crse_numb={number}&p_subj={subject.upper()}",
         **data,
         "found": any(data.values()),
     }
 
+def lookup_one(subject: str, number: str, ac_year: int = 2026) -> Dict[str, Any]:
+    html = fetch_course_page(subject, number, ac_year)
+    return _record(subject, number, ac_year, parse_course_html(html, subject, number))
+
+async def lookup_one_async(subject: str, number: str, ac_year: int = 2026, base: str = RICE_BASE) -> Dict[str, Any]:
+    html = await fetch_course_page_async(subject, number, ac_year, base)
+    # BeautifulSoup on a full page is tens of ms of CPU: keep it off the event loop
+    data = await asyncio.to_thread(parse_course_html, html, subject, number)
+    return _record(subject, number, ac_year, data, base)
+
+class SingleFlight:
+    """
+    Concurrent calls for the same key share one in-flight task (fetch + parse), so
+    overlapping onboarding requests for COMP 140 cost one catalog request, not N.
+    Callers are shielded: one caller being cancelled doesn't cancel the others' result,
+    and each gets its own shallow copy of it.
+    """
+    def __init__(self):
+        self._inflight: Dict[Any, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"calls": 0, "executed": 0, "coalesced": 0, "max_waiters": 0}
+        self._waiters: Dict[asyncio.Task, int] = {}  # callers awaiting each task right now
+
+    async def do(self, key: Any, fn, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # tasks can't be shared across event loops
+            self._inflight, self._waiters, self._loop = {}, {}, loop
+        self.stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = loop.create_task(fn(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._done(k, t))
+            self.stats["executed"] += 1
+        else:
+            self.stats["coalesced"] += 1
+        waiting = self._waiters[task] = self._waiters.get(task, 0) + 1
+        self.stats["max_waiters"] = max(self.stats["max_waiters"], waiting)
+        try:
+            return copy.copy(await asyncio.shield(task))
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _done(self, key: Any, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here so an unawaited failure isn't logged as lost
+
+    def snapshot(self) -> Dict[str, Any]:
+        calls = self.stats["calls"]
+        return {**self.stats, "inflight": len(self._inflight),
+                "coalesced_ratio": round(self.stats["coalesced"] / calls, 3) if calls else 0.0}
+
+lookup_flights = SingleFlight()
+
+async def _lookup_and_store(subject: str, number: str, ac_year: int, base: str) -> Dict[str, Any]:
+    """
+    One flight: fetch + parse, then cache the record before the flight completes, so a
+    request arriving after it finds the cache instead of starting another fetch. Found
+    and not-found (briefly) are cached; errors never are.
+    """
+    rec = await lookup_one_async(subject, number, ac_year, base)
+    if "error" not in rec:
+        await asyncio.to_thread(catalog_cache.put_many, {(subject, number, ac_year): rec})
+    return rec
+
+async def _lookup_or_error(key) -> Dict[str, Any]:
+    try:
+        # the base is part of the flight key: a different catalog site is a different fetch
+        return await lookup_flights.do((*key, RICE_BASE), _lookup_and_store, *key, RICE_BASE)
+    except Exception as e:
+        return {"error": str(e) or type(e).__name__}
+
+def _wanted(courses: List[Dict[str, str]], year: int) -> Dict[str, Any]:
+    """"SUBJNUM" -> (SUBJ, NUM, year) in request order; None for an invalid item."""
+    wanted: Dict[str, Any] = {}
+    for c in courses:
+        subj = (c.get("subject") or "").strip().upper()
+        num  = (c.get("number")  or "").strip().upper()
+        wanted[f"{subj}{num}"] = (subj, num, year) if subj and num else None
+    return wanted
+
+def _failed(key, error: str) -> Dict[str, Any]:
+    return {"code": f"{key[0]} {key[1]}", "year": key[2], "found": False, "error": error}
+
+async def _stale_or(key, rec: Dict[str, Any]) -> Dict[str, Any]:
+    """Site down / slow: serve whatever the cache has for a failed course, however old."""
+    if CATALOG_OFFLINE:
+        return rec
+    stale = await asyncio.to_thread(catalog_cache.get, key, True)
+    return {**stale, "stale": True} if stale else rec
+
+async def iter_lookup_courses(courses: List[Dict[str, str]], ac_year: Optional[int] = 2026,
+                              refresh: Optional[bool] = False) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield ("SUBJNUM", record) as each course resolves: invalid items and cache hits first,
+    then fetched courses in completion order. Whatever hasn't resolved by CATALOG_DEADLINE
+    is yielded as a timeout (or its stale cache entry).
+    """
+    year = ac_year or 2026
+    wanted = _wanted(courses, year)
+    names: Dict[Any, List[str]] = {}
+    for name, key in wanted.items():
+        if key is None:
+            yield name, {"error": "Invalid subject/number"}
+        else:
+            names.setdefault(key, []).append(name)
+
+    keys = list(names)
+    if CATALOG_OFFLINE:
+        cached = await asyncio.to_thread(catalog_cache.get_many, keys, True)
+    else:
+        cached = {} if refresh else await asyncio.to_thread(catalog_cache.get_many, keys)
+    for key, rec in cached.items():
+        for name in names[key]:
+            yield name, rec
+    misses = [k for k in keys if k not in cached]
+    if CATALOG_OFFLINE:
+        for key in misses:
+            for name in names[key]:
+                yield name, _failed(key, "not in local catalog index")
+        return
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + CATALOG_DEADLINE
+    tasks = {asyncio.ensure_future(_lookup_or_error(k)): k for k in misses}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=max(0.0, deadline - loop.time()),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for t in done:
+                key, rec = tasks[t], t.result()
+                if "error" in rec:
+                    rec = await _stale_or(key, rec)
+                for name in names[key]:
+                    yield name, rec
+        for t in pending:
+            t.cancel()  # the shared flight keeps running (and caches its result) for other callers
+            key = tasks[t]
+            rec = await _stale_or(key, _failed(key, f"timed out after {CATALOG_DEADLINE:g}s"))
+            for name in names[key]:
+                yield name, rec
+        pending = set()
+    finally:
+        for t in pending:  # the consumer stopped early
+            t.cancel()
+
 @mcp.tool()
-async def rice_lookup_courses(courses: List[Dict[str, str]], ac_year: Optional[int] = 2026) -> Dict[str, Any]:
+async def rice_lookup_courses(courses: List[Dict[str, str]], ac_year: Optional[int] = 2026,
+                              refresh: Optional[bool] = False) -> Dict[str, Any]:
     """
     Fetch Rice course details directly from courses.rice.edu.
 
     Args:
       courses: list of {"subject": "COMP", "number": "140"} items
       ac_year: academic year code (e.g., 2026 for 2025–2026 catalog)
+      refresh: ignore the local catalog cache and re-fetch every course (stale entries are
+               still served for courses whose fetch fails)
 
     Returns:
       dict keyed by "SUBJNUM" -> {code, year, url, title, long_title, department, credit_hours, description, found}
     """
-    out: Dict[str, Any] = {}
-    for c in courses:
-        subj = (c.get("subject") or "").strip().upper()
-        num  = (c.get("number")  or "").strip().upper()
-        if not subj or not num:
-            out[f"{subj}{num}"] = {"error": "Invalid subject/number"}
-            continue
+    got = {name: rec async for name, rec in iter_lookup_courses(courses, ac_year, refresh)}
+    return {name: got[name] for name in _wanted(courses, ac_year or 2026)}
+
+@mcp.tool()
+async def rice_lookup_courses_stream(courses: List[Dict[str, str]], ctx: Context, ac_year: Optional[int] = 2026,
+                                     refresh: Optional[bool] = False) -> Dict[str, Any]:
+    """
+    Same as rice_lookup_courses, but each course is sent as soon as it resolves: one
+    progress notification per course whose message is {"SUBJNUM": record} as JSON
+    (pass a progressToken to receive them). The full dict is still returned at the end.
+    """
+    total = len(_wanted(courses, ac_year or 2026))
+    got: Dict[str, Any] = {}
+    async for name, rec in iter_lookup_courses(courses, ac_year, refresh):
+        got[name] = rec
+        await ctx.report_progress(len(got), total, json.dumps({name: rec}))
+    return {name: got[name] for name in _wanted(courses, ac_year or 2026)}
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def http_metrics(request: Request) -> JSONResponse:
+    return JSONResponse({"cache": catalog_cache.snapshot(), "single_flight": lookup_flights.snapshot(),
+                         "breakers": breakers_snapshot()})
+
+def warm(codes: List[str], ac_year: int) -> Dict[str, Any]:
+    """Pre-fill the cache for the usual courses ("COMP140", "MATH 101") before serving."""
+    courses = []
+    for code in codes:
+        m = re.fullmatch(r"\s*([A-Za-z]{2,4})\s*(\d{3}[A-Za-z]?)\s*", code)
+        if m:
+            courses.append({"subject": m.group(1), "number": m.group(2)})
+    async def run():
         try:
-            out[f"{subj}{num}"] = lookup_one(subj, num, ac_year or 2026)
-        except Exception as e:
-            out[f"{subj}{num}"] = {"error": str(e)}
-    return out
+            return await rice_lookup_courses(courses, ac_year)
+        finally:
+            await close_client()  # the server's own loop gets a fresh client
+    out = asyncio.run(run()) if courses else {}
+    return {"warmed": sum(1 for v in out.values() if v.get("found")), "requested": len(courses)}
+
+def main():
+    ap = argparse.ArgumentParser(description="Rice course MCP server")
+    ap.add_argument("--transport", choices=["stdio", "sse", "streamable-http"], default=MCP_TRANSPORT)
+    ap.add_argument("--host", default=MCP_HOST)
+    ap.add_argument("--port", type=int, default=MCP_PORT)
+    ap.add_argument("--warm", nargs="*", default=[], help='course codes to pre-fetch, e.g. COMP140 "MATH 101"')
+    ap.add_argument("--warm-year", type=int, default=2026)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    purged = catalog_cache.purge_expired()
+    if args.warm:
+        logging.info("warm: %s", warm(args.warm, args.warm_year))
+    logging.info("catalog cache ready (%d expired entries purged): %s", purged, catalog_cache.snapshot())
+    mcp.settings.host, mcp.settings.port = args.host, args.port
+    mcp.run(transport=args.transport)
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
\ No newline at end of file
+    main()
@@ -0,0 +1,328 @@
+# parsers/batch_parse.py
+# Batch cohort parser: parse a directory or manifest of resume/transcript PDFs in a
+# process pool and stream one JSONL record per file (timing, result or error).
+#
+#   python -m parsers.batch_parse /path/to/pdfs --out cohort.jsonl [--workers 8]
+#   python -m parsers.batch_parse manifest.csv --out cohort.jsonl --insert [--with-catalog]
+#
+# Manifests: .csv with columns path[,kind][,student], .jsonl with the same keys, or one
+# path per line. Missing kind/student are guessed from the file name ("<student>_resume.pdf").
+# Re-running with the same --out resumes after a crash: files with an ok record are
+# skipped (errors are retried) and students already inserted are not inserted again.
+from __future__ import annotations
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+KINDS = ("resume", "transcript")
+INSERT_CHUNK = 500
+CATALOG_STUDENTS = 8  # students whose catalog lookups run at once with --with-catalog
+
+
+# ---- Inputs ----
+
+def guess_kind(path: str) -> str:
+    name = os.path.basename(path).lower()
+    return "transcript" if ("transcript" in name) else "resume"
+
+def _student_from_name(path: str) -> str:
+    # "<student>_resume.pdf" / "<student>-transcript.pdf" -> "<student>"
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for kind in KINDS:
+        for sep in ("_", "-", " "):
+            suffix = f"{sep}{kind}"
+            if stem.lower().endswith(suffix):
+                return stem[: -len(suffix)]
+    return stem
+
+def iter_inputs(src: str) -> Iterator[Dict[str, str]]:
+    if os.path.isdir(src):
+        for dirpath, _, files in os.walk(src):
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    p = os.path.join(dirpath, name)
+                    yield {"path": p, "kind": guess_kind(p), "student": _student_from_name(p)}
+        return
+
+    base = os.path.dirname(os.path.abspath(src))
+    def item(row: Dict[str, Any]) -> Dict[str, str]:
+        p = row["path"] if os.path.isabs(row["path"]) else os.path.join(base, row["path"])
+        return {
+            "path": p,
+            "kind": (row.get("kind") or guess_kind(p)).strip().lower(),
+            "student": (row.get("student") or _student_from_name(p)).strip(),
+        }
+
+    with open(src, newline="", encoding="utf-8-sig") as f:
+        if src.lower().endswith(".csv"):
+            for row in csv.DictReader(f):
+                if row.get("path"):
+                    yield item(row)
+        elif src.lower().endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    yield item(json.loads(line))
+        else:
+            for line in f:
+                if line.strip():
+                    yield item({"path": line.strip()})
+
+
+# ---- Worker ----
+
+def parse_file(path: str, kind: str) -> Dict[str, Any]:
+    """Runs in a worker process; never raises, errors become records."""
+    t0 = time.perf_counter()
+    rec: Dict[str, Any] = {"type": "file", "path": path, "kind": kind}
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        rec["sha256"] = hashlib.sha256(data).hexdigest()
+        rec["bytes"] = len(data)
+        if kind == "resume":
+            from parsers.resume_parser import parse_resume
+            rec["result"] = parse_resume(data, filename=os.path.basename(path))
+        elif kind == "transcript":
+            from parsers.transcript_parser import parse_major_and_courses
+            rec["result"] = parse_major_and_courses(data)
+        else:
+            raise ValueError(f"unknown kind {kind!r}")
+        rec["ok"] = True
+    except Exception as e:
+        rec["ok"] = False
+        rec["error"] = f"{type(e).__name__}: {e}"
+        rec["traceback"] = traceback.format_exc(limit=3)
+    rec["seconds"] = round(time.perf_counter() - t0, 4)
+    return rec
+
+
+# ---- Output / resume ----
+
+def load_progress(out_path: str) -> Dict[str, Any]:
+    """Read an existing output file: which files parsed ok, which students were inserted."""
+    done: Set[str] = set()
+    inserted: Set[str] = set()
+    results: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(out_path):
+        return {"done": done, "inserted": inserted, "results": results}
+    with open(out_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash
+            if rec.get("type") == "file" and rec.get("ok"):
+                done.add(rec["path"])
+                results[rec["path"]] = rec
+            elif rec.get("type") == "insert":
+                inserted.update(rec.get("students", []))
+    return {"done": done, "inserted": inserted, "results": results}
+
+class JsonlWriter:
+    def __init__(self, path: str):
+        needs_newline = os.path.exists(path) and os.path.getsize(path) > 0
+        if needs_newline:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        self.f = open(path, "a", encoding="utf-8")
+        if needs_newline:
+            self.f.write("\n")
+
+    def write(self, rec: Dict[str, Any]) -> None:
+        self.f.write(json.dumps(rec, default=str) + "\n")
+        self.f.flush()  # stream: every record is durable as soon as it's written
+
+    def close(self) -> None:
+        self.f.close()
+
+
+# ---- Mongo insert ----
+
+class StudentInserter:
+    """
+    Buffers one users document per student and bulk-inserts them in chunks. With
+    --with-catalog each student's lookup starts when the student is queued and is only
+    waited for at flush, so parsing keeps draining while the catalog is fetched.
+    """
+    def __init__(self, writer: JsonlWriter, already: Set[str], with_catalog: bool, ac_year: int):
+        import certifi
+        from dotenv import load_dotenv
+        from pymongo import MongoClient
+        load_dotenv()
+        uri = os.getenv("MONGODB_URI")
+        if not uri:
+            raise SystemExit("Please add MONGODB_URI to your environment variables")
+        self.collection = MongoClient(uri, tls=True, tlsCAFile=certifi.where()).owlconnect.users
+        self.writer = writer
+        self.already = already
+        self.catalog = CatalogLookups(ac_year) if with_catalog else None
+        self.parts: Dict[str, Dict[str, Any]] = {}
+        self.buffer: List[Dict[str, Any]] = []
+        self.buffer_students: List[str] = []
+
+    def add(self, student: str, kind: str, result: Dict[str, Any]) -> None:
+        if student in self.already:
+            return
+        parts = self.parts.setdefault(student, {})
+        parts[kind] = result
+        if all(k in parts for k in KINDS):
+            self._queue(student, self.parts.pop(student))
+
+    def _queue(self, student: str, parts: Dict[str, Any]) -> None:
+        now = datetime.utcnow()
+        self.buffer.append({
+            "resume_data": parts["resume"],
+            "transcript_data": parts["transcript"],
+            "rice_catalog": self.catalog.submit(parts["transcript"]) if self.catalog else {},
+            "batch_student": student,
+            "onboarding_complete": True,
+            "created_at": now,
+            "updated_at": now,
+        })
+        self.buffer_students.append(student)
+        if len(self.buffer) >= INSERT_CHUNK:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        from pymongo.errors import BulkWriteError
+        for doc, student in zip(self.buffer, self.buffer_students):
+            if isinstance(doc["rice_catalog"], Future):
+                try:
+                    doc["rice_catalog"] = doc["rice_catalog"].result()
+                except Exception as e:
+                    doc["rice_catalog"] = {}
+                    self.writer.write({"type": "catalog_error", "student": student, "error": repr(e)})
+        failed: Set[int] = set()
+        try:
+            self.collection.insert_many(self.buffer, ordered=False)
+        except BulkWriteError as e:
+            for err in e.details.get("writeErrors", []):
+                failed.add(err["index"])
+                self.writer.write({"type": "insert_error", "student": self.buffer_students[err["index"]],
+                                   "error": err.get("errmsg")})
+        ok = [s for i, s in enumerate(self.buffer_students) if i not in failed]
+        self.writer.write({"type": "insert", "students": ok, "count": len(ok)})
+        self.already.update(ok)
+        self.buffer, self.buffer_students = [], []
+
+    def report_incomplete(self) -> int:
+        """Record students still missing a kind (never inserted); returns how many."""
+        for student, parts in self.parts.items():
+            self.writer.write({"type": "incomplete", "student": student,
+                               "missing": [k for k in KINDS if k not in parts]})
+        return len(self.parts)
+
+    def close(self) -> None:
+        if self.catalog is not None:
+            self.catalog.close()
+
+
+class CatalogLookups:
+    """rice_catalog lookups on one long-lived event loop (and one HTTP client) in a background thread."""
+    def __init__(self, ac_year: int):
+        self.ac_year = ac_year
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="catalog-lookups", daemon=True)
+        self.thread.start()
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    def submit(self, transcript: Dict[str, Any]) -> Future:
+        return asyncio.run_coroutine_threadsafe(self._lookup(transcript), self.loop)
+
+    async def _lookup(self, transcript: Dict[str, Any]) -> Dict[str, Any]:
+        from mcp_servers.course_mcp import rice_lookup_courses
+        from parsers.transcript_parser import _extract_course_pairs
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(CATALOG_STUDENTS)
+        async with self._sem:  # the lookup's deadline starts once it gets a slot
+            return await rice_lookup_courses(_extract_course_pairs(transcript), ac_year=self.ac_year)
+
+    def close(self) -> None:
+        from mcp_servers.course_mcp import close_client
+        asyncio.run_coroutine_threadsafe(close_client(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+# ---- Driver ----
+
+def run(args: argparse.Namespace) -> int:
+    progress = load_progress(args.out)
+    items = list(iter_inputs(args.input))
+    todo = [it for it in items if it["path"] not in progress["done"]]
+    student_of = {it["path"]: it["student"] for it in items}
+
+    writer = JsonlWriter(args.out)
+    inserter = StudentInserter(writer, progress["inserted"], args.with_catalog, args.ac_year) if args.insert else None
+    if inserter is not None:
+        # results parsed by an earlier (crashed) run still count toward their student's document
+        for path, rec in progress["results"].items():
+            if path in student_of:
+                inserter.add(student_of[path], rec["kind"], rec["result"])
+
+    print(f"{len(items)} files, {len(items) - len(todo)} already done, {len(todo)} to parse", file=sys.stderr)
+    t0 = time.perf_counter()
+    ok = failed = 0
+    pending: Dict[Future, Dict[str, str]] = {}
+    queue = iter(todo)
+    with ProcessPoolExecutor(max_workers=args.workers) as ex:
+        def fill():
+            while len(pending) < args.workers * 2:
+                it = next(queue, None)
+                if it is None:
+                    return
+                pending[ex.submit(parse_file, it["path"], it["kind"])] = it
+        fill()
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                it = pending.pop(fut)
+                rec = fut.result()
+                rec["student"] = it["student"]
+                writer.write(rec)
+                if rec["ok"]:
+                    ok += 1
+                    if inserter is not None:
+                        inserter.add(it["student"], it["kind"], rec["result"])
+                else:
+                    failed += 1
+            fill()
+    incomplete = 0
+    if inserter is not None:
+        inserter.flush()
+        incomplete = inserter.report_incomplete()
+        inserter.close()
+    writer.close()
+    elapsed = time.perf_counter() - t0
+    rate = (ok + failed) / elapsed if elapsed else 0.0
+    print(f"parsed {ok} ok, {failed} failed in {elapsed:.1f}s ({rate:.1f} files/s)", file=sys.stderr)
+    if incomplete:
+        print(f"{incomplete} students not inserted (missing a resume or transcript)", file=sys.stderr)
+    return 1 if failed else 0
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch-parse resume/transcript PDFs to JSONL")
+    ap.add_argument("input", help="directory of PDFs or a manifest (.csv/.jsonl/.txt)")
+    ap.add_argument("--out", required=True, help="JSONL output (appended to; enables resume)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--insert", action="store_true", help="bulk-insert one users document per student")
+    ap.add_argument("--with-catalog", action="store_true", help="also look up rice_catalog before insert")
+    ap.add_argument("--ac-year", type=int, default=2026)
+    sys.exit(run(ap.parse_args()))
+
+if __name__ == "__main__":
+    main()
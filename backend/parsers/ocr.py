@@ -0,0 +1,182 @@
+# parsers/ocr.py
+# Page-parallel Tesseract OCR shared by the resume and transcript parsers.
+# Pages are rendered on the calling thread (PyMuPDF is not thread-safe) and OCR'd on a
+# thread pool: pytesseract spends its time waiting on the tesseract subprocess, so
+# threads give real parallelism without another layer of processes.
+#
+# Memory: pages are rendered straight to 8-bit grayscale (1 byte/pixel, no RGB pixmap;
+# the pixmap's memory is shared with PIL / the engine pipe via samples_mv, not copied),
+# pages taller than OCR_TILE_PX are OCR'd in horizontal bands cut at blank rows, and the
+# rendered pixels alive at once in one ocr_pages() call are capped at OCR_JOB_MAX_MB.
+# DPI is lowered for a page whose single band would not fit, but not below OCR_MIN_DPI:
+# a band still over the cap there (a huge page) is OCR'd on its own, with nothing else
+# in flight, so the peak is then that one band rather than the cap.
+#
+# Engine: with tesserocr installed, rendered buffers go to persistent engine processes
+# (parsers.ocr_pool); otherwise, or whenever the pool can't OCR a band (worker crash,
+# start failure, engine error, pool disabled), pytesseract per page.
+from __future__ import annotations
+import logging
+import os
+import shutil
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from parsers.ocr_pool import get_pool, use_pool
+from parsers.pdf_source import PdfSource, open_pdf
+
+log = logging.getLogger(__name__)
+
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "0"))  # 0 = no limit
+OCR_CONFIG = "--psm 3"
+OCR_TILE_PX = int(os.getenv("OCR_TILE_PX", "3300"))  # ~ a letter page at 300 DPI
+OCR_JOB_MAX_MB = float(os.getenv("OCR_JOB_MAX_MB", "48"))
+OCR_MIN_DPI = 72
+PREVIEW_DPI = 24  # low-res pass used only to find blank rows for band cuts
+
+
+class Raster(NamedTuple):
+    samples: memoryview  # 8-bit gray, `stride` bytes per row; a view into `pix`
+    width: int
+    height: int
+    stride: int
+    pix: object  # the fitz.Pixmap owning `samples` (the view doesn't keep it alive)
+
+
+def _ocr_image(img, config: str) -> str:
+    import pytesseract
+    return pytesseract.image_to_string(img, config=config)
+
+def _rasterize(page, dpi: int, clip=None) -> Raster:
+    import fitz
+    zoom = dpi / 72.0
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False, clip=clip)
+    return Raster(pix.samples_mv, pix.width, pix.height, pix.stride, pix)
+
+def _to_image(r: Raster):
+    from PIL import Image
+    # wrap the pixmap's gray samples in place (honouring row stride): no copy
+    img = Image.frombuffer("L", (r.width, r.height), r.samples, "raw", "L", r.stride, 1)
+    img._pixmap = r.pix  # the image borrows the pixmap's memory; keep it alive as long as the image
+    return img
+
+def _render(page, dpi: int, clip=None):
+    return _to_image(_rasterize(page, dpi, clip))
+
+def _ocr_raster(r: Raster, config: str, pooled: bool, workers: int) -> str:
+    if pooled:
+        try:
+            return get_pool(workers).ocr(r.samples, r.width, r.height, r.stride, config)
+        except (RuntimeError, OSError) as e:  # OcrWorkerError, an engine error reply, a shut-down pool
+            if shutil.which("tesseract") is None:
+                raise
+            log.debug("OCR pool failed on a band, using pytesseract: %s", e)
+    return _ocr_image(_to_image(r), config)
+
+def _page_dpi(rect, dpi: int, tile_px: int, cap_bytes: int) -> int:
+    """Highest DPI <= `dpi` at which one band of this page fits in `cap_bytes`."""
+    band_px = min(rect.height * dpi / 72.0, tile_px)
+    need = rect.width * dpi / 72.0 * band_px
+    if need <= cap_bytes:
+        return dpi
+    # band height is capped in pixels, so only the width term scales once banding kicks in
+    scale = cap_bytes / need if band_px == tile_px else (cap_bytes / need) ** 0.5
+    return max(OCR_MIN_DPI, int(dpi * scale))
+
+def _band_cuts(page, dpi: int, tile_px: int) -> List[float]:
+    """y cut positions (points) splitting the page into bands <= tile_px, at blank rows."""
+    import fitz
+    rect = page.rect
+    band_pt = tile_px * 72.0 / dpi
+    if rect.height <= band_pt:
+        return []
+    pv = page.get_pixmap(matrix=fitz.Matrix(PREVIEW_DPI / 72.0, PREVIEW_DPI / 72.0),
+                         colorspace=fitz.csGRAY, alpha=False)
+    samples, stride, w = pv.samples, pv.stride, pv.width
+    rows = [sum(samples[r * stride:r * stride + w]) for r in range(pv.height)]
+    to_row = PREVIEW_DPI / 72.0
+
+    cuts: List[float] = []
+    top = rect.y0
+    while rect.y1 - top > band_pt:
+        hi = int((top + band_pt - rect.y0) * to_row)          # furthest allowed cut
+        lo = max(int((top + band_pt * 0.75 - rect.y0) * to_row), int((top - rect.y0) * to_row) + 1)
+        hi = min(hi, len(rows) - 1)
+        # brightest preview row in the last quarter of the band; ties -> the lowest one
+        best = max(range(lo, hi + 1), key=lambda r: (rows[r], r)) if lo <= hi else hi
+        cut = rect.y0 + best / to_row
+        if cut <= top:
+            cut = top + band_pt
+        cuts.append(cut)
+        top = cut
+    return cuts
+
+def _tiles(doc, todo: Sequence[int], dpi: int, tile_px: int, cap_bytes: int) -> Iterator[Tuple[int, object, int, int]]:
+    """(slot, clip, dpi, estimated bytes) for every band of every page in `todo`."""
+    import fitz
+    for k, i in enumerate(todo):
+        page = doc[i]
+        rect = page.rect
+        pdpi = _page_dpi(rect, dpi, tile_px, cap_bytes)
+        cuts = _band_cuts(page, pdpi, tile_px)
+        if not cuts:
+            yield k, None, pdpi, int(rect.width * pdpi / 72.0) * int(rect.height * pdpi / 72.0)
+            continue
+        edges = [rect.y0] + cuts + [rect.y1]
+        for y0, y1 in zip(edges, edges[1:]):
+            clip = fitz.Rect(rect.x0, y0, rect.x1, y1)
+            yield k, clip, pdpi, int(rect.width * pdpi / 72.0) * int((y1 - y0) * pdpi / 72.0)
+
+def ocr_pages(
+    pdf: PdfSource,
+    dpi: int,
+    workers: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    config: str = OCR_CONFIG,
+    pages: Optional[Sequence[int]] = None,
+    tile_px: Optional[int] = None,
+    max_mb: Optional[float] = None,
+    engine: Optional[str] = None,
+) -> List[str]:
+    """
+    OCR every page (up to `max_pages`), or just the page indexes in `pages`, and return
+    the texts in that order. Rendered bands in flight are bounded both by count
+    (~2x`workers`) and by total pixel bytes (`max_mb`, default OCR_JOB_MAX_MB; a single
+    band over it even at OCR_MIN_DPI is OCR'd alone).
+    `engine` is "pool", "subprocess" or None for OCR_ENGINE.
+    """
+    pooled = use_pool(engine)
+    if not pooled and shutil.which("tesseract") is None:
+        raise RuntimeError("tesseract binary not found (install tesseract-ocr)")
+    workers = max(1, workers or OCR_WORKERS)
+    limit = max_pages if max_pages is not None else OCR_MAX_PAGES
+    tile_px = tile_px or OCR_TILE_PX
+    cap_bytes = int((max_mb or OCR_JOB_MAX_MB) * 1024 * 1024)
+    doc = open_pdf(pdf)
+    todo = list(pages) if pages is not None else list(range(len(doc)))
+    if limit:
+        todo = todo[:limit]
+
+    parts: List[List[str]] = [[] for _ in todo]
+    if workers == 1:
+        for k, clip, pdpi, _ in _tiles(doc, todo, dpi, tile_px, cap_bytes):
+            parts[k].append(_ocr_raster(_rasterize(doc[todo[k]], pdpi, clip), config, pooled, workers))
+        return ["\n".join(p) for p in parts]
+
+    inflight: Deque[Tuple[int, Future, int]] = deque()
+    held = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr") as ex:
+        for k, clip, pdpi, nbytes in _tiles(doc, todo, dpi, tile_px, cap_bytes):
+            # bands finish in submission order per page, so draining FIFO keeps text order
+            while inflight and (len(inflight) >= 2 * workers or held + nbytes > cap_bytes):
+                j, fut, b = inflight.popleft()
+                parts[j].append(fut.result())
+                held -= b
+            raster = _rasterize(doc[todo[k]], pdpi, clip)
+            inflight.append((k, ex.submit(_ocr_raster, raster, config, pooled, workers), nbytes))
+            held += nbytes
+        for j, fut, _ in inflight:
+            parts[j].append(fut.result())
+    return ["\n".join(p) for p in parts]
@@ -0,0 +1,279 @@
+# parsers/ocr_pool.py
+# Long-lived OCR engine processes. pytesseract starts a tesseract process per page and
+# round-trips a PNG through temp files; here each worker loads the engine and language
+# model once (tesserocr) and is sent raw 8-bit grayscale buffers over a pipe.
+# Workers are health-checked (liveness + ping after idling) and recycled after
+# OCR_POOL_RECYCLE_PAGES pages; a worker that hangs or dies is killed and replaced.
+# tesserocr is optional: without it parsers.ocr keeps using pytesseract. After
+# OCR_POOL_MAX_FAILURES consecutive worker start/crash failures the pool turns itself
+# off and every page goes to pytesseract.
+#
+# Size: each process has its own pool, so with the ParsePool the machine runs up to
+# PARSE_WORKERS x OCR_POOL_SIZE engines; the default splits the CPUs between them.
+from __future__ import annotations
+import atexit
+import logging
+import multiprocessing as mp
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from parsers.parse_pool import PARSE_WORKERS
+
+log = logging.getLogger(__name__)
+
+OCR_ENGINE = os.getenv("OCR_ENGINE", "auto")  # auto | pool | subprocess
+OCR_POOL_RECYCLE_PAGES = int(os.getenv("OCR_POOL_RECYCLE_PAGES", "200"))
+OCR_POOL_TIMEOUT = float(os.getenv("OCR_POOL_TIMEOUT", "60"))           # seconds per page
+OCR_POOL_HEALTH_IDLE = float(os.getenv("OCR_POOL_HEALTH_IDLE", "30"))  # ping workers idle longer than this
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+OCR_POOL_SIZE = int(os.getenv("OCR_POOL_SIZE", str(max(1, (os.cpu_count() or 2) // PARSE_WORKERS))))
+OCR_POOL_MAX_FAILURES = int(os.getenv("OCR_POOL_MAX_FAILURES", "3"))
+PING_TIMEOUT = 5.0
+
+
+class OcrWorkerError(RuntimeError):
+    """
+    The worker died, hung or couldn't be started (or the pool is disabled after repeated
+    failures). Callers may fall back to pytesseract.
+    """
+
+
+def tesserocr_available() -> bool:
+    try:
+        import tesserocr  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _psm(config: str) -> int:
+    m = re.search(r"--psm\s+(\d+)", config or "")
+    return int(m.group(1)) if m else 3
+
+
+def _worker_main(conn, lang: str) -> None:
+    import tesserocr
+    api = tesserocr.PyTessBaseAPI(lang=lang)  # engine + traineddata loaded once per worker
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                return
+            if msg[0] == "ping":
+                conn.send(("pong", api.GetInitLanguagesAsString()))
+                continue
+            _, width, height, stride, psm = msg
+            buf = conn.recv_bytes()
+            try:
+                api.SetPageSegMode(psm)
+                api.SetImageBytes(buf, width, height, 1, stride)
+                conn.send(("ok", api.GetUTF8Text()))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        api.End()
+
+
+class _Worker:
+    def __init__(self, ctx, lang: str):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(child, lang), daemon=True, name="ocr-engine")
+        self.proc.start()
+        child.close()
+        self.pages = 0
+        self.last_used = time.monotonic()
+
+    def _reply(self, timeout: float) -> Any:
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"no reply in {timeout:g}s")
+        return self.conn.recv()
+
+    def ping(self) -> bool:
+        try:
+            self.conn.send(("ping",))
+            kind, langs = self._reply(PING_TIMEOUT)
+            return kind == "pong" and bool(langs)
+        except (TimeoutError, EOFError, OSError):
+            return False
+
+    def ocr(self, buf: bytes, width: int, height: int, stride: int, psm: int, timeout: float) -> str:
+        self.conn.send(("ocr", width, height, stride, psm))
+        self.conn.send_bytes(buf)
+        kind, value = self._reply(timeout)
+        self.last_used = time.monotonic()
+        self.pages += 1
+        if kind != "ok":
+            raise RuntimeError(value)
+        return value
+
+    def close(self, kill: bool = False) -> None:
+        if not kill:
+            try:
+                self.conn.send(None)
+                self.proc.join(2)
+            except (OSError, EOFError):
+                pass
+        if self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join(1)
+        self.conn.close()
+
+
+class OcrEnginePool:
+    """
+    Up to `size` engine processes, started lazily. ocr() is thread-safe: parsers.ocr
+    calls it from its OCR thread pool, one page per call.
+    """
+    def __init__(
+        self,
+        size: int,
+        recycle_pages: int = OCR_POOL_RECYCLE_PAGES,
+        timeout: float = OCR_POOL_TIMEOUT,
+        health_idle: float = OCR_POOL_HEALTH_IDLE,
+        lang: str = OCR_LANG,
+        max_failures: int = OCR_POOL_MAX_FAILURES,
+    ):
+        self.size = size
+        self.max_failures = max_failures
+        self.recycle_pages = recycle_pages
+        self.timeout = timeout
+        self.health_idle = health_idle
+        self.lang = lang
+        self._ctx = mp.get_context("spawn")  # same reasoning as ParsePool: never fork
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._lock = threading.RLock()  # _acquire holds it while _spawn records a failed start
+        self._live = 0
+        self._closed = False
+        self._failures = 0  # consecutive worker start/crash failures
+        self.disabled = False
+        self.stats = {"pages": 0, "started": 0, "recycled": 0, "restarted": 0, "health_failures": 0, "errors": 0}
+
+    def _failed(self, e: BaseException) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.max_failures and not self.disabled:
+                self.disabled = True
+                log.warning("OCR pool disabled after %d worker failures in a row (last: %s); using pytesseract",
+                            self._failures, e)
+
+    def _spawn(self) -> _Worker:
+        try:
+            w = _Worker(self._ctx, self.lang)
+        except Exception as e:
+            self._failed(e)
+            raise OcrWorkerError(f"OCR worker failed to start: {e}") from e
+        self.stats["started"] += 1
+        return w
+
+    def _acquire(self) -> _Worker:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("OCR pool is shut down")
+                if self._live < self.size:
+                    self._live += 1
+                    try:
+                        return self._spawn()
+                    except Exception:
+                        self._live -= 1
+                        raise
+            try:
+                # short wait, then re-check: a retired worker frees a slot without touching _idle
+                return self._idle.get(timeout=0.25)
+            except queue.Empty:
+                continue
+
+    def _retire(self, w: _Worker, kill: bool) -> None:
+        w.close(kill=kill)
+        with self._lock:
+            self._live -= 1
+
+    def _healthy(self, w: _Worker) -> bool:
+        if not w.proc.is_alive():
+            return False
+        if time.monotonic() - w.last_used > self.health_idle:
+            return w.ping()
+        return True
+
+    def ocr(self, buf: bytes, width: int, height: int, stride: int, config: str = "") -> str:
+        if self.disabled:
+            raise OcrWorkerError("OCR pool disabled after repeated worker failures")
+        w = self._acquire()
+        if not self._healthy(w):
+            self.stats["health_failures"] += 1
+            w.close(kill=True)
+            try:
+                w = self._spawn()  # reuses the dead worker's slot in _live
+            except Exception:
+                with self._lock:
+                    self._live -= 1
+                raise
+        try:
+            text = w.ocr(buf, width, height, stride, _psm(config), self.timeout)
+        except (TimeoutError, EOFError, OSError) as e:
+            self.stats["restarted"] += 1
+            log.warning("OCR worker pid %s failed, replacing it: %s", w.proc.pid, e)
+            self._retire(w, kill=True)
+            self._failed(e)
+            raise OcrWorkerError(f"OCR worker failed: {e}") from e
+        except RuntimeError:
+            self.stats["errors"] += 1
+            self._idle.put(w)
+            raise
+        self._failures = 0
+        self.stats["pages"] += 1
+        if w.pages >= self.recycle_pages:
+            self.stats["recycled"] += 1
+            self._retire(w, kill=False)  # bounds any per-process memory growth in the engine
+        else:
+            self._idle.put(w)
+        return text
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                w = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(w, kill=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"size": self.size, "live": self._live, "idle": self._idle.qsize(),
+                "disabled": self.disabled, **self.stats}
+
+
+_pool: Optional[OcrEnginePool] = None
+_pool_lock = threading.Lock()
+
+def use_pool(engine: Optional[str] = None) -> bool:
+    """Whether OCR should go through the engine pool (vs. pytesseract per page)."""
+    engine = engine or OCR_ENGINE
+    if engine == "subprocess":
+        return False
+    ok = tesserocr_available()
+    if engine == "pool" and not ok:
+        raise RuntimeError("OCR_ENGINE=pool but tesserocr is not installed")
+    return ok
+
+def get_pool(size: int) -> OcrEnginePool:
+    """
+    The per-process engine pool (inside a ParsePool worker it lives as long as the worker),
+    at most OCR_POOL_SIZE engines however many OCR threads share it.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OcrEnginePool(min(size, OCR_POOL_SIZE))
+            atexit.register(_pool.shutdown)
+        return _pool
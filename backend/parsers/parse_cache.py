@@ -0,0 +1,208 @@
+# parsers/parse_cache.py
+# Content-addressed cache for parse results: key = SHA-256 of the PDF bytes + parser
+# version, so re-uploads of the same resume/transcript skip OCR and parsing entirely.
+# Tier 1 is a size-bounded local directory; tier 2 (optional) is a Mongo collection
+# shared by every server process.
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from parsers.pdf_source import PdfSource
+from parsers.parse_pool import ParsePool, parse_onboarding_docs
+from parsers.resume_parser import RESUME_PARSER_VERSION
+from parsers.transcript_parser import TRANSCRIPT_PARSER_VERSION
+
+log = logging.getLogger(__name__)
+
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "owlconnect-parse-cache"))
+PARSE_CACHE_MAX_MB = float(os.getenv("PARSE_CACHE_MAX_MB", "256"))
+PARSE_CACHE_MONGO_TTL_DAYS = int(os.getenv("PARSE_CACHE_MONGO_TTL_DAYS", "90"))
+
+VERSIONS = {"resume": RESUME_PARSER_VERSION, "transcript": TRANSCRIPT_PARSER_VERSION}
+
+
+def content_key(kind: str, data: bytes) -> str:
+    return f"{kind}-{VERSIONS[kind]}-{hashlib.sha256(data).hexdigest()}"
+
+def _read_bytes(src: PdfSource) -> bytes:
+    if isinstance(src, str):
+        with open(src, "rb") as f:
+            return f.read()
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return bytes(src)
+    raise TypeError(f"cannot hash PDF source of type {type(src).__name__}")
+
+
+class DiskParseCache:
+    """JSON files under `root`, evicted oldest-used first once `max_bytes` is exceeded."""
+    def __init__(self, root: str = PARSE_CACHE_DIR, max_bytes: int = int(PARSE_CACHE_MAX_MB * 1024 * 1024)):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None
+
+    def _path(self, key: str) -> str:
+        digest = key.rsplit("-", 1)[-1]
+        return os.path.join(self.root, digest[:2], key + ".json")
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        out = []
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                p = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        p = self._path(key)
+        try:
+            with open(p, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(p)  # mtime doubles as last-used time for eviction
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        p = self._path(key)
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        blob = json.dumps(value, default=str).encode("utf-8")
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(p), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        with self._lock:
+            try:
+                old = os.stat(p).st_size  # overwriting a key only adds the size difference
+            except OSError:
+                old = 0
+            os.replace(tmp, p)  # atomic: concurrent readers never see a partial file
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._entries())
+            else:
+                self._total += len(blob) - old
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                pass
+        self._total = total
+
+
+class ParseCache:
+    """Disk tier in front of an optional Motor collection tier."""
+    def __init__(self, disk: Optional[DiskParseCache] = None, collection: Any = None):
+        self.disk = disk
+        self.collection = collection
+        self.stats = {"hits_disk": 0, "hits_mongo": 0, "misses": 0}
+
+    async def create_indexes(self) -> None:
+        if self.collection is not None:
+            await self.collection.create_index(
+                "created_at", expireAfterSeconds=PARSE_CACHE_MONGO_TTL_DAYS * 86400
+            )
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.disk is not None:
+            value = await asyncio.to_thread(self.disk.get, key)
+            if value is not None:
+                self.stats["hits_disk"] += 1
+                return value
+        if self.collection is not None:
+            try:
+                doc = await self.collection.find_one({"_id": key}, projection={"result": 1})
+            except Exception as e:
+                log.warning("parse cache mongo read failed: %s", e)
+                doc = None
+            if doc is not None:
+                self.stats["hits_mongo"] += 1
+                if self.disk is not None:
+                    await asyncio.to_thread(self.disk.put, key, doc["result"])
+                return doc["result"]
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, value: Dict[str, Any]) -> None:
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.put, key, value)
+            except OSError as e:
+                log.warning("parse cache disk write failed: %s", e)
+        if self.collection is not None:
+            try:
+                await self.collection.replace_one(
+                    {"_id": key},
+                    {"_id": key, "result": value, "created_at": datetime.utcnow()},
+                    upsert=True,
+                )
+            except Exception as e:
+                log.warning("parse cache mongo write failed: %s", e)
+
+
+async def parse_onboarding_cached(
+    pool: ParsePool,
+    cache: Optional[ParseCache],
+    resume: PdfSource,
+    transcript: PdfSource,
+    resume_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """parse_onboarding_docs through the cache: only documents not seen before hit the pool."""
+    if cache is None:
+        return await pool.run(parse_onboarding_docs, resume, transcript, resume_name)
+
+    r_key = content_key("resume", await asyncio.to_thread(_read_bytes, resume))
+    t_key = content_key("transcript", await asyncio.to_thread(_read_bytes, transcript))
+    resume_data = await cache.get(r_key)
+    transcript_data = await cache.get(t_key)
+
+    if resume_data is None or transcript_data is None:
+        parsed = await pool.run(
+            parse_onboarding_docs,
+            resume if resume_data is None else None,
+            transcript if transcript_data is None else None,
+            resume_name,
+        )
+        if resume_data is None:
+            resume_data = parsed["resume_data"]
+            await cache.put(r_key, resume_data)
+        if transcript_data is None:
+            transcript_data = parsed["transcript_data"]
+            await cache.put(t_key, transcript_data)
+
+    resume_data = {**resume_data, "source_pdf": resume_name or resume_data.get("source_pdf")}
+    return {"resume_data": resume_data, "transcript_data": transcript_data}
+
+async def parse_transcript_cached(pool: ParsePool, cache: Optional[ParseCache], transcript: PdfSource) -> Dict[str, Any]:
+    """Transcript-only variant for re-uploads."""
+    key = content_key("transcript", await asyncio.to_thread(_read_bytes, transcript)) if cache else None
+    data = await cache.get(key) if cache else None
+    if data is None:
+        data = (await pool.run(parse_onboarding_docs, None, transcript))["transcript_data"]
+        if cache:
+            await cache.put(key, data)
+    return data
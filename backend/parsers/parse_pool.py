@@ -0,0 +1,114 @@
+# parsers/parse_pool.py
+# Runs the (OCR-heavy, CPU-bound) PDF parsers in worker processes so they never block
+# the uvicorn event loop. Each slot is a single-process executor: when a job times out
+# or is cancelled only that slot's process is killed and replaced.
+from __future__ import annotations
+import asyncio
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+PARSE_QUEUE = int(os.getenv("PARSE_QUEUE", "8"))          # jobs allowed to wait for a free worker
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", "90"))   # seconds per job
+
+
+class PoolBusy(RuntimeError):
+    """Raised immediately when every worker is busy and the wait queue is full."""
+
+
+class JobTimeout(RuntimeError):
+    pass
+
+
+def parse_onboarding_docs(resume: Any, transcript: Any, resume_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Worker entry point: parse one student's resume + transcript (paths or PDF bytes).
+    A None source is skipped (its result already came from the parse cache).
+    """
+    from parsers.resume_parser import parse_resume
+    from parsers.transcript_parser import parse_major_and_courses
+    return {
+        "resume_data": parse_resume(resume, filename=resume_name) if resume is not None else None,
+        "transcript_data": parse_major_and_courses(transcript) if transcript is not None else None,
+    }
+
+
+def _new_slot() -> ProcessPoolExecutor:
+    # spawn: never fork the server process (event loop, Mongo client threads)
+    return ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn"))
+
+def _kill_slot(ex: ProcessPoolExecutor) -> None:
+    # there is no public API to stop a running task; terminate the worker directly
+    for p in list((getattr(ex, "_processes", None) or {}).values()):
+        try: p.terminate()
+        except Exception: pass
+    ex.shutdown(wait=False, cancel_futures=True)
+
+
+class ParsePool:
+    def __init__(self, workers: int = PARSE_WORKERS, max_queue: int = PARSE_QUEUE, timeout: float = PARSE_TIMEOUT):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._slots: Optional[asyncio.Queue] = None
+        self._pending = 0
+        self.stats = {"completed": 0, "rejected": 0, "timed_out": 0, "cancelled": 0, "failed": 0}
+
+    def _ensure_started(self) -> asyncio.Queue:
+        if self._slots is None:
+            self._slots = asyncio.Queue()
+            for _ in range(self.workers):
+                self._slots.put_nowait(_new_slot())
+        return self._slots
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run `fn(*args)` in a worker process. Raises PoolBusy without waiting when over
+        capacity, JobTimeout when the job exceeds its budget (the worker is killed).
+        """
+        slots = self._ensure_started()
+        if self._pending >= self.workers + self.max_queue:
+            self.stats["rejected"] += 1
+            raise PoolBusy(f"{self._pending} parse jobs in flight")
+        self._pending += 1
+        ex: Optional[ProcessPoolExecutor] = None
+        try:
+            ex = await slots.get()
+            fut = asyncio.get_running_loop().run_in_executor(ex, fn, *args)
+            try:
+                result = await asyncio.wait_for(fut, timeout or self.timeout)
+            except asyncio.TimeoutError:
+                self.stats["timed_out"] += 1
+                _kill_slot(ex); ex = _new_slot()
+                raise JobTimeout(f"parse job exceeded {timeout or self.timeout:g}s")
+            except asyncio.CancelledError:
+                self.stats["cancelled"] += 1
+                _kill_slot(ex); ex = _new_slot()
+                raise
+            except Exception:
+                self.stats["failed"] += 1
+                if getattr(ex, "_broken", False):
+                    _kill_slot(ex); ex = _new_slot()
+                raise
+            self.stats["completed"] += 1
+            return result
+        finally:
+            if ex is not None:
+                slots.put_nowait(ex)
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._slots is None:
+            return
+        while not self._slots.empty():
+            _kill_slot(self._slots.get_nowait())
+        self._slots = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "max_queue": self.max_queue, "pending": self._pending, **self.stats}
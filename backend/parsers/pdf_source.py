@@ -0,0 +1,74 @@
+# parsers/pdf_source.py
+# Lets the parsers take a path, raw bytes, a binary file object or an already-open
+# PyMuPDF document, so uploads can be parsed without a temp file and a PDF is opened once.
+from __future__ import annotations
+import io
+import os
+from typing import Any, IO, Optional, Union
+
+PdfSource = Union[str, bytes, bytearray, memoryview, IO[bytes], Any]  # Any: fitz.Document
+
+# uploads larger than this are spooled to disk instead of held in memory
+SPOOL_THRESHOLD = int(os.getenv("PDF_SPOOL_THRESHOLD", str(16 * 1024 * 1024)))
+
+
+def _is_document(src: Any) -> bool:
+    import fitz
+    return isinstance(src, fitz.Document)
+
+def open_pdf(src: PdfSource):
+    """Return a fitz.Document for `src`; an open Document is passed through untouched."""
+    import fitz
+    if _is_document(src):
+        return src
+    if isinstance(src, str):
+        return fitz.open(src)
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=bytes(src), filetype="pdf")
+    if hasattr(src, "read"):
+        if hasattr(src, "seek"):
+            src.seek(0)
+        return fitz.open(stream=src.read(), filetype="pdf")
+    raise TypeError(f"unsupported PDF source: {type(src).__name__}")
+
+def pdf_stream(src: PdfSource):
+    """Something PyPDF2's PdfReader accepts: a path or a seekable binary stream."""
+    if isinstance(src, str):
+        return src
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return io.BytesIO(bytes(src))
+    if _is_document(src):
+        return src.name if src.name and os.path.exists(src.name) else io.BytesIO(src.tobytes())
+    if hasattr(src, "seek"):
+        src.seek(0)
+    return src
+
+def source_name(src: PdfSource, default: Optional[str] = None) -> Optional[str]:
+    if isinstance(src, str):
+        return os.path.basename(src)
+    name = getattr(src, "name", None)
+    if isinstance(name, str) and name:
+        return os.path.basename(name)
+    return default
+
+class opened_pdf:
+    """Context manager: open `src` once, close it on exit only if we opened it."""
+    def __init__(self, src: PdfSource):
+        self.src = src
+        self.doc = None
+
+    def __enter__(self):
+        self.doc = open_pdf(self.src)
+        return self.doc
+
+    def __exit__(self, *exc):
+        if self.doc is not None and self.doc is not self.src:
+            self.doc.close()
+        return False
+
+def discard(*srcs: PdfSource) -> None:
+    """Remove sources that were spooled to temp files; in-memory sources need nothing."""
+    for src in srcs:
+        if isinstance(src, str):
+            try: os.remove(src)
+            except Exception: pass
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 """
-Resume Parser (OCR-first with pytesseract, fallback to text extraction)
+Resume Parser (text-layer-first; pytesseract OCR only for image-only or garbled pages,
+PyPDF2 as the last fallback)
 
 Usage:
   python resume_parser.py /path/to/resume.pdf [--out output.json]
 
+parse_resume() also accepts raw bytes, a binary file object or an open fitz.Document.
+
 Dependencies:
   - pytesseract (+ Tesseract binary installed)
   - PyMuPDF (fitz)
@@ -12,9 +15,14 @@ Dependencies:
   - PyPDF2 (fallback)
 """
 import os, re, json, argparse, shutil
-from PIL import Image
-import pytesseract
+from typing import Optional
 from PyPDF2 import PdfReader
+from parsers.pdf_source import PdfSource, open_pdf, opened_pdf, pdf_stream, source_name
+from parsers.ocr import ocr_pages
+from parsers.text_layer import extract_text_hybrid
+
+# bump whenever parse output changes; it is part of the parse-cache key
+RESUME_PARSER_VERSION = "2"
 
 def normalize_text(s: str) -> str:
     s = s.replace("\ufb01", "fi").replace("\ufb02", "fl")
@@ -24,27 +32,19 @@ def normalize_text(s: str) -> str:
     s = "\n".join(line.strip() for line in s.splitlines())
     return s
 
-def extract_text_ocr(pdf_path: str) -> str:
-    import fitz
-    if shutil.which("tesseract") is None:
-        raise RuntimeError("tesseract binary not found")
-    doc = fitz.open(pdf_path)
-    all_text = []
-    for page in doc:
-        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        txt = pytesseract.image_to_string(img, config="--psm 3")
-        all_text.append(txt)
-    return "\n".join(all_text)
+RESUME_OCR_DPI = int(os.getenv("RESUME_OCR_DPI", "144"))  # 2x zoom
+
+def extract_text_ocr(pdf: PdfSource, dpi: int = RESUME_OCR_DPI, workers: Optional[int] = None,
+                     max_pages: Optional[int] = None) -> str:
+    return "\n".join(ocr_pages(pdf, dpi=dpi, workers=workers, max_pages=max_pages))
 
-def extract_text_pymupdf(pdf_path: str) -> str:
-    import fitz
-    doc = fitz.open(pdf_path)
+def extract_text_pymupdf(pdf: PdfSource) -> str:
+    doc = open_pdf(pdf)
     return "\n".join(p.get_text() for p in doc)
 
-def extract_text_pypdf2(pdf_path: str) -> str:
+def extract_text_pypdf2(pdf: PdfSource) -> str:
     
-    reader = PdfReader(pdf_path)
+    reader = PdfReader(pdf_stream(pdf))
     out = []
     for pg in reader.pages:
         try:
@@ -231,23 +231,26 @@ def parse_skills(txt: str):
             out[key] = items
     return out
 
-def parse_resume(pdf_path: str) -> dict:
-    # prefer OCR
+def parse_resume(pdf: PdfSource, filename: Optional[str] = None) -> dict:
+    """`pdf` may be a path, bytes, a binary file object or an open fitz.Document."""
+    page_methods = None
     try:
-        raw = extract_text_ocr(pdf_path)
-        method = "pytesseract_ocr"
+        with opened_pdf(pdf) as doc:
+            # text layer first; OCR only the pages whose text layer is missing or garbage
+            pages, page_methods = extract_text_hybrid(doc, dpi=RESUME_OCR_DPI)
+            raw = "\n".join(pages)
+            used = set(page_methods)
+            method = ("pytesseract_ocr" if used == {"ocr"} else
+                      "hybrid" if used == {"text", "ocr"} else "pymupdf_text")
     except Exception:
-        try:
-            raw = extract_text_pymupdf(pdf_path)
-            method = "pymupdf_text"
-        except Exception:
-            raw = extract_text_pypdf2(pdf_path)
-            method = "pypdf2_text"
+        raw = extract_text_pypdf2(pdf)
+        method = "pypdf2_text"
     raw = normalize_text(raw)
     sections = split_sections(raw)
     out = {
-        "source_pdf": os.path.basename(pdf_path),
+        "source_pdf": filename or source_name(pdf),
         "extracted_by": method,
+        "page_methods": page_methods,
         "contact": parse_contact_and_name(raw),
         "education": parse_education(sections.get("education", "")),
         "experience": parse_experience(sections.get("experience", "")),
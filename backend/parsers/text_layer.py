@@ -0,0 +1,59 @@
+# parsers/text_layer.py
+# Per-page text-layer quality checks so OCR only runs where the embedded text is missing
+# or garbage (scans, broken font encodings). Born-digital pages use PyMuPDF's text directly.
+from __future__ import annotations
+import os
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+from parsers.ocr import ocr_pages
+from parsers.pdf_source import PdfSource, open_pdf
+
+MIN_PAGE_CHARS = int(os.getenv("TEXT_LAYER_MIN_CHARS", "40"))
+MIN_GLYPH_COVERAGE = float(os.getenv("TEXT_LAYER_MIN_COVERAGE", "0.9"))
+
+def _is_good_glyph(ch: str) -> bool:
+    if ch == "\ufffd":  # replacement char: glyph had no usable unicode mapping
+        return False
+    cat = unicodedata.category(ch)
+    # control / private-use / unassigned / surrogate all indicate a broken font mapping
+    return cat[0] != "C"
+
+def page_text_quality(text: str) -> Dict[str, Any]:
+    """Non-whitespace char count and the fraction of those that map to real glyphs."""
+    chars = [c for c in text if not c.isspace()]
+    n = len(chars)
+    good = sum(1 for c in chars if _is_good_glyph(c))
+    coverage = (good / n) if n else 0.0
+    return {
+        "chars": n,
+        "glyph_coverage": round(coverage, 3),
+        "usable": n >= MIN_PAGE_CHARS and coverage >= MIN_GLYPH_COVERAGE,
+    }
+
+def extract_text_hybrid(
+    pdf: PdfSource,
+    dpi: int,
+    workers: Optional[int] = None,
+    max_pages: Optional[int] = None,
+) -> Tuple[List[str], List[str]]:
+    """
+    Return (page_texts, page_methods) where each method is "text" or "ocr".
+    OCR runs (page-parallel) only on pages whose text layer fails page_text_quality;
+    if tesseract is unavailable those pages keep whatever text layer they had.
+    """
+    doc = open_pdf(pdf)
+    n = len(doc) if not max_pages else min(len(doc), max_pages)
+    texts = [doc[i].get_text() for i in range(n)]
+    methods = ["text"] * n
+    need_ocr = [i for i, t in enumerate(texts) if not page_text_quality(t)["usable"]]
+    if need_ocr:
+        try:
+            ocr_texts = ocr_pages(doc, dpi=dpi, workers=workers, pages=need_ocr)
+        except RuntimeError:
+            ocr_texts = None  # no tesseract: fall back to the weak text layer
+        if ocr_texts is not None:
+            for i, t in zip(need_ocr, ocr_texts):
+                texts[i] = t
+                methods[i] = "ocr"
+    return texts, methods
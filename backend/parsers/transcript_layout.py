@@ -0,0 +1,240 @@
+# parsers/transcript_layout.py
+# Layout-aware transcript scan built on PyMuPDF word boxes instead of flattened text.
+# Each page is split into its text columns (a two-column transcript has a clear gutter),
+# words are clustered into rows on the y-axis, and a row's cells are assigned to table
+# columns from their x positions (from the "Subject ... Title ... Grade" header row when
+# there is one, otherwise by position from the ends of the row). Rows are validated
+# field by field and handed over as structured course dicts — same shape as
+# transcript_parser.scan_transcript().
+from __future__ import annotations
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+Y_TOL = 0.6          # fraction of the median word height two words may differ by and share a row
+GUTTER_MIN = 12.0    # points of empty x-range that count as a gap between page columns
+GUTTER_NOISE = 0.02  # fraction of words allowed to straddle a gutter (stray headers/footers)
+
+_SUBJ = re.compile(r"[A-Z]{2,4}")
+_NUM = re.compile(r"\d{3}[A-Z]?")
+_LVL = re.compile(r"[A-Z]{2}")
+_CRED = re.compile(r"\d+\.\d{3}|\d+\.\d{2}|\d+")
+_GRADE = re.compile(r"A\+?|A-?|B\+?|B-?|C\+?|C-?|D\+?|D-?|F|P|S|CR|TR|NC")
+_TRANSFER_GRADE = re.compile(r"TR|AP|IB|CR")
+_SEASON = re.compile(r"(Fall|Spring|Summer|Winter)\s+\d{4}\s*:", re.IGNORECASE)
+_WORD_FIX = str.maketrans({"\ufb01": "fi", "\ufb02": "fl", "\xa0": " "})
+
+# header words -> table column
+_HEADER_COLS = {
+    "subject": "subject", "subj": "subject",
+    "course": "number", "crse": "number", "number": "number",
+    "level": "level", "lvl": "level",
+    "title": "title",
+    "grade": "grade",
+    "credit": "credits", "credits": "credits", "hours": "credits",
+    "quality": "qpoints", "points": "qpoints",
+}
+
+
+class Word(NamedTuple):
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    text: str
+
+
+def _page_words(page) -> List[Word]:
+    out = []
+    for w in page.get_text("words"):
+        t = w[4].translate(_WORD_FIX).strip()
+        if t:
+            out.append(Word(w[0], w[1], w[2], w[3], t))
+    return out
+
+def _split_columns(words: List[Word], x0: float, x1: float, depth: int = 2) -> List[List[Word]]:
+    """Split at the widest near-empty vertical strip in the middle half; recurse once."""
+    if depth == 0 or len(words) < 8:
+        return [words]
+    lo, hi = int(x0 + (x1 - x0) * 0.25), int(x0 + (x1 - x0) * 0.75)
+    if hi - lo < GUTTER_MIN:
+        return [words]
+    cover = [0] * (hi - lo)
+    for w in words:
+        for x in range(max(lo, int(w.x0)), min(hi, int(w.x1) + 1)):
+            cover[x - lo] += 1
+    allowed = int(len(words) * GUTTER_NOISE)
+    runs: List[Tuple[int, int]] = []
+    run_start = None
+    for i, c in enumerate(cover + [allowed + 1]):
+        if c <= allowed and run_start is None:
+            run_start = i
+        elif c > allowed and run_start is not None:
+            if i - run_start >= GUTTER_MIN:
+                runs.append((run_start, i))
+            run_start = None
+    # widest first; a gap between table columns (title | grade ...) is skipped for the next one
+    for a, b in sorted(runs, key=lambda r: r[0] - r[1]):
+        cut = lo + (a + b) / 2.0
+        left = [w for w in words if (w.x0 + w.x1) / 2 < cut]
+        right = [w for w in words if (w.x0 + w.x1) / 2 >= cut]
+        if left and right and _starts_rows(right):
+            return _split_columns(left, x0, cut, depth - 1) + _split_columns(right, cut, x1, depth - 1)
+    return [words]
+
+def _starts_rows(words: List[Word]) -> bool:
+    """
+    Does this strip hold rows of its own (courses or terms), rather than trailing cells?
+    Only rows beginning at the strip's left edge count: further right they belong to a
+    later page column.
+    """
+    margin = min(w.x0 for w in words) + GUTTER_MIN
+    for row in _rows(words):
+        first = row[0].text
+        if row[0].x0 > margin:
+            continue
+        if first.startswith("Term:") or (len(row) > 1 and _full(_SUBJ, first) and _full(_NUM, row[1].text)):
+            return True
+    return False
+
+def _rows(words: List[Word]) -> List[List[Word]]:
+    """Cluster words into rows by vertical centre; each row sorted left to right."""
+    if not words:
+        return []
+    heights = sorted(w.y1 - w.y0 for w in words)
+    tol = max(1.0, heights[len(heights) // 2] * Y_TOL)
+    rows: List[List[Word]] = []
+    anchor = None
+    for w in sorted(words, key=lambda w: ((w.y0 + w.y1) / 2, w.x0)):
+        yc = (w.y0 + w.y1) / 2
+        if anchor is None or yc - anchor > tol:
+            rows.append([])
+            anchor = yc
+        rows[-1].append(w)
+    return [sorted(r, key=lambda w: w.x0) for r in rows]
+
+def _header_columns(row: List[Word]) -> Optional[List[Tuple[str, float, float]]]:
+    """(column, x0, x1) spans if this row is a course-table header."""
+    cols: List[Tuple[str, float, float]] = []
+    for w in row:
+        col = _HEADER_COLS.get(w.text.lower().strip(":"))
+        if col is None:
+            continue
+        if cols and cols[-1][0] == col:  # "Credit Hours", "Quality Points"
+            cols[-1] = (col, cols[-1][1], w.x1)
+        else:
+            cols.append((col, w.x0, w.x1))
+    names = {c for c, _, _ in cols}
+    return cols if {"subject", "title", "grade"} <= names else None
+
+def _assign(row: List[Word], header: List[Tuple[str, float, float]]) -> Dict[str, List[str]]:
+    cells: Dict[str, List[str]] = {}
+    for w in row:
+        overlaps = [(min(w.x1, x1) - max(w.x0, x0), col) for col, x0, x1 in header if min(w.x1, x1) > max(w.x0, x0)]
+        if overlaps:
+            col = max(overlaps)[1]
+        else:
+            xc = (w.x0 + w.x1) / 2
+            left = [col for col, x0, _ in header if x0 <= xc]
+            col = left[-1] if left else header[0][0]
+        cells.setdefault(col, []).append(w.text)
+    return cells
+
+def _full(rx: re.Pattern, s: Optional[str]) -> bool:
+    return s is not None and rx.fullmatch(s) is not None
+
+def _course_from_tokens(tokens: Sequence[str], term: Optional[str], in_progress: bool) -> Optional[Dict[str, Any]]:
+    """Positional reading: subject number [level] title... [grade credits qpoints | credits]."""
+    if len(tokens) < 4 or not _full(_SUBJ, tokens[0]) or not _full(_NUM, tokens[1]):
+        return None
+    subj, num = tokens[0], tokens[1]
+    if (len(tokens) >= 7 and _full(_LVL, tokens[2]) and _full(_GRADE, tokens[-3])
+            and _full(_CRED, tokens[-2]) and _full(_CRED, tokens[-1])):
+        return {"term": term, "subject": subj, "number": num, "level": tokens[2],
+                "title": " ".join(tokens[3:-3]), "grade": tokens[-3], "credits": float(tokens[-2]),
+                "source": "institution", "status": "completed"}
+    if (len(tokens) >= 6 and _full(_TRANSFER_GRADE, tokens[-3])
+            and _full(_CRED, tokens[-2]) and _full(_CRED, tokens[-1])):
+        return {"term": term, "subject": subj, "number": num, "title": " ".join(tokens[2:-3]),
+                "grade": tokens[-3], "credits": float(tokens[-2]),
+                "source": "transfer", "status": "completed"}
+    if (in_progress and len(tokens) >= 5 and _full(_LVL, tokens[2]) and _full(_CRED, tokens[-1])
+            and not _full(_GRADE, tokens[-2])):  # a trailing grade means it's a completed line
+        return {"term": term, "subject": subj, "number": num, "level": tokens[2],
+                "title": " ".join(tokens[3:-1]), "credits": float(tokens[-1]),
+                "source": "institution", "status": "in_progress"}
+    return None
+
+def _course_from_cells(cells: Dict[str, List[str]], term: Optional[str], in_progress: bool) -> Optional[Dict[str, Any]]:
+    """Header-column reading; the cells are re-ordered into the positional form and validated there."""
+    one = lambda k: cells.get(k, [])
+    tokens = one("subject") + one("number") + one("level") + one("title")
+    if cells.get("grade"):
+        tokens += one("grade") + one("credits") + one("qpoints")
+    else:
+        tokens += one("credits")
+    return _course_from_tokens(tokens, term, in_progress)
+
+def scan_layout(doc) -> Dict[str, Any]:
+    """Course rows for an open fitz.Document, in reading order (page, column, row)."""
+    inst: List[Dict[str, Any]] = []
+    transfer: List[Dict[str, Any]] = []
+    inprog: List[Dict[str, Any]] = []
+    term_line: Optional[str] = None
+    season: Optional[str] = None
+    term_pending = False
+    in_progress = False
+    found_in_progress = False
+    n_rows = 0
+
+    for page in doc:
+        rect = page.rect
+        for column in _split_columns(_page_words(page), rect.x0, rect.x1):
+            header = None
+            for row in _rows(column):
+                n_rows += 1
+                tokens = [w.text for w in row]
+                line = " ".join(tokens)
+                if term_pending:
+                    term_line = line; term_pending = False
+                    continue
+                if line.startswith("Term:"):
+                    value = line[len("Term:"):].strip()
+                    if value: term_line = value
+                    else: term_pending = True
+                    continue
+                sm = _SEASON.match(line)
+                if sm:
+                    season = sm.group(0).split(":")[0].strip()
+                upper = line.upper()
+                if "COURSES IN PROGRESS" in upper:
+                    in_progress = found_in_progress = True
+                    continue
+                if "ESTHER PRIVACY" in upper:
+                    in_progress = False
+                    continue
+                hdr = _header_columns(row)
+                if hdr:
+                    header = hdr
+                    continue
+
+                term = term_line if term_line is not None else season
+                course = None
+                if header:
+                    course = _course_from_cells(_assign(row, header), term, in_progress)
+                if course is None:
+                    course = _course_from_tokens(tokens, term, in_progress)
+                if course is None:
+                    continue
+                if course["status"] == "in_progress":
+                    inprog.append(course)
+                elif course["source"] == "transfer":
+                    transfer.append(course)
+                else:
+                    inst.append(course)
+
+    return {
+        "courses_completed": inst + transfer,
+        "courses_in_progress": inprog,
+        "in_progress_found": found_in_progress,
+        "rows": n_rows,
+    }
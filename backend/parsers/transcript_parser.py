@@ -1,7 +1,15 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import os, re, json, argparse, shutil
-from typing import List, Dict, Any, Optional
+import os, re, json, argparse, shutil, logging
+from typing import List, Dict, Any, Optional, Tuple
+from parsers.pdf_source import PdfSource, open_pdf, opened_pdf, pdf_stream
+from parsers.ocr import ocr_pages
+from parsers.transcript_layout import scan_layout
+
+log = logging.getLogger(__name__)
+
+# bump whenever parse output changes; it is part of the parse-cache key
+TRANSCRIPT_PARSER_VERSION = "4"
 
 def _normalize(s: str) -> str:
     s = s.replace("\ufb01","fi").replace("\ufb02","fl").replace("\xa0"," ")
@@ -10,28 +18,19 @@ def _normalize(s: str) -> str:
     s = "\n".join(line.rstrip() for line in s.splitlines())
     return s
 
-def _extract_text_ocr(pdf_path: str) -> str:
-    import fitz
-    from PIL import Image
-    import pytesseract
-    if shutil.which("tesseract") is None:
-        raise RuntimeError("tesseract binary not found (install tesseract-ocr)")
-    doc = fitz.open(pdf_path)
-    parts=[]
-    for p in doc:
-        pix = p.get_pixmap(matrix=fitz.Matrix(2.5,2.5))
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        parts.append(pytesseract.image_to_string(img, config="--psm 3"))
-    return "\n".join(parts)
-
-def _extract_text_pymupdf(pdf_path: str) -> str:
-    import fitz
-    doc = fitz.open(pdf_path)
+TRANSCRIPT_OCR_DPI = int(os.getenv("TRANSCRIPT_OCR_DPI", "180"))  # 2.5x zoom
+
+def _extract_text_ocr(pdf: PdfSource, dpi: int = TRANSCRIPT_OCR_DPI, workers: Optional[int] = None,
+                      max_pages: Optional[int] = None) -> str:
+    return "\n".join(ocr_pages(pdf, dpi=dpi, workers=workers, max_pages=max_pages))
+
+def _extract_text_pymupdf(pdf: PdfSource) -> str:
+    doc = open_pdf(pdf)
     return "\n".join(p.get_text() for p in doc)
 
-def _extract_text_pypdf2(pdf_path: str) -> str:
+def _extract_text_pypdf2(pdf: PdfSource) -> str:
     from PyPDF2 import PdfReader
-    r = PdfReader(pdf_path)
+    r = PdfReader(pdf_stream(pdf))
     return "\n".join((pg.extract_text() or "") for pg in r.pages)
 
 def _extract_course_pairs(transcript_data: Dict[str, Any]) -> List[Dict[str, str]]:
@@ -105,78 +104,172 @@ COURSE_INPROG = re.compile(
 
 SEASON_HEADER = re.compile(r"^(Fall|Spring|Summer|Winter)\s+\d{4}\s*:", re.IGNORECASE|re.MULTILINE)
 TERM_LINE = re.compile(r"^\s*Term:\s*(.+)$", re.MULTILINE)
+CIP_SECTION = re.compile(r"COURSES IN PROGRESS(.*?)(?:Esther Privacy|$)", re.IGNORECASE|re.DOTALL)
+CIP_TERM = re.compile(r"\bTerm:\s*(.+)")
+GRADE_TAIL = re.compile(rf"\s{RE_GRADE}$")
+# COURSE_INPROG without "^": the in-progress block can start mid-line
+_INPROG_AT = re.compile(COURSE_INPROG.pattern[1:], re.MULTILINE)
+
+def _inst_row(m: re.Match, term: Optional[str]) -> Dict[str, Any]:
+    return {
+        "term": term,
+        "subject": m.group("subject"), "number": m.group("number"),
+        "level": m.group("level"),
+        "title": m.group("title").strip(),
+        "grade": m.group("grade"),
+        "credits": float(m.group("credits")),
+        "source": "institution", "status": "completed"
+    }
+
+def _transfer_row(m: re.Match, term: Optional[str]) -> Dict[str, Any]:
+    return {
+        "term": term,
+        "subject": m.group("subject"), "number": m.group("number"),
+        "title": m.group("title").strip(),
+        "grade": m.group("grade"),
+        "credits": float(m.group("credits")),
+        "source": "transfer", "status": "completed"
+    }
+
+def _inprog_row(m: re.Match, term: Optional[str]) -> Dict[str, Any]:
+    return {
+        "term": term,
+        "subject": m.group("subject"), "number": m.group("number"),
+        "level": m.group("level"), "title": m.group("title").strip(),
+        "credits": float(m.group("credits")),
+        "source":"institution","status":"in_progress"
+    }
+
+def _line_starts(text: str, start: int = 0, end: Optional[int] = None):
+    end = len(text) if end is None else end
+    pos = start
+    while pos <= end:
+        yield pos
+        nl = text.find("\n", pos, end)
+        if nl == -1:
+            return
+        pos = nl + 1
+
+def _in_progress_block(text: str) -> Optional[Tuple[int, int]]:
+    m = CIP_SECTION.search(text)
+    return (m.start(1), m.end(1)) if m else None
+
+def _in_progress_rows(text: str, block: Tuple[int, int], starts) -> List[Dict[str, Any]]:
+    lo, hi = block
+    tm = CIP_TERM.search(text[lo:hi])
+    term = tm.group(1).strip() if tm else None
+    rows = []
+    resume_at = lo
+    for pos in starts:
+        if pos < resume_at:
+            continue  # inside the previous match, as with finditer
+        m = _INPROG_AT.match(text, pos, hi)
+        if not m:
+            continue
+        resume_at = m.end()
+        if GRADE_TAIL.search(m.group("title").strip()):  # avoid completed lines
+            continue
+        rows.append(_inprog_row(m, term))
+    return rows
+
+def _term_before(text: str, terms: List[re.Match], ti: int, pos: int) -> Optional[str]:
+    """
+    The last TERM_LINE value in text[:pos], from the full-text matches: terms[:ti] have
+    their value before pos and match the prefix identically. A "Term:" whose value only
+    starts at or after pos (blank lines after it) is re-matched against the prefix, where
+    the value may come out blank or not match at all.
+    """
+    last = terms[ti - 1] if ti else None
+    if ti < len(terms) and terms[ti].start() < pos:
+        for last in TERM_LINE.finditer(text, terms[ti].start(), pos):
+            pass
+    return last.group(1).strip() if last else None
+
+def scan_transcript(text: str) -> Dict[str, Any]:
+    """
+    Single pass over the line starts. The current term (last "Term:" value before the
+    course, else the last "<Season> <year>:" header) is tracked as we go and each line is
+    tried, anchored, as an institution, transfer or in-progress course — linear instead of
+    re-scanning the prefix for every course. Same output as the finditer/_find_term
+    version (tests/test_transcript_scan.py), including rows whose cells PyMuPDF put on
+    separate lines.
+    """
+    inst: List[Dict[str, Any]] = []
+    transfer: List[Dict[str, Any]] = []
+    inprog_at: List[int] = []
+    block = _in_progress_block(text)
+    if block:
+        inprog_at.append(block[0])  # the block may begin mid-line
 
-def _find_term(text: str, pos: int) -> Optional[str]:
-    prior = text[:pos]
-    m = list(TERM_LINE.finditer(prior))
-    if m: return m[-1].group(1).strip()
-    m2 = list(SEASON_HEADER.finditer(prior))
-    if m2: return m2[-1].group(0).split(":")[0].strip()
-    return None
+    terms = list(TERM_LINE.finditer(text))
+    ti = 0
+    season: Optional[str] = None
+    inst_next = tr_next = 0
+
+    for pos in _line_starts(text):
+        while ti < len(terms) and terms[ti].start(1) < pos:
+            ti += 1
+        im = COURSE_INST.match(text, pos) if pos >= inst_next else None
+        tm = COURSE_TR.match(text, pos) if pos >= tr_next else None
+        if im or tm:
+            term = _term_before(text, terms, ti, pos)
+            if term is None:
+                term = season
+            if im: inst.append(_inst_row(im, term)); inst_next = im.end()
+            if tm: transfer.append(_transfer_row(tm, term)); tr_next = tm.end()
+        if block and block[0] < pos <= block[1]:
+            inprog_at.append(pos)
+        sm = SEASON_HEADER.match(text, pos)
+        if sm: season = sm.group(0).split(":")[0].strip()
+
+    return {
+        "courses_completed": inst + transfer,
+        "courses_in_progress": _in_progress_rows(text, block, inprog_at) if block else [],
+        "in_progress_found": block is not None,
+    }
 
 def parse_courses_completed(text: str) -> List[Dict[str,Any]]:
-    out=[]
-    for m in COURSE_INST.finditer(text):
-        out.append({
-            "term": _find_term(text, m.start()),
-            "subject": m.group("subject"), "number": m.group("number"),
-            "level": m.group("level"),
-            "title": m.group("title").strip(),
-            "grade": m.group("grade"),
-            "credits": float(m.group("credits")),
-            "source": "institution", "status": "completed"
-        })
-    for m in COURSE_TR.finditer(text):
-        out.append({
-            "term": _find_term(text, m.start()),
-            "subject": m.group("subject"), "number": m.group("number"),
-            "title": m.group("title").strip(),
-            "grade": m.group("grade"),
-            "credits": float(m.group("credits")),
-            "source": "transfer", "status": "completed"
-        })
-    return out
+    return scan_transcript(text)["courses_completed"]
 
 def parse_courses_in_progress(text: str, text_plain: Optional[str]) -> List[Dict[str,Any]]:
-    sec = None
     for t in [text, text_plain or ""]:
         if not t: continue
-        m = re.search(r"COURSES IN PROGRESS(.*?)(?:Esther Privacy|$)", t, re.IGNORECASE|re.DOTALL)
-        if m: sec = m.group(1); break
-    if not sec: return []
-    tm = re.search(r"\bTerm:\s*(.+)", sec)
-    term = tm.group(1).strip() if tm else None
-    courses=[]
-    for m in COURSE_INPROG.finditer(sec):
-        title = m.group("title").strip()
-        if re.search(rf"\s{RE_GRADE}$", title):  # avoid completed lines
-            continue
-        courses.append({
-            "term": term,
-            "subject": m.group("subject"), "number": m.group("number"),
-            "level": m.group("level"), "title": title,
-            "credits": float(m.group("credits")),
-            "source":"institution","status":"in_progress"
-        })
-    return courses
-
-def parse_major_and_courses(pdf_path: str) -> Dict[str, Any]:
-    # prefer PyMuPDF text; fallback to OCR then PyPDF2 — OCR is noisy for columns
-    try:
-        text = _normalize(_extract_text_pymupdf(pdf_path)); method = "pymupdf_text"
-    except Exception:
-        try:
-            text = _normalize(_extract_text_ocr(pdf_path)); method = "pytesseract_ocr"
-        except Exception:
-            text = _normalize(_extract_text_pypdf2(pdf_path)); method = "pypdf2_text"
-    # also a plain variant for CIP fallback
+        block = _in_progress_block(t)
+        if block:
+            lo, hi = block
+            return _in_progress_rows(t, block, [lo] + [p for p in _line_starts(t, lo, hi) if p > lo])
+    return []
+
+def parse_major_and_courses(pdf: PdfSource) -> Dict[str, Any]:
+    """`pdf` may be a path, bytes, a binary file object or an open fitz.Document."""
+    plain = None
+    scan = None
     try:
-        plain = _normalize(_extract_text_pymupdf(pdf_path))
+        with opened_pdf(pdf) as doc:
+            # prefer PyMuPDF text; fallback to OCR then PyPDF2 — OCR is noisy for columns
+            try:
+                text = _normalize(_extract_text_pymupdf(doc)); method = "pymupdf_text"
+                plain = text  # the CIP fallback wants exactly this text; don't extract it twice
+            except Exception:
+                text = _normalize(_extract_text_ocr(doc)); method = "pytesseract_ocr"
+            else:
+                # course rows straight from word boxes: immune to column order in get_text().
+                # A layout failure keeps the text already extracted (scan_transcript below).
+                try:
+                    layout = scan_layout(doc)
+                    if layout["courses_completed"] or layout["courses_in_progress"]:
+                        scan = layout; method = "pymupdf_layout"
+                except Exception:
+                    log.exception("transcript layout scan failed; using the text scan")
     except Exception:
-        plain = None
+        text = _normalize(_extract_text_pypdf2(pdf)); method = "pypdf2_text"
     majors = parse_majors(text)
-    completed = parse_courses_completed(text)
-    inprog = parse_courses_in_progress(text, plain)
+    if scan is None:
+        scan = scan_transcript(text)
+    completed = scan["courses_completed"]
+    inprog = scan["courses_in_progress"]
+    if not scan["in_progress_found"] and plain and plain != text:
+        inprog = parse_courses_in_progress("", plain)
     return {"majors": majors, "courses_completed": completed, "courses_in_progress": inprog, "_extracted_by": method}
 
 # def main():
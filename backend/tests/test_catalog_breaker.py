@@ -0,0 +1,41 @@
+# tests/test_catalog_breaker.py
+# The catalog host's circuit breaker lets one probe through when half-open; a probe that
+# is cancelled (e.g. by a CATALOG_DEADLINE timeout) must give that slot back.
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_servers import course_mcp
+
+HOST = "catalog.test"
+
+
+def test_probe_cancelled_during_backoff_frees_the_slot(monkeypatch):
+    monkeypatch.setattr(course_mcp, "CATALOG_RETRIES", 2)
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(503)
+
+    breaker = course_mcp.CircuitBreaker(failures=1, cooldown=0)
+    breaker.failure()  # open, cooldown already over: the next request is the half-open probe
+    monkeypatch.setitem(course_mcp._breakers, HOST, breaker)
+
+    async def run():
+        monkeypatch.setattr(course_mcp, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        monkeypatch.setattr(course_mcp, "_client_loop", asyncio.get_running_loop())
+        task = asyncio.ensure_future(course_mcp.fetch_url_async(f"http://{HOST}/catalog"))
+        while not calls:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.02)  # 503 -> retry backoff sleep
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await course_mcp.close_client()
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    assert breaker.state == "half_open"
+    assert breaker.allow()  # the next request may probe again
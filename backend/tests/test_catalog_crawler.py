@@ -0,0 +1,117 @@
+# tests/test_catalog_crawler.py
+# Crawl a local HTTP stand-in serving canned catalog pages into a temporary index, then
+# check that CATALOG_OFFLINE=1 lookups are answered from that index alone.
+import asyncio
+import importlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+YEAR = 2026
+COURSES = {
+    "COMP": {"140": "Computational Thinking", "182": "Algorithmic Thinking"},
+    "MATH": {"101": "Single Variable Calculus I"},
+}
+LISTED_ONLY = ("MATH", "999")  # linked from the subject page, but its page is empty
+
+
+def listing(links):
+    items = "".join(f'<li><a href="?p_action=CATALIST&amp;p_acyr_code={YEAR}&amp;{q}">{t}</a></li>' for q, t in links)
+    return f"<html><body><ul>{items}</ul></body></html>"
+
+def course_page(subject, number, title):
+    return f"""<html><head><title>Course Catalog</title></head><body>
+<table class="course"><tr><td><b>{subject} {number} - {title.upper()}</b></td></tr>
+<tr><td><b>Long Title:</b> {title}</td></tr>
+<tr><td><b>Department:</b> Test Department</td></tr>
+<tr><td><b>Credit Hours:</b> 3</td></tr>
+<tr><td><b>Description:</b> All about {title.lower()}.</td></tr></table></body></html>"""
+
+class Catalog(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        qs = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        Catalog.requests.append(qs)
+        subj, numb = qs.get("p_subj"), qs.get("p_crse_numb")
+        if subj is None:
+            body = listing([(f"p_subj={s}", s) for s in COURSES])
+        elif numb is None:
+            numbers = list(COURSES.get(subj, {})) + ([LISTED_ONLY[1]] if subj == LISTED_ONLY[0] else [])
+            body = listing([(f"p_subj={subj}&amp;p_crse_numb={n}", n) for n in numbers])
+        elif numb in COURSES.get(subj, {}):
+            body = course_page(subj, numb, COURSES[subj][numb])
+        else:
+            body = "<html><body>No courses found.</body></html>"
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def catalog_server():
+    Catalog.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Catalog)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/courses/!SWKSCAT.cat"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch, catalog_server):
+    """catalog_cache / course_mcp / catalog_crawler re-imported against the stand-in and a temp index."""
+    monkeypatch.setenv("RICE_CATALOG_BASE", catalog_server)
+    monkeypatch.setenv("CATALOG_CACHE_PATH", str(tmp_path / "catalog.sqlite3"))
+    monkeypatch.setenv("CATALOG_OFFLINE", "0")
+    names = ("mcp_servers.catalog_cache", "mcp_servers.course_mcp", "mcp_servers.catalog_crawler")
+    mods = [importlib.reload(importlib.import_module(n)) for n in names]
+    yield mods
+    monkeypatch.undo()
+    for n in names:
+        importlib.reload(importlib.import_module(n))
+
+
+def test_crawl_fills_index_and_offline_lookups_use_it(modules, monkeypatch):
+    _, course_mcp, crawler = modules
+    stats = asyncio.run(crawler.crawl_catalog(YEAR, delay=0))
+    assert stats["subjects"] == 2
+    assert stats["listed"] == 4
+    assert stats["stored"] == 3
+    assert stats["not_found"] == 1
+    assert stats["errors"] == 0
+
+    index = course_mcp.catalog_cache
+    assert index.fresh_keys(YEAR) == {("COMP", "140", YEAR), ("COMP", "182", YEAR), ("MATH", "101", YEAR)}
+    comp140 = index.get(("COMP", "140", YEAR))
+    assert comp140["found"] is True
+    assert comp140["long_title"] == "Computational Thinking"
+    assert comp140["description"] == "All about computational thinking."
+    assert comp140["url"].startswith(crawler.RICE_BASE)
+
+    # a second crawl resumes: indexed courses are skipped, only the missing one is retried
+    fetched = len(Catalog.requests)
+    again = asyncio.run(crawler.crawl_catalog(YEAR, delay=0))
+    assert again["skipped"] == 3
+    assert again["stored"] == 0
+    retried = [(q["p_subj"], q["p_crse_numb"]) for q in Catalog.requests[fetched:] if "p_crse_numb" in q]
+    assert retried == [LISTED_ONLY]
+
+    # offline mode: answered from the index, the stand-in is never contacted
+    monkeypatch.setenv("CATALOG_OFFLINE", "1")
+    course_mcp = importlib.reload(course_mcp)
+    fetched = len(Catalog.requests)
+    out = asyncio.run(course_mcp.rice_lookup_courses(
+        [{"subject": "comp", "number": "140"}, {"subject": "MATH", "number": "101"},
+         {"subject": "COMP", "number": "999"}], ac_year=YEAR))
+    assert len(Catalog.requests) == fetched
+    assert out["COMP140"]["long_title"] == "Computational Thinking"
+    assert out["MATH101"]["found"] is True
+    assert out["COMP999"] == {"code": "COMP 999", "year": YEAR, "found": False, "error": "not in local catalog index"}
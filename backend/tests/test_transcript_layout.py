@@ -0,0 +1,89 @@
+# tests/test_transcript_layout.py
+# scan_layout on generated PDFs: a plain one-column transcript must read the same as the
+# text scan, and a two-column page with table headers must be read column by column with
+# the cells assigned from the header row.
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from parsers.transcript_layout import _header_columns, _page_words, _rows, _split_columns, scan_layout
+from parsers.transcript_parser import _normalize, scan_transcript
+
+ONE_COLUMN = [
+    "RICE UNIVERSITY - UNOFFICIAL TRANSCRIPT",
+    "Transfer Credit",
+    "CHEM 121 General Chemistry I TR 3.000 0.00",
+    "Term: Fall 2023",
+    "COMP 140 UG Computational Thinking A 4.000 16.00",
+    "MATH 101 UG Single Variable Calculus I B+ 3.000 9.90",
+    "Term: Spring 2024",
+    "COMP 182 UG Algorithmic Thinking A- 4.000 14.80",
+    "ELEC 220 UG Fundamentals of Computer Engineering B 4.000 12.00",
+    "COURSES IN PROGRESS",
+    "Term: Fall 2024",
+    "COMP 215 UG Introduction to Program Design 4.000",
+    "MATH 212 UG Multivariable Calculus 3.000",
+    "Esther Privacy Act notice",
+]
+
+# (x offset within the column, text) per cell
+HEADER = [(0, "Subj"), (28, "Crse"), (54, "Lvl"), (76, "Title"), (180, "Grade"), (208, "Hours"), (236, "Points")]
+LEFT = ("Term: Fall 2023", [
+    ("COMP", "140", "UG", "Computational Thinking", "A", "4.000", "16.00"),
+    ("MATH", "101", "UG", "Calculus I", "B+", "3.000", "9.90"),
+    ("PHYS", "101", "UG", "Mechanics", "A-", "4.000", "14.80"),
+])
+RIGHT = ("Term: Spring 2024", [
+    ("COMP", "182", "UG", "Algorithmic Thinking", "A", "4.000", "16.00"),
+    ("ELEC", "220", "UG", "Computer Engineering", "B", "4.000", "12.00"),
+    ("STAT", "310", "UG", "Probability", "A", "3.000", "12.00"),
+])
+
+
+def one_column_pdf():
+    doc = fitz.open()
+    page = doc.new_page()
+    for i, line in enumerate(ONE_COLUMN):
+        page.insert_text((50, 60 + 16 * i), line, fontsize=9)
+    return doc
+
+def two_column_pdf():
+    doc = fitz.open()
+    page = doc.new_page()
+    for x0, (term, rows) in ((30, LEFT), (320, RIGHT)):
+        page.insert_text((x0, 60), term, fontsize=7)
+        for dx, text in HEADER:
+            page.insert_text((x0 + dx, 76), text, fontsize=7)
+        for r, cells in enumerate(rows):
+            for (dx, _), text in zip(HEADER, cells):
+                page.insert_text((x0 + dx, 92 + 14 * r), text, fontsize=7)
+    return doc
+
+
+def test_one_column_matches_text_scan():
+    doc = one_column_pdf()
+    text = _normalize("\n".join(p.get_text() for p in doc))
+    layout = scan_layout(doc)
+    expected = scan_transcript(text)
+    assert layout["courses_completed"] == expected["courses_completed"]
+    assert layout["courses_in_progress"] == expected["courses_in_progress"]
+    assert layout["in_progress_found"] is expected["in_progress_found"] is True
+    assert len(layout["courses_completed"]) == 5
+    assert len(layout["courses_in_progress"]) == 2
+
+def test_two_columns_with_header_rows():
+    doc = two_column_pdf()
+    page = doc[0]
+    columns = _split_columns(_page_words(page), page.rect.x0, page.rect.x1)
+    assert len(columns) == 2
+    headers = [_header_columns(row) for col in columns for row in _rows(col)]
+    assert sum(h is not None for h in headers) == 2
+
+    got = scan_layout(doc)["courses_completed"]
+    want = [
+        {"term": term[len("Term: "):], "subject": s, "number": n, "level": lvl, "title": title,
+         "grade": grade, "credits": float(cred), "source": "institution", "status": "completed"}
+        for term, rows in (LEFT, RIGHT)
+        for s, n, lvl, title, grade, cred, _ in rows
+    ]
+    assert got == want
@@ -0,0 +1,124 @@
+# tests/test_transcript_scan.py
+# Differential check: the single-pass scan_transcript against the previous finditer +
+# _find_term parser on random transcripts assembled from real-looking lines, blank/
+# whitespace-only "Term:" lines included. The reference is a frozen copy kept here, so
+# the test doesn't move when benchmarks.bench_transcript_scan does.
+import random
+import re
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from parsers.transcript_parser import (
+    COURSE_INPROG, COURSE_INST, COURSE_TR, RE_GRADE, SEASON_HEADER,
+    parse_courses_in_progress, scan_transcript,
+)
+
+# ---- reference implementation (pre single-pass) ----
+
+_TERM_LINE = re.compile(r"^\s*Term:\s*(.+)$", re.MULTILINE)
+
+def _find_term(text: str, pos: int) -> Optional[str]:
+    prior = text[:pos]
+    m = list(_TERM_LINE.finditer(prior))
+    if m: return m[-1].group(1).strip()
+    m2 = list(SEASON_HEADER.finditer(prior))
+    if m2: return m2[-1].group(0).split(":")[0].strip()
+    return None
+
+def legacy_completed(text: str) -> List[Dict[str, Any]]:
+    out = []
+    for m in COURSE_INST.finditer(text):
+        out.append({"term": _find_term(text, m.start()), "subject": m.group("subject"),
+                    "number": m.group("number"), "level": m.group("level"),
+                    "title": m.group("title").strip(), "grade": m.group("grade"),
+                    "credits": float(m.group("credits")), "source": "institution", "status": "completed"})
+    for m in COURSE_TR.finditer(text):
+        out.append({"term": _find_term(text, m.start()), "subject": m.group("subject"),
+                    "number": m.group("number"), "title": m.group("title").strip(),
+                    "grade": m.group("grade"), "credits": float(m.group("credits")),
+                    "source": "transfer", "status": "completed"})
+    return out
+
+def legacy_in_progress(text: str) -> List[Dict[str, Any]]:
+    m = re.search(r"COURSES IN PROGRESS(.*?)(?:Esther Privacy|$)", text, re.IGNORECASE | re.DOTALL)
+    if not m or not m.group(1): return []
+    sec = m.group(1)
+    tm = re.search(r"\bTerm:\s*(.+)", sec)
+    term = tm.group(1).strip() if tm else None
+    rows = []
+    for c in COURSE_INPROG.finditer(sec):
+        title = c.group("title").strip()
+        if re.search(rf"\s{RE_GRADE}$", title): continue
+        rows.append({"term": term, "subject": c.group("subject"), "number": c.group("number"),
+                     "level": c.group("level"), "title": title, "credits": float(c.group("credits")),
+                     "source": "institution", "status": "in_progress"})
+    return rows
+
+SUBJECTS = ["COMP", "MATH", "ELEC", "PHYS", "STAT", "ECON", "HIST", "ENGL"]
+GRADES = ["A+", "A", "A-", "B+", "B", "B-", "C+", "P", "S"]
+
+def make_transcript(years: int, per_term: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    lines = ["Rice University Unofficial Transcript", "Curriculum Information",
+             "Major: Computer Science", "TRANSFER CREDIT ACCEPTED BY INSTITUTION"]
+    for _ in range(4):
+        lines.append(f"{rnd.choice(SUBJECTS)} {rnd.randint(100, 199)} Transfer Course AP 3.000 0.00")
+    lines.append("INSTITUTION CREDIT")
+    for y in range(years):
+        for season in ("Fall", "Spring"):
+            lines.append(f"Term: {season} {2000 + y}")
+            lines.append("Subject Course Level Title Grade Credit Hours Quality Points")
+            for _ in range(per_term):
+                lines.append(f"{rnd.choice(SUBJECTS)} {rnd.randint(100, 499)} UG "
+                             f"Some Course Title {rnd.randint(1, 99)} {rnd.choice(GRADES)} 3.000 12.00")
+            lines.append("Term Totals (Undergraduate) Attempt Hours Passed Hours")
+    lines += ["TRANSCRIPT TOTALS", "COURSES IN PROGRESS", f"Term: Fall {2000 + years}"]
+    for _ in range(per_term):
+        lines.append(f"{rnd.choice(SUBJECTS)} {rnd.randint(100, 499)} UG In Progress Course 3.000")
+    lines.append("Esther Privacy Statement")
+    return "\n".join(lines)
+
+# ---- checks ----
+
+LINES = [
+    "Term:", "Term: ", "Term:\t", "Term: Fall 2021", "Term: Spring 2022", "  Term: Summer 2020",
+    "Term: Term: Fall 2023", "Fall 2019:", "Spring 2020 :", "Fall", "2024:",
+    "", " ", "\t", "  \t ",
+    "COMP 140 UG Intro A 3.000 12.00", "MATH 101 UG Single Variable Calculus I B+ 3.000 9.99",
+    "ELEC 220 UG Digital Logic P 4.000 0.00", "STAT 310 UG Probability A- 3 12",
+    "HIST 101 Transfer Course AP 3.000 0.00", "PHYS 101 Mechanics TR 3.000 0.00",
+    "COMP 182 UG Algorithmic Thinking 3.000", "MATH 212 UG Multivariable 4.000",
+    "COMP", "140", "UG", "Intro", "A", "3.000", "12.00",
+    "COURSES IN PROGRESS", "Esther Privacy Statement", "INSTITUTION CREDIT",
+    "Subject Course Level Title Grade Credit Hours Quality Points",
+]
+
+def random_transcript(rnd: random.Random) -> str:
+    return "\n".join(rnd.choice(LINES) for _ in range(rnd.randint(1, 40)))
+
+def assert_same(text: str) -> None:
+    scan = scan_transcript(text)
+    assert scan["courses_completed"] == legacy_completed(text), repr(text)
+    assert scan["courses_in_progress"] == legacy_in_progress(text), repr(text)
+    assert parse_courses_in_progress(text, None) == legacy_in_progress(text), repr(text)
+
+@pytest.mark.parametrize("text", [
+    "Term:\n\t\nCOMP 140 UG Intro A 3.000 12.00",
+    "Term:\n\nCOMP 140 UG Intro A 3.000 12.00",
+    "Term:\nCOMP 140 UG Intro A 3.000 12.00\nMATH 101 UG Calc B 3.000 9.00",
+    "Term: Fall 2020\nTerm:\n \nCOMP 140 UG Intro A 3.000 12.00",
+    "Term:\nTerm: Fall 2021\nCOMP 140 UG Intro A 3.000 12.00",
+    "Fall 2019:\nTerm:\n\nHIST 101 Transfer Course AP 3.000 0.00",
+])
+def test_blank_term_edge_cases(text):
+    assert_same(text)
+
+def test_random_transcripts_match_legacy():
+    rnd = random.Random(20261019)
+    for _ in range(20000):
+        assert_same(random_transcript(rnd))
+
+@pytest.mark.parametrize("years", [1, 4, 16])
+def test_synthetic_transcripts_match_legacy(years):
+    assert_same(make_transcript(years, per_term=6, seed=years))
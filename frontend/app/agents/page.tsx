@@ -265,7 +265,10 @@ useEffect(() => {
     setConnectionStatus("connecting")
     setHasFinished(false)
 
-    const url = `${WS_BACKEND.replace(/\/$/, "")}/ws/negotiation/${encodeURIComponent(getSessionId())}`
+    const userId = localStorage.getItem("user_id")
+    const url =
+      `${WS_BACKEND.replace(/\/$/, "")}/ws/negotiation/${encodeURIComponent(getSessionId())}` +
+      (userId ? `?user_id=${encodeURIComponent(userId)}` : "")
 
     try {
       wsRef.current = new WebSocket(url)
@@ -208,6 +208,7 @@ export default function OnboardingFlow() {
 
         // Store session ID in localStorage for the agents page to use
         localStorage.setItem("negotiation_session_id", sessionId)
+        localStorage.setItem("user_id", result.id)
         localStorage.setItem("should_auto_connect", "true")
 
         // Redirect to dashboard after successful submission